@@ -3,16 +3,128 @@ from copy import deepcopy as dcpy
 from math import cos,pi
 import numericalMethods as nm
 import matrixOperations as mo
+import arrayBackend as ab
+import profiling
 #endregion
 
 #region Functions
-def LUFactorization(A):
+class LUFactors:
+    """
+    The result of LUFactorization: unit lower triangular L, upper triangular U and the row permutation perm such
+    that row i of L*U is row perm[i] of A.  Factor once, then call solve as often as needed; each right-hand side
+    only costs the two O(n^2) triangular sweeps.  Unpacking gives (L, U), as LUFactorization has always returned,
+    but only when no rows were swapped (always the case without pivot=True): otherwise L*U is not A and the
+    permutation would be lost, so use the attributes (L, U and perm) or solve instead.
+    """
+    __slots__ = ("_L", "_U", "perm", "sign", "backend", "lists")
+
+    def __init__(self, L, U, perm, sign, backend, lists):
+        """
+        :param L: unit lower triangular factor (numpy array for the numpy backend, else list-of-lists)
+        :param U: upper triangular factor
+        :param perm: row permutation, A[perm[i]] is row i of L*U
+        :param sign: +1 or -1 for an even or odd number of row swaps
+        :param backend: "python" or "numpy"
+        :param lists: True if the caller passed lists (so L and U are handed back as lists)
+        """
+        self._L = L
+        self._U = U
+        self.perm = perm
+        self.sign = sign
+        self.backend = backend
+        self.lists = lists
+
+    def __iter__(self):
+        """
+        :raises ValueError: if rows were swapped, since L, U alone then factor a row permutation of A
+        """
+        if any(p != i for i, p in enumerate(self.perm)):
+            raise ValueError("Rows were swapped for pivoting, so L*U is not A; use .L, .U and .perm (or solve) "
+                             "instead of unpacking.")
+        yield self.L
+        yield self.U
+
+    @property
+    def L(self):
+        """
+        The unit lower triangular factor, as lists if the caller passed lists (whatever backend did the work).
+        """
+        return self._L.tolist() if self.lists and ab.isArray(self._L) else self._L
+
+    @property
+    def U(self):
+        """
+        The upper triangular factor, as lists if the caller passed lists.
+        """
+        return self._U.tolist() if self.lists and ab.isArray(self._U) else self._U
+
+    def determinant(self):
+        """
+        :return: det(A) = sign*prod(diag(U))
+        """
+        det = self.sign
+        for i in range(len(self.perm)):
+            det *= self._U[i][i]
+        return det
+
+    def solve(self, B):
+        """
+        Solves A*X = B.
+        :param B: one right-hand side (a simple list or 1-D array) or a matrix whose columns are right-hand sides
+                  (list-of-lists or 2-D array)
+        :return: X in the same form as B
+        """
+        if self.backend == ab.NUMPY:
+            Y = ab.asArray(B)[self.perm]  # fancy indexing makes a copy
+        elif hasattr(B[0], '__len__'):
+            Y = [B[p] for p in self.perm]
+        else:
+            Y = [float(B[p]) for p in self.perm]
+        Y = mo.TriangularSolve(self._L, Y, lower=True, unit=True, backend=self.backend)  # forward sweep
+        X = mo.TriangularSolve(self._U, Y, backend=self.backend)  # backward sweep
+        return ab.restore(X, B) if ab.isArray(X) else X
+
+@profiling.profiled(flops=lambda a, r, c: 2 * len(a["A"]) ** 3 // 3)
+def LUFactorization(A, backend=None, pivot=False):
     """
     This is the Lower-Upper factorization part of Doolittle's method.  The factorizaiton follows the work in
     Kreyszig section 20.2.  Note: L is the lower triangular matrix with 1's on the diagonal.  U is the upper traingular matrix.
+    By default these are the plain Doolittle factors with L*U = A, so L, U = LUFactorization(A) still works.
+    pivot=True swaps rows for partial pivoting (PLUFactorization), which is what solve should use unless A is
+    known to be safe without it (e.g. diagonally dominant); L*U then equals A with its rows permuted by perm.
+    :param A: a nxn matrix
+    :param backend: "python", "numpy" or None (see arrayBackend.resolveBackend)
+    :param pivot: use partial pivoting (opt-in, to keep the legacy L, U unpacking)
+    :return: a LUFactors object (which also unpacks as L, U if no rows were swapped)
+    """
+    backend = ab.resolveBackend(backend, A)
+    AA = ab.asArray(A) if backend == ab.NUMPY else A
+    if pivot:
+        L, U, perm, sign = PLUFactorization(AA, backend)
+    else:
+        L, U = _DoolittleLU(AA, backend)
+        perm, sign = list(range(len(A))), 1
+    return LUFactors(L, U, perm, sign, backend, not ab.isArray(A))
+
+def _DoolittleLU(A, backend):
+    """
+    Doolittle's LU factorization without pivoting.
     :param A: a nxn matrix
+    :param backend: "python" or "numpy"
     :return: a tuple with (L, U)
     """
+    if backend == ab.NUMPY:
+        AA = ab.asArray(A)
+        n = AA.shape[0]
+        U = ab.np.zeros((n, n))
+        L = ab.np.eye(n)
+        U[0] = AA[0]
+        L[1:, 0] = AA[1:, 0] / U[0, 0]
+        for j in range(1, n):  # row j of U, then column j of L, each as one vector operation
+            U[j, j:] = AA[j, j:] - L[j, :j] @ U[:j, j:]
+            L[j + 1:, j] = (AA[j + 1:, j] - L[j + 1:, :j] @ U[:j, j]) / U[j, j]
+        return (ab.restore(L, A), ab.restore(U, A))
+
     n = len(A)
     # Step 1
     U = [([0 for c in range(n)] if not r == 0 else [a for a in A[0]]) for r in range(n)]
@@ -25,55 +137,97 @@ def LUFactorization(A):
             U[j][k]=A[j][k]  # k is column index and scans from column j to n-1
             for s in range(j):  #  s is column index for L and row index for U
                 U[j][k] -= L[j][s]*U[s][k]
-            #(b)
-            for i in range(k+1, n):
-                sig=0
-                for s in range(k):
-                    sig+=L[i][s]*U[s][k]
-                L[i][k]=(1/(U[k][k]))*(A[i][k]-sig)
+        #(b) column j of L, once row j of U (and so U[j][j]) is known
+        for i in range(j+1, n):
+            sig=0
+            for s in range(j):
+                sig+=L[i][s]*U[s][j]
+            L[i][j]=(1/(U[j][j]))*(A[i][j]-sig)
     return (L,U)
 
-def BackSolve(A,b,UT=True):
+def PLUFactorization(A, backend=None):
+    """
+    LU factorization with partial pivoting by Gauss elimination.  At step k the row with the largest |value| in
+    column k (on or below the diagonal) is swapped up to be the pivot, which keeps the multipliers in L <= 1 and
+    lets factorization continue where LUFactorization would divide by a zero pivot.  A zero column is skipped,
+    leaving a zero on the diagonal of U (i.e., A is singular).
+    :param A: a nxn matrix
+    :param backend: "python", "numpy" or None (see arrayBackend.resolveBackend)
+    :return: a tuple with (L, U, perm, sign) where A[perm[i]] is row i of L*U, and sign is +1 or -1 for an even
+             or odd number of row swaps
+    """
+    if ab.resolveBackend(backend, A) == ab.NUMPY:
+        U = ab.asArray(A).copy()
+        n = U.shape[0]
+        L = ab.np.zeros((n, n))
+        perm = list(range(n))
+        sign = 1
+        for k in range(n):
+            p = k + int(ab.np.argmax(ab.np.abs(U[k:, k])))  # partial pivot
+            if p != k:
+                U[[k, p]] = U[[p, k]]
+                L[[k, p]] = L[[p, k]]
+                perm[k], perm[p] = perm[p], perm[k]
+                sign = -sign
+            L[k, k] = 1.0
+            if U[k, k] != 0:
+                L[k + 1:, k] = U[k + 1:, k] / U[k, k]
+                U[k + 1:, k:] -= ab.np.outer(L[k + 1:, k], U[k, k:])
+        return (ab.restore(L, A), ab.restore(U, A), perm, sign)
+
+    n = len(A)
+    U = [[float(a) for a in row] for row in A]
+    L = [[0.0] * n for r in range(n)]
+    perm = list(range(n))
+    sign = 1
+    for k in range(n):
+        p = max(range(k, n), key=lambda r: abs(U[r][k]))  # partial pivot
+        if p != k:
+            U[k], U[p] = U[p], U[k]
+            L[k], L[p] = L[p], L[k]
+            perm[k], perm[p] = perm[p], perm[k]
+            sign = -sign
+        L[k][k] = 1.0
+        pivot = U[k][k]
+        if pivot == 0:
+            continue
+        Uk = U[k]
+        for i in range(k + 1, n):
+            Ui = U[i]
+            m = Ui[k] / pivot
+            if m != 0:
+                L[i][k] = m
+                Ui[k:] = [0.0] + [a - m * b for a, b in zip(Ui[k + 1:], Uk[k + 1:])]
+    return (L, U, perm, sign)
+
+def BackSolve(A,b,UT=True,backend=None):
     """
-    This is a backsolving algorithm for a matrix and b vector where A is triangular
+    This is a backsolving algorithm for a matrix and b vector where A is triangular (matrixOperations.TriangularSolve)
     :param A: A triangularized matrix (Upper or Lower)
-    :param b: the right hand side of a matrix equation Ax=b
+    :param b: the right hand side of a matrix equation Ax=b, or a matrix whose columns are right-hand sides
     :param UT: boolean of upper triangular (True) or lower triangular (False)
+    :param backend: "python", "numpy" or None (see arrayBackend.resolveBackend)
     :return: the solution vector x, from Ax=b
     """
-    nRows=len(b)
-    nCols=nRows
-    x=[0]*nRows
-    if UT:
-        for nR in range(nRows-1,-1,-1):
-            s=0
-            for nC in range(nR+1,nRows):
-                s+=A[nR][nC]*x[nC]
-            x[nR]=1/A[nR][nR]*(b[nR]-s)
-    else:
-        for nR in range(nRows):
-            s=0
-            for nC in range(nR):
-                s+=A[nR][nC]*x[nC]
-            x[nR]=1/A[nR][nR]*(b[nR]-s)
-    B = mo.checkMatrixSoln(A, x, False)
-    return x
-
-def Doolittle(Aaug):
+    return mo.TriangularSolve(A, b, lower=not UT, backend=backend)
+
+def Doolittle(Aaug, backend=None):
     """
     The Doolittle method for solving the matrix equation [A][x]=[b] is:
     Step 1:  Factor [A]=[L][U]
     Step 2:  Solve [L][y]=[b] for [y]
     Step 3:  Solve [U][x]=[y] for [x]
     :param Aaug: the augmented matrix
+    :param backend: "python", "numpy" or None (see arrayBackend.resolveBackend)
     :return: the solution vector x
     """
+    if ab.resolveBackend(backend, Aaug) == ab.NUMPY:
+        AA = ab.asArray(Aaug)
+        x=LUFactorization(AA[:, :-1], backend=ab.NUMPY, pivot=True).solve(AA[:, -1])
+        return ab.restore(x, Aaug)
     A,b=mo.separateAugmented(Aaug)
-    L,U=LUFactorization(A)
-    B=mo.MatrixMultiply(L,U)
-    y=BackSolve(L,b, UT=False)
-    x=BackSolve(U,y, UT=True)
-    return x  #x should be a column vector of form [[], [], [], ..., []]
+    x=LUFactorization(A, pivot=True).solve([r[0] for r in b])  # Steps 2 and 3 are both done by solve
+    return x  #x is a simple list
 
 def main():
     A=[[3, 5, 2],[0,8,2],[6,2,8]]
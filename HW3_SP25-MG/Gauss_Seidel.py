@@ -1,7 +1,29 @@
 import copy
+from math import sqrt
+from time import perf_counter
 import matrixOperations as mo
+import arrayBackend as ab
+import sparseMatrix as sm
+import mappedMatrix as mm
+import solverStats as ss
+import profiling
 
-def GaussSeidel(Aaug, x, Niter=15, epsilon=1e-5):
+AUTO_OMEGA_SWEEPS = 5  # fewest plain Gauss-Seidel sweeps observed before omega="auto" picks its relaxation factor
+AUTO_OMEGA_TOL = 0.01  # the contraction rate has settled once it changes by less than this fraction of (1-rate)
+
+def OptimalOmega(rho):
+    """
+    The best SOR relaxation factor for a consistently ordered (e.g., banded or finite difference) system whose plain
+    Gauss-Seidel iteration contracts the error by rho each sweep.
+    :param rho: the spectral radius of the Gauss-Seidel iteration (0 <= rho < 1)
+    :return: omega = 2/(1+sqrt(1-rho))
+    """
+    if not 0 <= rho < 1:
+        raise ValueError("Gauss-Seidel must be contracting (0 <= rho < 1) to choose omega, got rho = {}.".format(rho))
+    return 2.0 / (1.0 + sqrt(1.0 - rho))
+
+@profiling.profiled(flops=lambda a, r, c: 2 * sm.nnzOf(a["Aaug"]) * c.get("evals", 0))
+def GaussSeidel(Aaug, x, Niter=15, epsilon=1e-5, backend=None, omega=1.0, stats=None, callback=None, reorder=True):
     '''
     This is Gauss-Seidel iterative solution to a set of equations in an augmented matrix.
     Step 1:  Ensure the matrix is diagonal dominant (i.e., put the largest coefficient for a diagonal term on the diagonal
@@ -11,20 +33,65 @@ def GaussSeidel(Aaug, x, Niter=15, epsilon=1e-5):
     Updated value for x[0] is used in solution for x[1], etc.
     Once you've solved all the way to x[n-1], this is one iteration.
     Step 3:  Keep iterating for Niter or until the maximum change in a row of x is < epsilon
-    :param Aaug: the augmented matrix
+    With omega != 1 this is successive over-relaxation (SOR): each x[row] moves omega times its Gauss-Seidel step.
+    omega="auto" starts with plain Gauss-Seidel and switches to SOR once the observed contraction rate settles.
+    :param Aaug: the augmented matrix (list-of-lists, numpy array, a sparseMatrix.CSRMatrix or a
+                 mappedMatrix.MappedMatrix, which is swept in its stored row order)
     :param x: the initial guess vector
     :param Niter: number of iterations to get correct x
     :param epsilon: the precision for early escape from iteration.
+    :param backend: "python", "numpy" or None (see arrayBackend.resolveBackend)
+    :param omega: relaxation factor (0 < omega < 2, 1.0 is plain Gauss-Seidel) or "auto"
+    :param reorder: do Step 1; pass False if the rows are already in a diagonal dominant order
+    :param stats: a solverStats.IterationStats to record the sweeps, residuals and convergence status into
+    :param callback: function callback(stats) called after every sweep (records into stats, or a new IterationStats)
     :return: x solution vector
     '''
+    stats = ss.getStats(stats, callback)
+    if omega != "auto" and not 0 < omega < 2:
+        raise ValueError("omega must be between 0 and 2 (or 'auto'), got {}.".format(omega))
+    if isinstance(Aaug, sm.CSRMatrix):  # sweeps only touch the stored non-zeros
+        sweep = sm.GaussSeidelSweep(Aaug, reorder=reorder)
+        _relax(lambda w: sweep(x, w), Niter, epsilon, omega, stats, lambda: sm.residualNorm(Aaug, x))
+        return x
+    if isinstance(Aaug, mm.MappedMatrix):  # rows stream from the file, only x is held in memory
+        xx = x.tolist() if ab.isArray(x) else x
+        sweep = mm.GaussSeidelSweep(Aaug)
+        _relax(lambda w: sweep(xx, w), Niter, epsilon, omega, stats, lambda: mm.residualNorm(Aaug, xx))
+        x[:] = xx
+        return x
+    if ab.resolveBackend(backend, Aaug, x) == ab.NUMPY:
+        AA = ab.asArray(DiagDominant(Aaug.tolist() if ab.isArray(Aaug) else Aaug) if reorder else Aaug)
+        n = len(x)
+        A, b = AA[:, :n], AA[:, n]
+        xx = ab.asVector(x).copy()
+
+        def sweep(w):
+            maxErr, sumSq = 0, 0.0
+            for r in range(n):  # row r as one dot product with the most recent x
+                dx = w * (b[r] - A[r] @ xx) / A[r, r]
+                xx[r] += dx
+                maxErr = max(maxErr, abs(dx))
+                sumSq += dx * dx
+            return maxErr, sumSq
+
+        def residual():  # ||b - A x||
+            res = b - A @ xx
+            return sqrt(float(res @ res))
+        _relax(sweep, Niter, epsilon, omega, stats, residual)
+        x[:] = xx if ab.isArray(x) else xx.tolist()  # update x in place, as the list version does
+        return x
+
     AA = copy.deepcopy(Aaug)  # deep copy Aaug so that we are not altering Aaug unintentionally
     # Step 1:
-    AA = DiagDominant(AA)  # ensure matrix is diagonal dominant
+    if reorder:
+        AA = DiagDominant(AA)  # ensure matrix is diagonal dominant
 
     # Steps 2 & 3
     n = len(x)
-    for j in range(Niter):  # main iteration loop
-        maxErr = 0  # for calculating maximum change in one of the x values
+
+    def sweep(w):
+        maxErr, sumSq = 0, 0.0  # for calculating maximum change in one of the x values (and the size of the change)
         for r in range(n):  # update the x vector one element at a time
             xOld = x[r]
             rhs = AA[r][n]  # the value from last col of row r (i.e., from b vector of augmented matrix)
@@ -32,10 +99,62 @@ def GaussSeidel(Aaug, x, Niter=15, epsilon=1e-5):
                 if c != r:
                     rhs -= AA[r][c] * x[c]
             x[r] = rhs / AA[r][r]  # divide rhs by coefficient of diagonal term and update x[r]
+            if w != 1.0:  # over-relax
+                x[r] = xOld + w * (x[r] - xOld)
             maxErr = max(maxErr, abs(xOld - x[r]))
+            sumSq += (xOld - x[r]) ** 2
+        return maxErr, sumSq
+
+    def residual():  # ||b - A x||
+        return sqrt(sum((AA[r][n] - sum(AA[r][c] * x[c] for c in range(n))) ** 2 for r in range(n)))
+    _relax(sweep, Niter, epsilon, omega, stats, residual)
+    return x
+
+def _relax(sweep, Niter, epsilon, omega, stats=None, residual=None):
+    """
+    The main iteration loop shared by the storage formats of GaussSeidel.  For omega="auto" it does plain sweeps
+    while watching the contraction rate ||dx_k||/||dx_k-1|| of the changes in x.  That ratio rises towards the
+    spectral radius of the Gauss-Seidel iteration from below, so once it settles the omega from OptimalOmega
+    errs on the safe (under-relaxed) side; the remaining sweeps use that omega.
+    :param sweep: function sweep(w) doing one sweep with relaxation factor w, returning the tuple
+                  (largest change in x, sum of the squared changes)
+    :param Niter: number of iterations
+    :param epsilon: stop once the largest change in x is <= epsilon
+    :param omega: relaxation factor or "auto"
+    :param stats: IterationStats to record into, or None
+    :param residual: function returning ||b - A x|| for the current x (only called when stats want residuals)
+    :return: True if the epsilon test was met
+    """
+    if stats is not None:
+        stats.begin("Gauss_Seidel.GaussSeidel", epsilon, Niter)
+    adapting = omega == "auto"
+    w = 1.0 if adapting else omega
+    sumSqOld, rateOld = 0.0, None
+    converged = False
+    j = -1
+    for j in range(Niter):  # main iteration loop
+        if stats is not None:
+            t0 = perf_counter()
+            maxErr, sumSq = sweep(w)
+            stats.record(maxErr, perf_counter() - t0, residual() if stats.residuals else None, w)
+        else:
+            maxErr, sumSq = sweep(w)
         if maxErr <= epsilon:
+            converged = True
             break
-    return x
+        if adapting and sumSqOld > 0:
+            rate = sqrt(sumSq / sumSqOld)
+            if j >= AUTO_OMEGA_SWEEPS and rateOld is not None and rate < 1 and \
+                    abs(rate - rateOld) <= AUTO_OMEGA_TOL * (1 - rate):
+                w = OptimalOmega(rate)
+                adapting = False
+            rateOld = rate
+        sumSqOld = sumSq
+    if profiling.enabled:
+        profiling.note(evals=j + 1)  # sweeps
+    if stats is not None:
+        stats.finish(converged)
+    return converged
 
 def DiagDominant(A):
     """
@@ -0,0 +1,74 @@
+#region explanation
+# The linear algebra modules (matrixOperations, DoolittleMethod, Gauss_Seidel, numericalMethods, hw3c) can run either
+# on the original list-of-lists matrices with Python loops ("python") or on numpy arrays with vectorized row
+# operations ("numpy").  The backend is chosen, in order of priority, by:
+# 1. the backend= argument of the function
+# 2. numpy arrays being passed in (then "numpy")
+# 3. the environment variable HW3_BACKEND
+# 4. the default, "python"
+# Whatever backend does the work, callers that pass lists get lists back.
+#endregion
+
+#region imports
+import os
+try:
+    import numpy as np
+except ImportError:
+    np = None
+#endregion
+
+#region function definitions
+PYTHON = "python"
+NUMPY = "numpy"
+BACKEND_ENV = "HW3_BACKEND"
+
+def resolveBackend(backend=None, *operands):
+    """
+    Decides which backend a function call should use.
+    :param backend: "python", "numpy" or None to decide from the operands and the environment
+    :param operands: the matrices/vectors passed to the function
+    :return: "python" or "numpy"
+    """
+    if backend is None:
+        if np is not None and any(isinstance(A, np.ndarray) for A in operands):
+            return NUMPY
+        backend = os.environ.get(BACKEND_ENV, PYTHON).strip().lower() or PYTHON
+    if backend not in (PYTHON, NUMPY):
+        raise ValueError("Unknown backend '{}', use '{}' or '{}'.".format(backend, PYTHON, NUMPY))
+    if backend == NUMPY and np is None:
+        raise ImportError("The numpy backend was requested but numpy is not installed.")
+    return backend
+
+def isArray(A):
+    """
+    :param A: a matrix or vector
+    :return: True if A is a numpy array
+    """
+    return np is not None and isinstance(A, np.ndarray)
+
+def asArray(A):
+    """
+    Converts a list-of-lists matrix (or a simple list) to a float numpy array, without copying if it already is one.
+    :param A: a matrix or vector
+    :return: numpy array
+    """
+    return np.asarray(A, dtype=float)
+
+def asVector(b):
+    """
+    Converts a simple list, a row vector [[...]] or a column vector [[], [], ...] to a 1-D float numpy array.
+    :param b: a vector
+    :return: 1-D numpy array
+    """
+    return np.asarray(b, dtype=float).reshape(-1)
+
+def restore(X, *like):
+    """
+    Returns the result X of a numpy computation in the form the caller used: a numpy array if any of the
+    operands in like is one, otherwise nested lists (or a simple list for a 1-D result).
+    :param X: numpy array with the result
+    :param like: the operands the caller passed in
+    :return: X or X.tolist()
+    """
+    return X if any(isArray(A) for A in like) else X.tolist()
+#endregion
@@ -0,0 +1,273 @@
+#region explanation
+# Non-interactive batch front end for the probability tools of hw2a, hw3a and hw3b.
+# Queries are read one per line as JSON or as CSV with a header row, from a file or stdin:
+#   {"mode": "p", "c": 1.2, "mean": 0, "stDev": 1, "GT": false, "OneSided": true}   P given c (hw2a, hw3a 'P')
+#   {"mode": "c", "P": 0.95, "mean": 0, "stDev": 1, "GT": false, "OneSided": true}  c given P (hw3a 'C')
+#   {"mode": "t", "z": 1.5, "df": 7}                                                P(T < z) (hw3b)
+# mean, stDev, GT and OneSided default to 0, 1, false and true as in the interactive programs, and an "id" is
+# copied to the answer.  For two-sided queries P is 1-2*P(x>c) (GT) or 1-2*P(x<c) (not GT), as in hw3a.
+# One answer is written per query, in input order, as JSON lines or CSV with the columns
+#   line, id, mode, result, converged, error
+# where result is P (modes p and t) or c (mode c), converged is set for mode c, and error explains a bad query
+# (the rest of the input is still answered).  Numbers must be finite, P must lie strictly between 0 and 1 and df must
+# be positive; a group call that fails anyway turns into error answers for the queries of that group only.
+# The input is streamed: queries are read BATCH_SIZE at a time, and each batch is answered with one call per group
+# of compatible queries (ProbabilityBatch for all of mode p, FindCForProbabilities per (mean, stDev, OneSided, GT),
+# t_cdf_batch per df) before its answers are written, so memory stays bounded however long the input is.
+# Usage:
+#   python batchQueries.py queries.jsonl > answers.jsonl
+#   python batchQueries.py queries.csv --out answers.csv
+#   some_program | python batchQueries.py --format csv
+#endregion
+
+#region imports
+import argparse
+import csv
+import json
+import sys
+from math import isfinite
+from numericalMethods import GPDF, ProbabilityBatch
+from hw3a import FindCForProbabilities
+from hw3b import t_cdf_batch
+#endregion
+
+#region function definitions
+BATCH_SIZE = 4096  # queries read and answered together
+MODES = ("p", "c", "t")
+FIELDS = ("line", "id", "mode", "result", "converged", "error")
+yesOptions = ["y", "yes", "true", "1"]
+
+class Query:
+    """
+    One parsed query.  x is c (mode p), the target probability P (mode c) or z (mode t).
+    """
+    __slots__ = ("mode", "x", "mean", "stDev", "GT", "OneSided", "df")
+
+    def __init__(self, record):
+        """
+        :param record: dict of the fields of the query (from JSON or a CSV row, so numbers may be strings)
+        :raises ValueError: if a field is missing or has a bad value
+        """
+        self.mode = str(record.get("mode", "")).strip().lower()
+        if self.mode not in MODES:
+            raise ValueError("mode must be one of {}, got '{}'.".format(", ".join(MODES), record.get("mode")))
+        self.x = _number(record, {"p": "c", "c": "P", "t": "z"}[self.mode])
+        self.mean = _number(record, "mean", 0.0)
+        self.stDev = _number(record, "stDev", 1.0)
+        self.GT = _flag(record, "GT", False)
+        self.OneSided = _flag(record, "OneSided", True)
+        self.df = _number(record, "df") if self.mode == "t" else None
+        if self.mode != "t" and not self.stDev > 0:
+            raise ValueError("stDev must be positive, got {}.".format(self.stDev))
+        if self.mode == "c" and not 0 < self.x < 1:
+            raise ValueError("P must be between 0 and 1, got {}.".format(self.x))
+        if self.mode == "t" and not self.df > 0:
+            raise ValueError("df must be positive, got {}.".format(self.df))
+
+def _number(record, key, default=None):
+    """
+    :return: record[key] as a float, or default if it is missing or blank
+    :raises ValueError: if it is missing without a default, or not a finite number
+    """
+    value = record.get(key)
+    if value is None or (isinstance(value, str) and value.strip() == ""):
+        if default is None:
+            raise ValueError("'{}' is missing.".format(key))
+        return default
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError("'{}' must be a number, got {!r}.".format(key, value))
+    if not isfinite(number):
+        raise ValueError("'{}' must be finite, got {!r}.".format(key, value))
+    return number
+
+def _flag(record, key, default):
+    """
+    :return: record[key] as a bool (true/false from JSON, or one of yesOptions in any case), default if missing
+    """
+    value = record.get(key)
+    if value is None or (isinstance(value, str) and value.strip() == ""):
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in yesOptions
+
+def readRecords(stream, fmt):
+    """
+    :param stream: text stream of queries
+    :param fmt: "jsonl" (one JSON object per line; blank lines and lines starting with # are skipped) or "csv"
+    :return: generator of (line number, dict) or (line number, ValueError) for a line that cannot be parsed
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, {k.strip(): v for k, v in record.items() if k is not None}
+        return
+    if fmt != "jsonl":
+        raise ValueError("Unknown format '{}', use 'jsonl' or 'csv'.".format(fmt))
+    for line, text in enumerate(stream, 1):
+        text = text.strip()
+        if text == "" or text.startswith("#"):
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError as e:
+            yield line, ValueError("not valid JSON ({}).".format(e))
+            continue
+        yield line, record if isinstance(record, dict) else ValueError("expected a JSON object.")
+
+def _chunks(items, size):
+    """
+    :return: generator of lists of up to size consecutive items
+    """
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _fromCDF(q, OneSided, GT):
+    """
+    The probability asked for by a mode p query, from q = P(x<c); the inverse of hw3a.TargetCDF.
+    """
+    if OneSided:
+        return 1 - q if GT else q
+    return 2 * q - 1 if GT else 1 - 2 * q
+
+def _fail(group, error):
+    """
+    Marks every query of a group whose call raised error as failed.
+    :param group: list of (Query, answer dict)
+    """
+    for q, answer in group:
+        answer["result"] = answer["converged"] = None
+        answer["error"] = "could not be answered ({}: {}).".format(type(error).__name__, error)
+
+def answerBatch(records, engine="simpson"):
+    """
+    Answers one batch of queries with one vectorized call per group of compatible queries.  A call that raises
+    fails the queries of its group only.
+    :param records: list of (line number, dict or ValueError) from readRecords
+    :param engine: engine of hw3a.FindCForProbabilities for mode c ("simpson" or "table")
+    :return: list of answer dicts with the keys of FIELDS, in the order of records
+    """
+    answers = []
+    byMode = {mode: [] for mode in MODES}
+    for line, record in records:
+        answer = dict.fromkeys(FIELDS)
+        answer["line"] = line
+        answers.append(answer)
+        if isinstance(record, Exception):
+            answer["error"] = str(record)
+            continue
+        answer["id"] = record.get("id")
+        try:
+            q = Query(record)
+        except ValueError as e:
+            answer["error"] = str(e)
+            continue
+        answer["mode"] = q.mode
+        byMode[q.mode].append((q, answer))
+
+    queries = byMode["p"]
+    if queries:  # P(x<c) for every one at once, ProbabilityBatch groups them by (mean, stDev) itself
+        try:
+            qs = ProbabilityBatch(GPDF, ([q.mean for q, a in queries], [q.stDev for q, a in queries]),
+                                  [q.x for q, a in queries], GT=False)
+            for (q, answer), cdf in zip(queries, qs):
+                answer["result"] = _fromCDF(cdf, q.OneSided, q.GT)
+        except (ArithmeticError, ValueError) as e:
+            _fail(queries, e)
+
+    groups = {}
+    for q, answer in byMode["c"]:
+        groups.setdefault((q.mean, q.stDev, q.OneSided, q.GT), []).append((q, answer))
+    for (mean, stDev, OneSided, GT), group in groups.items():
+        try:
+            results = FindCForProbabilities([q.x for q, a in group], mean, stDev, OneSided, GT, engine=engine)
+            for (q, answer), (c, iterations, converged) in zip(group, results):
+                answer["result"] = c
+                answer["converged"] = converged
+        except (ArithmeticError, ValueError) as e:
+            _fail(group, e)
+
+    groups = {}
+    for q, answer in byMode["t"]:
+        groups.setdefault(q.df, []).append((q, answer))
+    for df, group in groups.items():
+        try:
+            for (q, answer), p in zip(group, t_cdf_batch([q.x for q, a in group], df)):
+                answer["result"] = p
+        except (ArithmeticError, ValueError) as e:
+            _fail(group, e)
+    return answers
+
+def run(inStream, outStream, fmt="jsonl", outFormat=None, batchSize=BATCH_SIZE, engine="simpson"):
+    """
+    Streams the queries of inStream through answerBatch and writes the answers to outStream, one batch at a time.
+    :param inStream: text stream of queries
+    :param outStream: text stream for the answers
+    :param fmt: input format, "jsonl" or "csv"
+    :param outFormat: output format, "jsonl" or "csv" (the input format if None)
+    :param batchSize: queries answered together
+    :param engine: engine for mode c (see answerBatch)
+    :return: tuple (number of queries, number of them that failed)
+    """
+    if batchSize < 1:
+        raise ValueError("batchSize must be at least 1, got {}.".format(batchSize))
+    outFormat = fmt if outFormat is None else outFormat
+    if outFormat == "csv":
+        writer = csv.DictWriter(outStream, FIELDS, lineterminator="\n")
+        writer.writeheader()
+        write = writer.writerow
+    elif outFormat == "jsonl":
+        write = lambda answer: outStream.write(json.dumps(answer) + "\n")
+    else:
+        raise ValueError("Unknown format '{}', use 'jsonl' or 'csv'.".format(outFormat))
+    count, failed = 0, 0
+    for chunk in _chunks(readRecords(inStream, fmt), batchSize):
+        for answer in answerBatch(chunk, engine):
+            write(answer)
+            failed += answer["error"] is not None
+        count += len(chunk)
+        outStream.flush()
+    return count, failed
+
+def main(argv=None):
+    '''
+    Answers a file (or stdin) of queries from the command line (see the explanation at the top of this file).
+    :return: exit code, 1 if any query could not be answered
+    '''
+    parser = argparse.ArgumentParser(description="Answer normal probability, normal quantile and t CDF queries "
+                                                 "in bulk.")
+    parser.add_argument("input", nargs="?", default="-", help="file of queries ('-' or nothing for stdin)")
+    parser.add_argument("--format", choices=("jsonl", "csv"),
+                        help="input format (default: csv for a .csv file, otherwise jsonl)")
+    parser.add_argument("--out-format", choices=("jsonl", "csv"), help="output format (default: the input format)")
+    parser.add_argument("--out", default="-", help="file for the answers ('-' for stdout)")
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE, help="queries answered together")
+    parser.add_argument("--engine", choices=("simpson", "table"), default="simpson",
+                        help="CDF engine for the c given P queries")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+    inStream = sys.stdin if args.input == "-" else open(args.input, newline="")
+    outStream = sys.stdout if args.out == "-" else open(args.out, "w", newline="")
+    try:
+        count, failed = run(inStream, outStream, fmt, args.out_format, args.batch, args.engine)
+    finally:
+        if inStream is not sys.stdin:
+            inStream.close()
+        if outStream is not sys.stdout:
+            outStream.close()
+    if failed:
+        print("{} of {} queries could not be answered.".format(failed, count), file=sys.stderr)
+    return 1 if failed else 0
+#endregion
+
+if __name__ == "__main__":
+    sys.exit(main())
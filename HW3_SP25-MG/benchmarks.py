@@ -0,0 +1,383 @@
+#region explanation
+# Benchmarks for the numerical kernels of this package, swept over problem size.
+# Every case records the best and median wall time over a few runs, the peak memory allocated by Python during one
+# run (tracemalloc) and, where it means something, the number of function evaluations or iterations.
+# Usage:
+#   python benchmarks.py --out results.json            full sweep (n = 4 ... 1000, N = 100 ... 1e6 panels)
+#   python benchmarks.py --max-n 64 --max-panels 1e4   a quick sweep
+#   python benchmarks.py --only Simpson,GaussSeidel    only kernels whose name contains one of these
+#   python benchmarks.py --compare old.json new.json   ratio of new to old times, exit code 1 on a slowdown
+# Inputs are generated from a fixed seed, so runs on different commits time the same problems.
+# A kernel whose run takes longer than --budget seconds skips its larger sizes (they are listed as skipped).
+#endregion
+
+#region imports
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from math import cos
+from statistics import median
+from time import perf_counter
+import numericalMethods as nm
+import matrixOperations as mo
+import DoolittleMethod as dm
+import Gauss_Seidel as gs
+import solverStats as ss
+import hw3a
+import hw3b
+import hw3c
+#endregion
+
+#region function definitions
+MATRIX_SIZES = (4, 16, 64, 256, 1000)
+PANELS = (100, 1000, 10 ** 4, 10 ** 5, 10 ** 6)
+CALLS = (1, 10, 100)  # for the kernels without a size: how many calls are timed together
+XTOLS = (1e-4, 1e-8, 1e-12)
+SEED = 2025
+MIN_TIME = 0.05  # seconds of timed runs per case, at least
+MAX_RUNS = 1000
+
+KERNELS = []  # (name, size parameter, sizes, setup); setup(size) returns work(), which returns evaluations or None
+
+def benchmark(name, param, sizes):
+    """
+    Registers a benchmark.  The decorated function takes the size, prepares the inputs and returns work(), a
+    function that runs the kernel once and returns the number of evaluations/iterations it needed (or None).
+    """
+    def register(setup):
+        KERNELS.append((name, param, sizes, setup))
+        return setup
+    return register
+
+class CountCalls:
+    """
+    Wraps a function to count how often it is called.
+    """
+    __slots__ = ("fn", "calls")
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.fn(*args)
+
+@contextmanager
+def patched(module, name, value):
+    """
+    Temporarily replaces module.name, to count the evaluations of a function a kernel looks up globally.
+    """
+    old = getattr(module, name)
+    setattr(module, name, value)
+    try:
+        yield value
+    finally:
+        setattr(module, name, old)
+
+def discard(fn, *args):
+    """
+    :return: work() for a kernel without an evaluation count, running fn(*args) and dropping the result
+    """
+    def work():
+        fn(*args)
+    return work
+
+_matrices = {}
+
+def testMatrix(n):
+    """
+    :param n: size
+    :return: a reproducible nxn symmetric, strictly diagonally dominant (so positive definite) matrix and a b vector
+    """
+    if n not in _matrices:
+        rnd = random.Random(SEED + n)
+        A = [[0.0] * n for _ in range(n)]
+        for i in range(n):
+            for j in range(i + 1, n):
+                A[i][j] = A[j][i] = rnd.uniform(-1, 1)
+        for i in range(n):
+            A[i][i] = sum(abs(v) for v in A[i]) + 1.0
+        _matrices[n] = (A, [rnd.uniform(-1, 1) for _ in range(n)])
+    A, b = _matrices[n]
+    return [row[:] for row in A], b[:]
+
+#region numerical integration and root finding
+@benchmark("Simpson", "N", PANELS)
+def benchSimpson(N):
+    f = CountCalls(nm.GPDF)
+
+    def work():
+        f.calls = 0
+        nm.Simpson(f, (0, 1, -5, 0), N=N)
+        return f.calls
+    return work
+
+@benchmark("Probability", "calls", CALLS)
+def benchProbability(calls):
+    f = CountCalls(nm.GPDF)
+    cs = [-3 + 6 * k / max(calls - 1, 1) for k in range(calls)]
+
+    def work():
+        f.calls = 0
+        for c in cs:
+            nm.Probability(f, (0, 1), c, GT=False)
+        return f.calls
+    return work
+
+@benchmark("t_cdf", "calls", CALLS)
+def benchTCDF(calls):
+    f = CountCalls(hw3b.t_pdf)
+    zs = [-3 + 6 * k / max(calls - 1, 1) for k in range(calls)]
+
+    def work():
+        f.calls = 0
+        with patched(hw3b, "t_pdf", f):
+            for z in zs:
+                hw3b.t_cdf(z, 7)
+        return f.calls
+    return work
+
+@benchmark("Secant", "xtol", XTOLS)
+def benchSecant(xtol):
+    f = CountCalls(lambda x: x - cos(x))
+
+    def work():
+        f.calls = 0
+        nm.Secant(f, 0.0, 1.0, maxiter=100, xtol=xtol)
+        return f.calls
+    return work
+
+@benchmark("FindCForProbability", "calls", CALLS)
+def benchFindC(calls):
+    f = CountCalls(nm.GPDF)
+    Ps = [0.05 + 0.9 * k / max(calls - 1, 1) for k in range(calls)]
+
+    def work():
+        f.calls = 0
+        with patched(hw3a, "GPDF", f):
+            for P in Ps:
+                hw3a.FindCForProbability(P, 0, 1, True, False)
+        return f.calls
+    return work
+#endregion
+
+#region linear algebra
+@benchmark("EchelonForm", "n", MATRIX_SIZES)
+def benchEchelon(n):
+    A, b = testMatrix(n)
+    return discard(mo.EchelonForm, A)
+
+@benchmark("InvertMatrix", "n", MATRIX_SIZES)
+def benchInvert(n):
+    A, b = testMatrix(n)
+    return discard(mo.InvertMatrix, A)
+
+@benchmark("MatrixMultiply", "n", MATRIX_SIZES)
+def benchMultiply(n):
+    A, b = testMatrix(n)
+    return discard(mo.MatrixMultiply, A, A)
+
+@benchmark("LUFactorization", "n", MATRIX_SIZES)
+def benchLU(n):
+    A, b = testMatrix(n)
+    return discard(dm.LUFactorization, A)
+
+@benchmark("Doolittle", "n", MATRIX_SIZES)
+def benchDoolittle(n):
+    A, b = testMatrix(n)
+    Aaug = [row + [v] for row, v in zip(A, b)]
+    return discard(dm.Doolittle, Aaug)
+
+@benchmark("GaussSeidel (numericalMethods)", "n", MATRIX_SIZES)
+def benchGaussSeidelNM(n):
+    A, b = testMatrix(n)
+    Aaug = [row + [v] for row, v in zip(A, b)]
+    stats = ss.IterationStats(residuals=False)
+
+    def work():
+        nm.GaussSeidel(Aaug, [0.0] * n, Niter=50, epsilon=1e-10, stats=stats)
+        return stats.iterations
+    return work
+
+@benchmark("GaussSeidel (Gauss_Seidel)", "n", MATRIX_SIZES)
+def benchGaussSeidel(n):
+    A, b = testMatrix(n)
+    Aaug = [row + [v] for row, v in zip(A, b)]
+    stats = ss.IterationStats(residuals=False)
+
+    def work():
+        gs.GaussSeidel(Aaug, [0.0] * n, Niter=50, epsilon=1e-10, stats=stats)
+        return stats.iterations
+    return work
+
+@benchmark("cholesky_solve", "n", MATRIX_SIZES)
+def benchCholesky(n):
+    A, b = testMatrix(n)
+    return discard(hw3c.cholesky_solve, A, b)
+
+@benchmark("determinant", "n", MATRIX_SIZES)
+def benchDeterminant(n):
+    A, b = testMatrix(n)
+    return discard(hw3c.determinant, A)
+#endregion
+
+def measure(work, repeat, memory):
+    """
+    Times work() repeat times (once if a run takes over a second, and up to MAX_RUNS times until MIN_TIME has been
+    spent, so microsecond cases are not just timer noise) and measures its peak memory in one more run.
+    :return: dict with seconds (best), median, repeats, peakBytes and evaluations
+    """
+    times = []
+    evaluations = None
+    while len(times) < repeat or (sum(times) < MIN_TIME and len(times) < MAX_RUNS):
+        t0 = perf_counter()
+        evaluations = work()
+        times.append(perf_counter() - t0)
+        if times[-1] > 1.0:
+            break
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            work()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {"seconds": min(times), "median": median(times), "repeats": len(times), "peakBytes": peak,
+            "evaluations": evaluations}
+
+def gitCommit():
+    """
+    :return: the commit being benchmarked, or None outside of a git checkout
+    """
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() if out.returncode == 0 else None
+
+def runBenchmarks(maxN=max(MATRIX_SIZES), maxPanels=max(PANELS), only=None, repeat=3, memory=True, budget=30.0,
+                  log=None):
+    """
+    Runs the registered benchmarks.
+    :param maxN: largest matrix size
+    :param maxPanels: largest number of Simpson panels
+    :param only: list of substrings; only kernels whose name contains one of them are run (None for all)
+    :param repeat: timed runs per case
+    :param memory: also measure the peak memory of each case
+    :param budget: seconds; once a run of a kernel takes longer, its larger sizes are skipped
+    :param log: function called with a line of progress for every case (e.g., print), or None
+    :return: dict with "meta" (commit, python, platform, ...) and "results" (one dict per case)
+    """
+    results = []
+    for name, param, sizes, setup in KERNELS:
+        if only is not None and not any(s.lower() in name.lower() for s in only):
+            continue
+        limit = {"n": maxN, "N": maxPanels}.get(param)
+        overBudget = False
+        for size in sizes:
+            if limit is not None and size > limit:
+                continue
+            case = {"kernel": name, "param": param, "size": size}
+            if overBudget:
+                case["skipped"] = "a smaller size took longer than the budget of {} s".format(budget)
+            else:
+                case.update(measure(setup(size), repeat, memory))
+                overBudget = case["seconds"] > budget
+            results.append(case)
+            if log is not None:
+                log(formatCase(case))
+    meta = {"commit": gitCommit(), "python": platform.python_version(), "implementation":
+            platform.python_implementation(), "platform": platform.platform(), "backend":
+            os.environ.get("HW3_BACKEND", "python"), "seed": SEED, "repeat": repeat}
+    return {"meta": meta, "results": results}
+
+def formatCase(case):
+    """
+    :return: one line describing a benchmark result
+    """
+    head = "{:32s} {:14s}".format(case["kernel"], "{}={:g}".format(case["param"], case["size"]))
+    if "skipped" in case:
+        return head + " skipped"
+    return head + " {:10.6f} s  peak {:>10}  evals {}".format(
+        case["seconds"], "n/a" if case["peakBytes"] is None else "{:,} B".format(case["peakBytes"]),
+        "-" if case["evaluations"] is None else case["evaluations"])
+
+def compare(old, new, threshold=1.25):
+    """
+    Compares two benchmark results (as returned by runBenchmarks or loaded from their JSON).
+    :param old: the baseline results
+    :param new: the results to check
+    :param threshold: a case counts as a slowdown if new/old time exceeds this
+    :return: tuple (list of text lines, number of slowdowns)
+    """
+    key = lambda c: (c["kernel"], c["param"], c["size"])
+    before = {key(c): c for c in old["results"] if "seconds" in c}
+    lines, slow = [], 0
+    lines.append("old: {}  new: {}".format(old["meta"].get("commit"), new["meta"].get("commit")))
+    for c in new["results"]:
+        b = before.get(key(c))
+        if b is None or "seconds" not in c:
+            continue
+        ratio = c["seconds"] / b["seconds"] if b["seconds"] > 0 else float("inf")
+        flag = ""
+        if ratio > threshold:
+            flag = "  SLOWER"
+            slow += 1
+        elif ratio < 1 / threshold:
+            flag = "  faster"
+        lines.append("{:32s} {:14s} {:10.6f} -> {:10.6f} s  x{:.2f}{}".format(
+            c["kernel"], "{}={:g}".format(c["param"], c["size"]), b["seconds"], c["seconds"], ratio, flag))
+    return lines, slow
+
+def main(argv=None):
+    '''
+    Runs the benchmarks from the command line (see the explanation at the top of this file).
+    :return: exit code
+    '''
+    parser = argparse.ArgumentParser(description="Benchmark the numerical kernels of this package.")
+    parser.add_argument("--out", help="write the results as JSON to this file ('-' for stdout)")
+    parser.add_argument("--max-n", type=int, default=max(MATRIX_SIZES), help="largest matrix size")
+    parser.add_argument("--max-panels", type=float, default=max(PANELS), help="largest number of Simpson panels")
+    parser.add_argument("--only", help="comma separated parts of kernel names to run")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run of each case")
+    parser.add_argument("--budget", type=float, default=30.0,
+                        help="seconds per run after which a kernel skips its larger sizes")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two JSON result files")
+    parser.add_argument("--threshold", type=float, default=1.25, help="new/old time ratio that counts as slower")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            old = json.load(f)
+        with open(args.compare[1]) as f:
+            new = json.load(f)
+        lines, slow = compare(old, new, args.threshold)
+        print("\n".join(lines))
+        return 1 if slow > 0 else 0
+
+    quiet = args.out == "-"
+    log = (lambda line: print(line, file=sys.stderr)) if quiet else print
+    results = runBenchmarks(maxN=args.max_n, maxPanels=args.max_panels,
+                            only=args.only.split(",") if args.only else None, repeat=args.repeat,
+                            memory=not args.no_memory, budget=args.budget, log=log)
+    if args.out == "-":
+        json.dump(results, sys.stdout, indent=1)
+        print()
+    elif args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=1)
+    return 0
+#endregion
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,30 +1,72 @@
 # region imports
-from numericalMethods import GPDF, Probability, Secant
+from numericalMethods import GPDF, Probability, SafeNewton, CumulativeIntegral
 
 
 # endregion
 
 # region function definitions
-def FindCForProbability(target_P, mean, stDev, OneSided, GT):
+def TargetCDF(target_P, OneSided, GT):
     """
-    Uses the Secant method to find the value of c that results in the given probability.
+    Converts a probability question into the equivalent value of the CDF, q=P(x<c), so every mode can be solved
+    with the same inverse-CDF routine.
+    One-sided:  P(x<c)=P gives q=P, P(x>c)=P gives q=1-P
+    Two-sided (as in prob_diff, 1-2*Probability):  GT gives q=(1+P)/2, otherwise q=(1-P)/2
     :param target_P: The desired probability
+    :param OneSided: Boolean indicating one-sided or two-sided integration
+    :param GT: Boolean indicating whether to compute P(x>c) or P(x<c)
+    :return: the target value of P(x<c)
+    """
+    if OneSided:
+        return 1 - target_P if GT else target_P
+    return (1 + target_P) / 2 if GT else (1 - target_P) / 2
+
+
+def FindCForProbabilities(targets, mean, stDev, OneSided, GT, xtol=1e-8, maxiter=50, engine="simpson"):
+    """
+    Inverse-CDF (quantile) solver for a batch of target probabilities.
+    Each target is converted to q=P(x<c) and solved with SafeNewton, using the GPDF as the exact derivative of
+    P(x<c) and [mean-5*stDev, mean+8*stDev] as the bracket.  The starting guess comes from Tukey's closed-form
+    approximation of the normal quantile, z=4.91*(q^0.14-(1-q)^0.14), so Newton usually needs 2-3 steps.
+    :param targets: sequence of desired probabilities
     :param mean: Mean of the normal distribution
     :param stDev: Standard deviation
     :param OneSided: Boolean indicating one-sided or two-sided integration
     :param GT: Boolean indicating whether to compute P(x>c) or P(x<c)
-    :return: Value of c that matches the target probability
+    :param xtol: tolerance on c
+    :param maxiter: maximum Newton iterations per target
+    :param engine: "simpson" to integrate (incrementally, with one CumulativeIntegral shared by all targets)
+                   or "table" to use the table engine of Probability
+    :return: list of tuples (c, iterations, converged) in the same order as targets
     """
+    lo = mean - 5 * stDev
+    hi = mean + 8 * stDev
+    if engine == "simpson":  # extend one running integral instead of re-integrating from lo every step
+        cdf = CumulativeIntegral(GPDF, (mean, stDev), lo, h=stDev / 20)
+    else:
+        cdf = lambda c: Probability(GPDF, (mean, stDev), c, GT=False, engine=engine)
+    pdf = lambda c: GPDF((c, mean, stDev))
+    results = []
+    for P in targets:
+        q = TargetCDF(P, OneSided, GT)
+        if not (0 < q < 1):  # no c gives this probability
+            results.append((lo if q <= 0 else hi, 0, False))
+            continue
+        c0 = mean + stDev * 4.91 * (q ** 0.14 - (1 - q) ** 0.14)
+        results.append(SafeNewton(lambda x: cdf(x) - q, pdf, c0, lo, hi, maxiter=maxiter, xtol=xtol, rising=True))
+    return results
 
-    def prob_diff(c):
-        computed_P = Probability(GPDF, (mean, stDev), c, GT=GT)
-        if not OneSided:
-            computed_P = 1 - 2 * computed_P
-        return computed_P - target_P
 
-    c_guess1 = mean
-    c_guess2 = mean + stDev
-    c_solution, _ = Secant(prob_diff, c_guess1, c_guess2)
+def FindCForProbability(target_P, mean, stDev, OneSided, GT):
+    """
+    Finds the value of c that results in the given probability with the safeguarded Newton quantile solver.
+    :param target_P: The desired probability
+    :param mean: Mean of the normal distribution
+    :param stDev: Standard deviation
+    :param OneSided: Boolean indicating one-sided or two-sided integration
+    :param GT: Boolean indicating whether to compute P(x>c) or P(x<c)
+    :return: Value of c that matches the target probability
+    """
+    c_solution, _, _ = FindCForProbabilities([target_P], mean, stDev, OneSided, GT)[0]
     return c_solution
 
 
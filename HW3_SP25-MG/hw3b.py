@@ -1,9 +1,25 @@
 #region imports
-from math import gamma, pi
-from numericalMethods import Simpson
+from array import array
+from functools import lru_cache
+from math import lgamma, log, exp, pi
+from numericalMethods import Simpson, HermiteLookup
+import profiling
 #endregion
 
 #region function definitions
+T_TABLE_CACHE = 32  # the most t CDF tables (one per df) kept in memory at once
+
+@lru_cache(maxsize=None)
+def t_norm(df):
+    """
+    Normalization constant of the t-distribution, gamma((df+1)/2)/(gamma(df/2)*sqrt(df*pi)).
+    Computed once per df through lgamma so it does not overflow for large df.
+    :param df: Degrees of freedom
+    :return: the normalization constant
+    """
+    return exp(lgamma((df + 1) / 2) - lgamma(df / 2) - 0.5 * log(df * pi))
+
+@profiling.profiled(flops=6, evals=1)
 def t_pdf(args):
     """
     Computes the probability density function (PDF) of the t-distribution.
@@ -11,19 +27,71 @@ def t_pdf(args):
     :return: Probability density at x
     """
     x, df = args  # Unpack arguments
-    numerator = gamma((df + 1) / 2)
-    denominator = gamma(df / 2) * (df * pi) ** 0.5
     scaling_factor = (1 + (x ** 2) / df) ** (-(df + 1) / 2)
-    return (numerator / denominator) * scaling_factor
+    return t_norm(df) * scaling_factor
+
+class TCDFTable:
+    """
+    Table of the integral of t_pdf from 0 to z for one df, on 0 <= z <= zmax with spacing h.
+    Built once with Simpson (one 2-panel step per table interval, accumulated) and queried by cubic Hermite
+    interpolation with t_pdf as the exact slope.  cdf returns None beyond zmax so the caller can integrate directly.
+    """
+    __slots__ = ("df", "h", "zmax", "F", "f")
+
+    def __init__(self, df, h=0.01, zmax=10.0):
+        """
+        :param df: Degrees of freedom
+        :param h: spacing of the table in z
+        :param zmax: upper end of the table
+        """
+        self.df = df
+        self.h = h
+        self.zmax = zmax
+        n = int(round(zmax / h))
+        self.f = array('d', (t_pdf((i * h, df)) for i in range(n + 1)))
+        self.F = array('d', [0.0])
+        for i in range(n):
+            self.F.append(self.F[-1] + Simpson(t_pdf, (df, i * h, (i + 1) * h), N=2))
+
+    def cdf(self, z):
+        """
+        :param z: t-score
+        :return: P(T < z), or None if |z| > zmax
+        """
+        a = abs(z)
+        if a > self.zmax:
+            return None
+        p = HermiteLookup(self.F, self.f, self.h, a / self.h)
+        return 0.5 + p if z >= 0 else 0.5 - p
+
+@lru_cache(maxsize=T_TABLE_CACHE)
+def getTTable(df):
+    """
+    Returns the TCDFTable for df, building it on first use.  Only the T_TABLE_CACHE most recently used
+    tables stay in memory.
+    :param df: Degrees of freedom
+    :return: the TCDFTable
+    """
+    return TCDFTable(df)
 
-def t_cdf(z, df):
+def t_cdf(z, df, engine="simpson"):
     """
     Computes the cumulative probability P(T < z) using Simpson’s 1/3 Rule for numerical integration.
     Since the t-distribution is symmetric, we integrate from 0 to z and adjust accordingly.
+    With engine="table" the value is interpolated from the cached TCDFTable for df instead,
+    falling back to integration if z is beyond the table.
     :param z: Upper limit of integration (t-score)
     :param df: Degrees of freedom
+    :param engine: "simpson" to integrate directly or "table" to interpolate
     :return: Cumulative probability P(T < z)
     """
+    if engine == "table":
+        p = getTTable(df).cdf(z)
+        if p is not None:
+            return p
+    elif engine != "simpson":
+        raise ValueError("Unknown engine '{}'.".format(engine))
+
     if z < 0:
         return 1 - t_cdf(-z, df)  # Use symmetry for negative z-values
 
@@ -31,6 +99,20 @@ def t_cdf(z, df):
     prob = Simpson(t_pdf, (df, 0, z), N=1000)  # Pass extra argument structure
     return 0.5 + prob  # Add 0.5 since we integrated from 0 (symmetric property)
 
+def t_cdf_batch(zs, df):
+    """
+    Computes P(T < z) for every z in zs from the cached TCDFTable for df.
+    :param zs: sequence of t-scores
+    :param df: Degrees of freedom
+    :return: list of cumulative probabilities
+    """
+    table = getTTable(df)
+    probs = []
+    for z in zs:
+        p = table.cdf(z)
+        probs.append(p if p is not None else t_cdf(z, df))
+    return probs
+
 def main():
     """
     Computes probabilities from the t-distribution.
@@ -1,6 +1,17 @@
 #region imports
-from DoolittleMethod import Doolittle
-from matrixOperations import Transpose
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from array import array
+from math import log, sqrt
+from operator import mul
+from time import perf_counter
+from DoolittleMethod import PLUFactorization
+from matrixOperations import Matrix, LinearSolve, TriangularSolve
+from Gauss_Seidel import GaussSeidel
+import arrayBackend as ab
+import sparseMatrix as sm
+import solverStats as ss
+import profiling
 #endregion
 
 #region function definitions
@@ -19,96 +30,760 @@ def is_symmetric(A):
 
 def is_positive_definite(A):
     """
-    Checks if the matrix A is positive definite.
+    Checks if the matrix A is positive definite by attempting a Cholesky decomposition once.
+    The decomposition stops at the first non-positive pivot, so a matrix that is not positive definite
+    is usually rejected after only a few rows.
     :param A: Square matrix
     :return: True if positive definite, False otherwise
     """
-    n = len(A)
-    for i in range(n):
-        # Check if the leading principal minors are positive
-        sub_matrix = [row[:i+1] for row in A[:i+1]]
-        det = determinant(sub_matrix)
-        if det <= 0:
-            return False
+    try:
+        cholesky_decomposition(A)
+    except ValueError:
+        return False
     return True
 
+def log_determinant(matrix):
+    """
+    Computes the sign and natural log of the absolute value of the determinant from a pivoted LU factorization.
+    This is O(n^3) and does not overflow for large matrices the way the determinant itself can.
+    :param matrix: Square matrix
+    :return: tuple (sign, logabsdet); sign is 0 and logabsdet is -inf if the matrix is singular
+    """
+    L, U, perm, sign = PLUFactorization(matrix)
+    logdet = 0.0
+    for i in range(len(U)):
+        d = U[i][i]
+        if d == 0:
+            return (0, float("-inf"))
+        if d < 0:
+            sign = -sign
+        logdet += log(abs(d))
+    return (sign, logdet)
+
 def determinant(matrix):
     """
-    Computes the determinant of a square matrix using recursive expansion by minors.
+    Computes the determinant of a square matrix from a pivoted LU factorization, det(A)=sign*prod(diag(U)),
+    where sign accounts for the row swaps.
     :param matrix: Square matrix
     :return: Determinant of the matrix
     """
-    n = len(matrix)
-    if n == 1:
-        return matrix[0][0]
-    if n == 2:
-        return matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0]
-    det = 0
-    for col in range(n):
-        sub_matrix = [row[:col] + row[col+1:] for row in matrix[1:]]
-        det += ((-1) ** col) * matrix[0][col] * determinant(sub_matrix)
+    L, U, perm, det = PLUFactorization(matrix)
+    for i in range(len(U)):
+        det *= U[i][i]
     return det
 
-def cholesky_decomposition(A):
+CHOLESKY_BLOCK = 128  # columns per panel of the blocked Cholesky factorization
+
+class PackedCholesky:
     """
-    Performs Cholesky decomposition on a symmetric positive definite matrix A.
-    :param A: Symmetric positive definite matrix
-    :return: Lower triangular matrix L such that A = L * L^T
+    The Cholesky factor L of A = L*L^T in packed lower triangular storage: row i of L, its i+1 entries up to and
+    including the diagonal, sits at data[i*(i+1)//2 : i*(i+1)//2 + i + 1].  The n(n+1)/2 entries take half the
+    memory of a full nxn L, and rows being contiguous keeps both triangular solves on slices of data.  Build one
+    with packed_cholesky().
+    """
+    __slots__ = ("n", "data")
+
+    def __init__(self, n, data):
+        """
+        :param n: size of A
+        :param data: the n(n+1)/2 packed entries of L, an array('d') or a 1-D numpy array
+        """
+        if len(data) != n * (n + 1) // 2:
+            raise ValueError("{} entries do not fill a packed {}x{} triangle.".format(len(data), n, n))
+        self.n = n
+        self.data = data
+
+    def row(self, i):
+        """
+        :return: the entries L[i][0..i] (a view for a numpy factor, a copy otherwise)
+        """
+        r = i * (i + 1) // 2
+        return self.data[r:r + i + 1]
+
+    def toDense(self):
+        """
+        :return: L as a full nxn lower triangular matrix (numpy array for a numpy factor, otherwise list-of-lists)
+        """
+        n = self.n
+        if ab.isArray(self.data):
+            L = ab.np.zeros((n, n))
+            L[ab.np.tril_indices(n)] = self.data  # tril_indices runs row by row, the packed order
+            return L
+        return [self.row(i).tolist() + [0.0] * (n - i - 1) for i in range(n)]
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        """
+        Row i of L up to and including the diagonal, as a view of data, so TriangularSolve reads the packed factor
+        in place of a full matrix.
+        """
+        r = i * (i + 1) // 2
+        return self.data[r:r + i + 1] if ab.isArray(self.data) else memoryview(self.data)[r:r + i + 1]
+
+    def forwardSolve(self, b):
+        """
+        Solves L * y = b (TriangularSolve on the packed rows).
+        :param b: Right-hand side vector (or a matrix whose columns are right-hand sides)
+        :return: Solution vector y (a numpy array for a numpy factor)
+        """
+        if ab.isArray(self.data):
+            return TriangularSolve(self, ab.asArray(b), lower=True, backend=ab.NUMPY)
+        return TriangularSolve(self, b, lower=True, backend=ab.PYTHON)
+
+    def backSolve(self, y):
+        """
+        Solves L^T * x = y straight from the packed rows of L (TriangularSolve with trans=True): column i of L^T is
+        row i of L, so once x[i] is known it is eliminated from the equations above it with one contiguous row of L.
+        :param y: Right-hand side vector (or a matrix whose columns are right-hand sides)
+        :return: Solution vector x (a numpy array for a numpy factor)
+        """
+        if ab.isArray(self.data):
+            return TriangularSolve(self, ab.asArray(y), lower=True, trans=True, backend=ab.NUMPY)
+        return TriangularSolve(self, y, lower=True, trans=True, backend=ab.PYTHON)
+
+    def solve(self, b):
+        """
+        Solves A * x = b as L * y = b, then L^T * x = y.
+        :param b: Right-hand side vector
+        :return: Solution vector x
+        """
+        return self.backSolve(self.forwardSolve(b))
+
+@profiling.profiled(flops=lambda a, r, c: len(a["A"]) ** 3 // 3)
+def packed_cholesky(A, block=CHOLESKY_BLOCK, backend=None):
+    """
+    Cholesky factorization A = L*L^T of a symmetric positive definite matrix, right-looking and blocked: the
+    columns of L are factored a panel of `block` columns at a time (left-looking inside the panel), then the panel's
+    contribution L21*L21^T is subtracted from the trailing rows of A at once (a matrix product per block of rows
+    with numpy, one panel-wide dot product per entry otherwise).  Only the lower triangle of A is read.
+    :param A: Symmetric positive definite matrix (list-of-lists, numpy array or matrixOperations.Matrix)
+    :param block: columns per panel
+    :param backend: "python", "numpy" or None (see arrayBackend.resolveBackend)
+    :return: PackedCholesky holding L
+    :raises ValueError: as soon as a non-positive pivot shows A is not positive definite
     """
+    if block < 1:
+        raise ValueError("block must be at least 1, got {}.".format(block))
     n = len(A)
-    L = [[0.0] * n for _ in range(n)]
+    if ab.resolveBackend(backend, A) == ab.NUMPY:
+        np = ab.np
+        AA = ab.asArray(A)
+        P = AA[np.tril_indices(n)]  # copy of the lower triangle, row by row
+        rowStart = np.arange(n) * (np.arange(n) + 1) // 2
+        for k0 in range(0, n, block):
+            k1 = min(n, k0 + block)
+            diag = np.tril_indices(k1 - k0)  # the panel: the diagonal block and columns k0..k1-1 of the rows below
+            diagIdx = rowStart[k0 + diag[0]] + k0 + diag[1]
+            belowIdx = rowStart[k1:, None] + np.arange(k0, k1)
+            W = np.zeros((n - k0, k1 - k0))
+            W[diag] = P[diagIdx]
+            W[k1 - k0:] = P[belowIdx]
+            for j in range(k1 - k0):  # left-looking inside the panel
+                W[j:, j] -= W[j:, :j] @ W[j, :j]
+                pivot = W[j, j]
+                if pivot <= 0:
+                    raise ValueError("Matrix is not positive definite (pivot {} in row {}).".format(pivot, k0 + j))
+                W[j, j] = sqrt(pivot)
+                W[j + 1:, j] /= W[j, j]
+            P[diagIdx] = W[diag]
+            P[belowIdx] = W[k1 - k0:]
+            L21 = W[k1 - k0:]
+            for i0 in range(k1, n, block):  # trailing update A22 -= L21 * L21^T, one block of rows at a time
+                i1 = min(n, i0 + block)
+                rows, cols = np.tril_indices(i1 - i0, i0 - k1, i1 - k1)  # lower part of rows i0..i1-1, from column k1
+                C = L21[i0 - k1:i1 - k1] @ L21[:i1 - k1].T
+                P[rowStart[i0 + rows] + k1 + cols] -= C[rows, cols]
+        return PackedCholesky(n, P)
+
+    P = array('d')
     for i in range(n):
-        for j in range(i + 1):
-            if i == j:
-                sum_k = sum(L[i][k] ** 2 for k in range(j))
-                L[i][j] = (A[i][i] - sum_k) ** 0.5
-            else:
-                sum_k = sum(L[i][k] * L[j][k] for k in range(j))
-                L[i][j] = (A[i][j] - sum_k) / L[j][j]
-    return L
+        P.extend(map(float, A[i][:i + 1]))
+    for k0 in range(0, n, block):
+        k1 = min(n, k0 + block)
+        W = [P[r + k0:r + min(i + 1, k1)].tolist() for i, r in ((i, i * (i + 1) // 2) for i in range(k0, n))]
+        for j in range(k1 - k0):  # the panel, each column updated with the panel columns to its left
+            Wj = W[j]
+            Lj = Wj[:j]
+            pivot = Wj[j] - sum(map(mul, Lj, Lj))
+            if pivot <= 0:
+                raise ValueError("Matrix is not positive definite (pivot {} in row {}).".format(pivot, k0 + j))
+            d = Wj[j] = sqrt(pivot)
+            for Wi in W[j + 1:]:
+                Wi[j] = (Wi[j] - sum(map(mul, Wi, Lj))) / d
+        for i in range(k0, n):
+            r = i * (i + 1) // 2
+            Wi = W[i - k0]
+            P[r + k0:r + k0 + len(Wi)] = array('d', Wi)
+            if i >= k1:  # trailing update: row i of A22 minus L21[i] * L21^T, one panel-wide dot product per entry
+                P[r + k1:r + i + 1] = array('d', [a - sum(map(mul, Wi, Wj)) for a, Wj in
+                                                  zip(P[r + k1:r + i + 1], W[k1 - k0:])])
+    return PackedCholesky(n, P)
+
+def cholesky_decomposition(A, backend=None):
+    """
+    Performs Cholesky decomposition on a symmetric positive definite matrix A (see packed_cholesky, which keeps L
+    in half the memory).
+    :param A: Symmetric positive definite matrix
+    :param backend: "python", "numpy" or None (see arrayBackend.resolveBackend)
+    :return: Lower triangular matrix L such that A = L * L^T
+    :raises ValueError: as soon as a non-positive pivot shows A is not positive definite
+    """
+    L = packed_cholesky(A, backend=backend).toDense()
+    return ab.restore(L, A) if ab.isArray(L) else L
 
-def forward_substitution(L, b):
+def forward_substitution(L, b, backend=None):
     """
     Solves the system L * y = b using forward substitution.
     :param L: Lower triangular matrix
-    :param b: Right-hand side vector
+    :param b: Right-hand side vector (or a matrix whose columns are right-hand sides)
+    :param backend: "python", "numpy" or None (see arrayBackend.resolveBackend)
     :return: Solution vector y
     """
-    n = len(L)
-    y = [0.0] * n
-    for i in range(n):
-        y[i] = (b[i] - sum(L[i][j] * y[j] for j in range(i))) / L[i][i]
-    return y
+    return TriangularSolve(L, b, lower=True, backend=backend)
 
-def backward_substitution(U, y):
+def backward_substitution(U, y, backend=None):
     """
     Solves the system U * x = y using backward substitution.
     :param U: Upper triangular matrix
-    :param y: Right-hand side vector
+    :param y: Right-hand side vector (or a matrix whose columns are right-hand sides)
+    :param backend: "python", "numpy" or None (see arrayBackend.resolveBackend)
     :return: Solution vector x
     """
-    n = len(U)
-    x = [0.0] * n
-    for i in range(n - 1, -1, -1):
-        x[i] = (y[i] - sum(U[i][j] * x[j] for j in range(i + 1, n))) / U[i][i]
-    return x
+    return TriangularSolve(U, y, backend=backend)
 
-def cholesky_solve(A, b):
+def cholesky_solve(A, b, backend=None):
     """
     Solves Ax = b using the Cholesky decomposition method.
     :param A: Symmetric positive definite matrix
     :param b: Right-hand side vector
+    :param backend: "python", "numpy" or None (see arrayBackend.resolveBackend)
+    :return: Solution vector x
+    """
+    if ab.resolveBackend(backend, A, b) == ab.NUMPY:
+        return ab.restore(packed_cholesky(ab.asArray(A), backend=ab.NUMPY).solve(b), A, b)
+    return packed_cholesky(A).solve(b)  # L * y = b, then L^T * x = y on the packed L
+
+def conjugate_gradient(A, b, x0=None, tol=1e-10, maxiter=None, preconditioner="jacobi", diagonal=None,
+                       backend=None, stats=None, callback=None):
+    """
+    Solves Ax = b for a symmetric positive definite A with the (preconditioned) Conjugate Gradient method.
+    Only products A*p are needed, so each iteration costs one matrix-vector product, O(nnz) for a CSRMatrix,
+    and no factor of A is ever formed.  In exact arithmetic CG finishes in at most n iterations.
+    :param A: SPD matrix as a list-of-lists, numpy array, matrixOperations.Matrix or sparseMatrix.CSRMatrix,
+              or a function A(p) returning the product A*p
+    :param b: Right-hand side vector
+    :param x0: initial guess (warm start), zeros if None
+    :param tol: stop once ||b - A x|| <= tol*||b||
+    :param maxiter: iteration budget, 10*n if None
+    :param preconditioner: "jacobi" (scale the residual by 1/diag(A)), None, or a function M(r) returning M^-1 r
+    :param diagonal: diag(A), needed for "jacobi" when A is a function
+    :param backend: "python", "numpy" or None (see arrayBackend.resolveBackend)
+    :param stats: a solverStats.IterationStats to record the iterations (residual norm, step size) and convergence
+    :param callback: function callback(stats) called after every iteration
+    :return: Solution vector x
+    """
+    stats = ss.getStats(stats, callback)
+    useNumpy = ab.resolveBackend(backend, A, b, x0) == ab.NUMPY
+    n = len(b)
+    if isinstance(A, sm.CSRMatrix):
+        if A.shape != (n, n):
+            raise ValueError("A is {}x{} but b has {} entries.".format(*A.shape, n))
+        matvec = A.matvec if not useNumpy else lambda p: ab.np.asarray(A.matvec(p.tolist()))
+        diag = [A.get(i, i) for i in range(n)]
+    elif callable(A):
+        matvec = A if not useNumpy else lambda p: ab.asVector(A(p))
+        diag = diagonal
+    elif useNumpy:
+        AA = A.asNumpy() if isinstance(A, Matrix) else ab.asArray(A)
+        matvec = AA.__matmul__
+        diag = AA.diagonal()
+    else:
+        matvec = lambda p: [sum(map(mul, A[i], p)) for i in range(n)]
+        diag = [A[i][i] for i in range(n)]
+    if preconditioner == "jacobi":
+        if diag is None:
+            raise ValueError("The jacobi preconditioner needs diagonal= when A is given as a function.")
+        if any(d <= 0 for d in diag):
+            raise ValueError("A is not positive definite (non-positive diagonal entry).")
+        if useNumpy:
+            invDiag = 1.0 / ab.asVector(diag)  # converted once, not on every application
+            precondition = lambda r: r * invDiag
+        else:
+            invDiag = [1.0 / d for d in diag]
+            precondition = lambda r: list(map(mul, invDiag, r))
+    elif preconditioner is None:
+        precondition = None
+    elif callable(preconditioner):
+        precondition = preconditioner
+    else:
+        raise ValueError("Unknown preconditioner '{}', use 'jacobi', None or a function.".format(preconditioner))
+    if maxiter is None:
+        maxiter = 10 * n
+
+    if useNumpy:
+        bb = ab.asVector(b)
+        x = ab.np.zeros(n) if x0 is None else ab.asVector(x0).copy()
+        dot = lambda u, v: float(u @ v)
+        axpy = lambda a, u, v: v + a * u  # a*u + v
+        amax = lambda u: float(ab.np.abs(u).max()) if len(u) else 0.0
+    else:
+        bb = list(b)
+        x = [0.0] * n if x0 is None else [float(v) for v in x0]
+        dot = lambda u, v: sum(map(mul, u, v))
+        axpy = lambda a, u, v: [a * ui + vi for ui, vi in zip(u, v)]
+        amax = lambda u: max(map(abs, u), default=0.0)
+
+    if stats is not None:
+        stats.begin("hw3c.conjugate_gradient", tol, maxiter)
+    r = axpy(-1.0, matvec(x), bb) if x0 is not None else (bb.copy() if useNumpy else list(bb))
+    z = precondition(r) if precondition is not None else r
+    p = z
+    rz = dot(r, z)
+    target = tol * sqrt(dot(bb, bb))
+    converged = sqrt(dot(r, r)) <= target
+    k = 0
+    while not converged and k < maxiter:
+        if stats is not None:
+            t0 = perf_counter()
+        Ap = matvec(p)
+        pAp = dot(p, Ap)
+        if pAp <= 0:
+            raise ValueError("A is not positive definite (p^T A p = {} in iteration {}).".format(pAp, k))
+        alpha = rz / pAp
+        x = axpy(alpha, p, x)
+        r = axpy(-alpha, Ap, r)
+        rNorm = sqrt(dot(r, r))
+        converged = rNorm <= target
+        k += 1
+        if stats is not None:
+            stats.record(abs(alpha) * amax(p), perf_counter() - t0, rNorm)
+        if converged:
+            break
+        z = precondition(r) if precondition is not None else r
+        rzNew = dot(r, z)
+        p = axpy(rzNew / rz, p, z)  # new search direction, A-conjugate to the previous ones
+        rz = rzNew
+    if stats is not None:
+        stats.finish(converged)
+    return ab.restore(x, A, b, x0) if useNumpy else x
+
+def banded_solve(A, b, lower=None, upper=None, spd=False):
+    """
+    Solves Ax = b for a banded A (A[i][j] = 0 unless -lower <= j-i <= upper) by Gaussian elimination inside the
+    band, which costs O(n*lower*upper) instead of O(n^3).  There is no pivoting, so A should be diagonally dominant
+    or symmetric positive definite.
+    :param A: Square matrix (list-of-lists, numpy array, matrixOperations.Matrix or sparseMatrix.CSRMatrix)
+    :param b: Right-hand side vector
+    :param lower: number of sub-diagonals (found from A if None)
+    :param upper: number of super-diagonals (found from A if None)
+    :param spd: A is expected to be symmetric positive definite, so every pivot must be positive
     :return: Solution vector x
+    :raises ValueError: on a zero pivot (or a non-positive one with spd=True)
+    """
+    if lower is None or upper is None:
+        s = MatrixStructure(A)
+        lower, upper = s.lowerBandwidth, s.upperBandwidth
+    n = len(b)
+    w = lower + upper + 1
+    band = [[0.0] * w for _ in range(n)]  # band[i][j - i + lower] = A[i][j]
+    if isinstance(A, sm.CSRMatrix):
+        for i in range(n):
+            for j, v in zip(*A.row(i)):
+                band[i][j - i + lower] = v
+    else:
+        for i in range(n):
+            row = A[i]
+            for j in range(max(0, i - lower), min(n, i + upper + 1)):
+                band[i][j - i + lower] = float(row[j])
+    x = [float(v) for v in (b.tolist() if ab.isArray(b) else b)]
+    for k in range(n):  # eliminate below the pivot; row k only reaches upper columns to the right
+        pivot = band[k][lower]
+        if pivot == 0 or (spd and pivot < 0):
+            raise ValueError("Pivot {} in row {}, banded_solve does not pivot.".format(pivot, k))
+        for i in range(k + 1, min(n, k + lower + 1)):
+            l = band[i][k - i + lower] / pivot
+            if l != 0:
+                off = k - i  # column j sits at j - i + lower in row i and at j - k + lower in row k
+                ri, rk = band[i], band[k]
+                for t in range(lower, w):
+                    ri[t + off] -= l * rk[t]
+                x[i] -= l * x[k]
+    for i in range(n - 1, -1, -1):
+        s = x[i]
+        for j in range(i + 1, min(n, i + upper + 1)):
+            s -= band[i][j - i + lower] * x[j]
+        x[i] = s / band[i][lower]
+    return ab.restore(ab.asVector(x), A, b) if ab.isArray(A) or ab.isArray(b) else x
+
+class MatrixStructure:
+    """
+    The structural properties of a square matrix that decide which solver suits it, found by scanning the matrix
+    once (O(n^2) for dense storage, O(nnz) for a CSRMatrix).  Keep the MatrixStructure and pass it to solve() as
+    structure= to solve with the same A again without rescanning it; rebuild it if A is changed.
+    """
+    __slots__ = ("n", "nnz", "sparse", "symmetric", "positiveDiagonal", "dominance", "lowerBandwidth",
+                 "upperBandwidth")
+
+    def __init__(self, A):
+        """
+        :param A: Square matrix (list-of-lists, numpy array, matrixOperations.Matrix or sparseMatrix.CSRMatrix)
+        """
+        self.sparse = isinstance(A, sm.CSRMatrix)
+        if self.sparse:
+            n = A.nRows
+            if A.nCols != n:
+                raise ValueError("Expected a square matrix, got {}x{}.".format(*A.shape))
+            rows = (zip(*A.row(i)) for i in range(n))
+        elif ab.isArray(A):
+            n = A.shape[0]
+            if A.shape != (n, n):
+                raise ValueError("Expected a square matrix, got {}x{}.".format(*A.shape))
+            rows = None
+        else:
+            n = len(A)
+            if any(len(A[i]) != n for i in range(n)):
+                raise ValueError("Expected a square matrix.")
+            rows = (((j, v) for j, v in enumerate(A[i]) if v != 0) for i in range(n))
+        self.n = n
+        if rows is None:  # numpy: the same properties from whole-array operations
+            np = ab.np
+            absA = np.abs(A)
+            d = absA.diagonal()
+            off = absA.sum(axis=1) - d
+            I, J = np.nonzero(A)
+            self.nnz = len(I)
+            self.symmetric = bool(np.array_equal(A, A.T))
+            self.positiveDiagonal = bool(np.all(A.diagonal() > 0))
+            self.dominance = float(np.max(np.where(d > 0, off / np.where(d > 0, d, 1), np.inf))) if n > 0 else 0.0
+            self.lowerBandwidth = int(np.max(I - J, initial=0))
+            self.upperBandwidth = int(np.max(J - I, initial=0))
+            return
+        nnz, lower, upper, dominance = 0, 0, 0, 0.0
+        positiveDiagonal = True
+        entries = {} if self.sparse else None
+        for i, row in enumerate(rows):
+            diag, off = 0.0, 0.0
+            for j, v in row:
+                nnz += 1
+                if j == i:
+                    diag = v
+                else:
+                    off += abs(v)
+                    if j < i:
+                        lower = max(lower, i - j)
+                    else:
+                        upper = max(upper, j - i)
+                if entries is not None:
+                    entries[(i, j)] = v
+            positiveDiagonal = positiveDiagonal and diag > 0
+            dominance = max(dominance, off / abs(diag) if diag != 0 else float("inf"))
+        self.nnz, self.lowerBandwidth, self.upperBandwidth = nnz, lower, upper
+        self.positiveDiagonal, self.dominance = positiveDiagonal, dominance
+        if entries is not None:
+            self.symmetric = all(entries.get((j, i)) == v for (i, j), v in entries.items())
+        else:
+            self.symmetric = lower == upper and is_symmetric(A)
+
+    @property
+    def density(self):
+        return self.nnz / float(self.n * self.n) if self.n > 0 else 0.0
+
+    @property
+    def diagonallyDominant(self):
+        """
+        True if every row is strictly diagonally dominant, which guarantees Gauss-Seidel converges.
+        """
+        return self.dominance < 1
+
+    @property
+    def maybeSPD(self):
+        """
+        Symmetric with a positive diagonal: necessary for positive definiteness (and sufficient together with
+        diagonal dominance).  Cholesky or CG confirm it while solving.
+        """
+        return self.symmetric and self.positiveDiagonal
+
+    def __repr__(self):
+        return ("MatrixStructure(n={}, nnz={}, symmetric={}, positiveDiagonal={}, dominance={:.3g}, "
+                "bandwidth=({}, {}))").format(self.n, self.nnz, self.symmetric, self.positiveDiagonal,
+                                               self.dominance, self.lowerBandwidth, self.upperBandwidth)
+
+class SolverChoice:
+    """
+    Which solver solve() picked, its estimated cost in floating point operations, and why.
+    """
+    __slots__ = ("name", "cost", "reason", "rejected")
+
+    def __init__(self, name, cost, reason):
+        self.name = name
+        self.cost = cost
+        self.reason = reason
+        self.rejected = []  # (name, why) of cheaper solvers that were tried first and failed
+
+    def __repr__(self):
+        s = "{} (~{:.3g} flops): {}".format(self.name, self.cost, self.reason)
+        for name, why in self.rejected:
+            s += "; {} failed: {}".format(name, why)
+        return s
+
+SPARSE_DENSITY = 0.25  # below this density the iterative solvers work on a CSRMatrix copy of a dense A
+
+def rank_solvers(structure, tol=1e-10):
+    """
+    The cost model of solve(): every solver that applies to a matrix with this structure, cheapest first.
+    Costs are flop estimates, n^3/3 for Cholesky, 2n^3/3 for LU, ~2*n*lower*upper for banded elimination and
+    (iterations)*(cost of one sweep or product) for Gauss-Seidel/SOR and CG.  The iteration counts come from the
+    diagonal dominance d = max over rows of sum|a_ij|/|a_ii| (j != i): Gauss-Seidel contracts at least by d per
+    sweep, and for a diagonally dominant SPD matrix the Jacobi scaled condition number is at most (1+d)/(1-d).
+    :param structure: MatrixStructure of A
+    :param tol: relative accuracy wanted from the iterative solvers
+    :return: list of SolverChoice, cheapest first (pivoted LU always applies and is last if nothing beats it)
+    """
+    s = structure
+    n = s.n
+    lnTol = log(1.0 / tol)
+    sweep = 2.0 * (s.nnz if s.sparse or s.density < SPARSE_DENSITY else n * n)
+    choices = [SolverChoice("lu", 2.0 * n ** 3 / 3, "pivoted LU applies to any non-singular matrix")]
+    if s.maybeSPD:
+        choices.append(SolverChoice("cholesky", n ** 3 / 3.0, "symmetric with a positive diagonal, try Cholesky "
+                                                              "(half the work of LU)"))
+    p, q = s.lowerBandwidth, s.upperBandwidth
+    if (s.diagonallyDominant or s.maybeSPD) and p + q + 1 < n:
+        choices.append(SolverChoice("banded", 2.0 * n * max(p, 1) * max(q, 1) + 2.0 * n * (p + q + 1),
+                                    "bandwidth ({}, {}) and {}, eliminate inside the band".format(
+                                        p, q, "diagonally dominant" if s.diagonallyDominant else "possibly SPD")))
+    if s.diagonallyDominant:
+        k = lnTol / log(1.0 / s.dominance) if s.dominance > 0 else 1.0
+        choices.append(SolverChoice("sor", (k + 1) * sweep, "strictly diagonally dominant (d={:.3g}), Gauss-Seidel/SOR"
+                                                            " converges in ~{:.0f} sweeps".format(s.dominance, k)))
+    if s.maybeSPD:
+        if s.diagonallyDominant:
+            kappa = (1 + s.dominance) / (1 - s.dominance)
+            k = min(n, 0.5 * sqrt(kappa) * (lnTol + log(2.0)))
+            why = "SPD (symmetric, diagonally dominant, d={:.3g}), CG needs ~{:.0f} iterations".format(s.dominance, k)
+        else:
+            k = n
+            why = "symmetric with a positive diagonal, CG needs at most ~n={} iterations".format(n)
+        choices.append(SolverChoice("cg", k * (sweep + 10.0 * n), why))
+    choices.sort(key=lambda c: c.cost)
+    return choices
+
+def _dense(A):
+    """
+    :return: A as a list-of-lists or numpy array, for the direct solvers
+    """
+    if isinstance(A, sm.CSRMatrix):
+        return A.toDense()
+    if isinstance(A, Matrix):
+        return A.toLists()
+    return A
+
+def _sparse(A, structure):
+    """
+    :return: A as a CSRMatrix if it is sparse enough for the iterative solvers to gain from it, otherwise A
+    """
+    if isinstance(A, sm.CSRMatrix) or structure.density >= SPARSE_DENSITY:
+        return A
+    return sm.CSRMatrix.fromDense(_dense(A).tolist() if ab.isArray(A) else _dense(A))
+
+def _run(name, A, b, structure, tol, backend):
+    """
+    Runs one solver of solve().
+    :return: x, or None if an iterative solver did not converge
     """
-    L = cholesky_decomposition(A)  # Get lower triangular matrix L
-    y = forward_substitution(L, b)  # Solve L * y = b
-    x = backward_substitution(Transpose(L), y)  # Solve L^T * x = y
-    return x
+    bl = ab.asVector(b).tolist() if ab.isArray(b) else list(b)
+    if name == "cholesky":
+        return cholesky_solve(_dense(A), b, backend=backend)
+    if name == "lu":
+        return _like(LinearSolve(_dense(A), b, backend=backend), A, b)
+    if name == "banded":
+        return banded_solve(A, b, structure.lowerBandwidth, structure.upperBandwidth,
+                            spd=not structure.diagonallyDominant)
+    stats = ss.IterationStats(residuals=False)
+    if name == "cg":
+        x = conjugate_gradient(_sparse(A, structure), b, tol=tol, maxiter=2 * structure.n + 10, backend=backend,
+                               stats=stats)
+        return x if stats.converged else None
+    # sor: Gauss-Seidel stops on the largest change in x, so tol is taken relative to the size of b
+    AA = _sparse(A, structure)
+    aug = AA.augment(bl) if isinstance(AA, sm.CSRMatrix) else [list(r) + [v] for r, v in zip(_dense(AA), bl)]
+    epsilon = tol * max(max(map(abs, bl), default=0.0), 1e-300)
+    x = GaussSeidel(aug, [0.0] * structure.n, Niter=100 * structure.n + 100, epsilon=epsilon, omega="auto",
+                    stats=stats, reorder=False)  # A is already diagonally dominant row by row
+    return _like(x, A, b) if stats.converged else None
+
+def _like(x, A, b):
+    """
+    :return: the solution x as a numpy array if A or b is one, otherwise as a simple list
+    """
+    return ab.restore(ab.asVector(x), A, b) if ab.isArray(A) or ab.isArray(b) else x
+
+def solve(A, b, tol=1e-10, structure=None, backend=None):
+    """
+    Solves Ax = b with whichever solver of this package the cost model (rank_solvers) expects to be cheapest for the
+    structure of A: Cholesky, pivoted LU, banded elimination, Gauss-Seidel/SOR or Conjugate Gradient.  If the chosen
+    solver fails (e.g., Cholesky finds A is not positive definite, or an iterative solver does not converge) the
+    next cheapest one is tried, down to pivoted LU.
+    :param A: Square matrix (list-of-lists, numpy array, matrixOperations.Matrix or sparseMatrix.CSRMatrix)
+    :param b: Right-hand side vector
+    :param tol: relative accuracy wanted from the iterative solvers
+    :param structure: MatrixStructure of A from an earlier call, to skip scanning A again
+    :param backend: "python", "numpy" or None (see arrayBackend.resolveBackend)
+    :return: tuple (x, SolverChoice)
+    """
+    if structure is None:
+        structure = MatrixStructure(A)
+    if len(b) != structure.n:
+        raise ValueError("A is {0}x{0} but b has {1} entries.".format(structure.n, len(b)))
+    rejected = []
+    for choice in rank_solvers(structure, tol):
+        try:
+            x = _run(choice.name, A, b, structure, tol, backend)
+        except ValueError as e:
+            if choice.name == "lu":
+                raise
+            rejected.append((choice.name, str(e).rstrip(".")))
+            continue
+        if x is None:
+            rejected.append((choice.name, "did not converge"))
+            continue
+        choice.rejected = rejected
+        return (x, choice)
+
+class BatchResult:
+    """
+    The outcome of one problem of solve_batch: the solution and solver choice, or the error it raised.
+    """
+    __slots__ = ("index", "x", "choice", "error")
+
+    def __init__(self, index, x=None, choice=None, error=None):
+        """
+        :param index: position of the problem in the input
+        :param x: Solution vector (None if the problem failed)
+        :param choice: SolverChoice of solve() (None if the problem failed)
+        :param error: "ExceptionType: message" if the problem failed, else None
+        """
+        self.index = index
+        self.x = x
+        self.choice = choice
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.error is not None:
+            return "BatchResult({}, error={!r})".format(self.index, self.error)
+        return "BatchResult({}, {}, x={})".format(self.index, self.choice.name, self.x)
+
+BATCH_CHUNK = 64  # problems sent to a worker process at a time
+
+def _solve_chunk(chunk, tol):
+    """
+    Solves one chunk of solve_batch in a worker process.
+    :param chunk: list of (index, A, b)
+    :param tol: passed on to solve()
+    :return: list of BatchResult
+    """
+    results = []
+    for index, A, b in chunk:
+        try:
+            x, choice = solve(A, b, tol=tol)
+            results.append(BatchResult(index, x, choice))
+        except Exception as e:  # report the failure with the problem instead of stopping the batch
+            results.append(BatchResult(index, error="{}: {}".format(type(e).__name__, e)))
+    return results
+
+def _chunks(problems, size):
+    """
+    :param problems: iterable of {"A": A, "b": b} dicts or (A, b) pairs
+    :param size: problems per chunk
+    :return: generator of lists of (index, A, b)
+    """
+    chunk = []
+    for index, problem in enumerate(problems):
+        A, b = (problem["A"], problem["b"]) if isinstance(problem, dict) else problem
+        chunk.append((index, A, b))
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if len(chunk) > 0:
+        yield chunk
+
+def solve_batch(problems, workers=None, chunksize=BATCH_CHUNK, ordered=True, tol=1e-10):
+    """
+    Solves many independent systems Ax = b with solve() (so Cholesky, Doolittle/pivoted LU, ... as each one
+    suits) on a pool of worker processes.  Problems are read lazily and sent to the workers in chunks of
+    chunksize, at most two chunks per worker in flight or (ordered) waiting behind a slower earlier chunk, so the
+    input can be a generator of any length and the inter-process overhead is paid per chunk rather than per
+    problem.  A problem that fails gives a BatchResult with its error, and so does every problem of a chunk that
+    could not be run at all (e.g. it cannot be pickled, such as an A given as a function, or the pool broke); the
+    rest of the batch goes on.
+    :param problems: iterable of {"A": A, "b": b} dicts (as in main) or (A, b) pairs
+    :param workers: number of worker processes, None for one per CPU, 0 to solve in this process
+    :param chunksize: problems per task sent to a worker
+    :param ordered: yield the results in input order (True) or as soon as each chunk is done (False)
+    :param tol: passed on to solve()
+    :return: generator of BatchResult
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1, got {}.".format(chunksize))
+    chunks = _chunks(problems, chunksize)
+    if workers == 0:
+        for chunk in chunks:
+            yield from _solve_chunk(chunk, tol)
+        return
+    if workers is None:
+        workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}  # future -> indices of the problems in its chunk
+        finished = {}  # ordered mode: index of the first problem of a chunk -> its results
+        nextIndex = 0  # ordered mode: index of the next result to yield
+        exhausted = False
+        try:
+            while True:
+                # keep every worker busy but the input lazy: chunks done out of order count against the limit
+                # too, so they cannot pile up while an earlier chunk is still running
+                while not exhausted and len(pending) + len(finished) < 2 * workers:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                    else:
+                        try:
+                            future = pool.submit(_solve_chunk, chunk, tol)
+                        except Exception as e:  # e.g. the pool is broken, fail this chunk like a failed future
+                            future = Future()
+                            future.set_exception(e)
+                        pending[future] = [index for index, A, b in chunk]
+                if len(pending) == 0:
+                    break
+                done = wait(pending, return_when=FIRST_COMPLETED).done
+                for future in done:
+                    indices = pending.pop(future)
+                    try:
+                        results = future.result()
+                    except Exception as e:  # the chunk never ran, so each of its problems gets the error
+                        error = "{}: {}".format(type(e).__name__, e)
+                        results = [BatchResult(index, error=error) for index in indices]
+                    if ordered:
+                        finished[results[0].index] = results
+                    else:
+                        yield from results
+                while nextIndex in finished:
+                    results = finished.pop(nextIndex)
+                    nextIndex = results[-1].index + 1
+                    yield from results
+        finally:  # the caller may stop early, don't leave queued chunks behind
+            for future in pending:
+                future.cancel()
 
 def main():
     """
-    This program determines whether to use the Cholesky or Doolittle method
-    to solve Ax = b and prints the solution.
+    This program lets solve() determine whether to use the Cholesky or Doolittle (LU) method (or one of the
+    other solvers) to solve Ax = b and prints the solution.
     """
     matrices = [
         {
@@ -132,13 +807,8 @@ def main():
 
         print("Vector b:", b)
 
-        if is_symmetric(A) and is_positive_definite(A):
-            print("Using Cholesky method...")
-            x = cholesky_solve(A, b)
-        else:
-            print("Using Doolittle method...")
-            augmented_matrix = [row + [b[i]] for i, row in enumerate(A)]  # Convert to augmented form
-            x = Doolittle(augmented_matrix)
+        x, choice = solve(A, b)  # picks Cholesky for SPD matrices, pivoted LU (Doolittle) otherwise, ...
+        print("Using {} method ({})".format(choice.name, choice.reason))
 
         print("Solution vector x:", [round(val, 3) for val in x])
 
@@ -0,0 +1,251 @@
+#region explanation
+# Out-of-core storage for augmented matrices [A|b] too big to hold in memory as a list-of-lists.
+# The matrix lives in a binary file that is memory-mapped read-only, so the Gauss-Seidel sweeps read it row by row
+# through the operating system's page cache and only the solution vector x has to stay in memory.
+#
+# File format (all numbers little-endian):
+#   bytes 0..63    header: magic b"HW3MMAT\0" (8 bytes), format version (uint32, 1), storage (uint32, 0 = dense,
+#                  1 = CSR), nRows (uint64), nCols (uint64), nnz (uint64), zero padding up to 64 bytes
+#   dense storage: the nRows*nCols entries as float64 in row-major order, starting at byte 64
+#   CSR storage:   indices  int64[nnz]      column of each non-zero, increasing within a row, starting at byte 64
+#                  data     float64[nnz]    value of each non-zero, starting at byte 64 + 8*nnz
+#                  indptr   int64[nRows+1]  row i is indices/data[indptr[i]:indptr[i+1]], starting at 64 + 16*nnz
+# For an augmented matrix nCols = nRows + 1 and b is the last column.  indptr comes last so that save() can write
+# a CSR file in one pass over the rows.  Write files with save(), open them with MappedMatrix.
+# The rows are swept in the order they are stored (there is no DiagDominant reordering out of core), so save them
+# in a diagonal dominant order, e.g. with save(..., reorder=True).
+#endregion
+
+#region imports
+import mmap
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from math import sqrt
+from operator import mul
+import sparseMatrix as sm
+#endregion
+
+#region function definitions
+MAGIC = b"HW3MMAT\0"
+VERSION = 1
+DENSE = 0
+CSR = 1
+HEADER = struct.Struct("<8sIIQQQ")
+HEADER_SIZE = 64
+
+class MappedMatrix:
+    """
+    A read-only matrix in a memory-mapped file (see the file format above).  Rows are memoryviews into the map, so
+    reading one copies nothing.  Use it as a context manager, or call close(), to unmap the file.
+    """
+    __slots__ = ("path", "nRows", "nCols", "nnz", "sparse", "_file", "_map", "_data", "_indices", "_indptr")
+
+    def __init__(self, path):
+        """
+        :param path: file written by save()
+        :raises ValueError: if the file is not in this format or is truncated
+        """
+        if sys.byteorder != "little":
+            raise ValueError("Memory-mapped matrices are stored little-endian, which this machine is not.")
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            head = self._file.read(HEADER_SIZE)
+            if len(head) < HEADER_SIZE or head[:len(MAGIC)] != MAGIC:
+                raise ValueError("{} is not a memory-mapped matrix file.".format(path))
+            magic, version, storage, self.nRows, self.nCols, self.nnz = HEADER.unpack_from(head)
+            if version != VERSION or storage not in (DENSE, CSR):
+                raise ValueError("{} has format version {} and storage {}, expected version {}.".format(
+                    path, version, storage, VERSION))
+            self.sparse = storage == CSR
+            size = HEADER_SIZE + (16 * self.nnz + 8 * (self.nRows + 1) if self.sparse else 8 * self.nRows * self.nCols)
+            self._file.seek(0, 2)
+            if self._file.tell() < size:
+                raise ValueError("{} is truncated ({} bytes, expected {}).".format(path, self._file.tell(), size))
+            self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            self._map.madvise(mmap.MADV_SEQUENTIAL)  # the sweeps read the rows in order
+        view = memoryview(self._map)
+        if self.sparse:
+            self._indices = view[HEADER_SIZE:HEADER_SIZE + 8 * self.nnz].cast("q")
+            self._data = view[HEADER_SIZE + 8 * self.nnz:HEADER_SIZE + 16 * self.nnz].cast("d")
+            self._indptr = view[HEADER_SIZE + 16 * self.nnz:size].cast("q")
+        else:
+            self._data = view[HEADER_SIZE:size].cast("d")
+            self._indices = self._indptr = None
+
+    @property
+    def shape(self):
+        return (self.nRows, self.nCols)
+
+    def __len__(self):
+        return self.nRows
+
+    def row(self, i):
+        """
+        :param i: row index
+        :return: tuple (column indices, values) of row i, as memoryviews for CSR storage; for dense storage the
+                 indices are range(nCols)
+        """
+        if self.sparse:
+            a, b = self._indptr[i], self._indptr[i + 1]
+            return (self._indices[a:b], self._data[a:b])
+        return (range(self.nCols), self._data[i * self.nCols:(i + 1) * self.nCols])
+
+    def close(self):
+        """
+        Unmaps and closes the file.  Rows taken with row() must be gone by then (mmap raises BufferError while
+        a memoryview into it is alive).
+        """
+        for view in (self._data, self._indices, self._indptr):
+            if view is not None:
+                view.release()
+        self._data = self._indices = self._indptr = None
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def __repr__(self):
+        return "MappedMatrix({!r}, {}x{}, {})".format(self.path, self.nRows, self.nCols,
+                                                      "CSR, nnz={}".format(self.nnz) if self.sparse else "dense")
+
+def diagDominantOrder(A):
+    """
+    The row order Gauss_Seidel.DiagDominant would produce, found without copying A: for each column i the rows
+    below position i are scanned in order, and every one that beats the current |diagonal| is moved up to i.
+    :param A: list-of-lists (or numpy array or matrixOperations.Matrix) matrix
+    :return: list perm, row i of the reordered matrix is row perm[i] of A
+    """
+    perm = list(range(len(A)))
+    for i in range(len(A)):
+        c = abs(A[perm[i]][i])
+        for k in range(i + 1, len(A)):
+            if abs(A[perm[k]][i]) > c:
+                perm.insert(i, perm.pop(k))
+                c = abs(A[perm[i]][i])
+    return perm
+
+def save(path, Aaug, sparse=False, reorder=False):
+    """
+    Converts a matrix to the memory-mapped file format.  The rows are written one at a time, so a generator of rows
+    is converted without ever holding the whole matrix.
+    :param path: file to write
+    :param Aaug: the (augmented) matrix: list-of-lists, numpy array, matrixOperations.Matrix, sparseMatrix.CSRMatrix
+                 or an iterable of rows
+    :param sparse: store the non-zeros only (CSR storage); a CSRMatrix is always stored that way
+    :param reorder: write the rows in the diagonal dominant order of Gauss_Seidel.DiagDominant (Aaug must then
+                    be a matrix, not just an iterable of rows)
+    :return: the MappedMatrix of the new file
+    """
+    if isinstance(Aaug, sm.CSRMatrix):
+        perm = Aaug.diagDominantOrder() if reorder else range(Aaug.nRows)
+        rows = (Aaug.row(p) for p in perm)
+        sparse, nCols = True, Aaug.nCols
+    else:
+        perm = diagDominantOrder(Aaug) if reorder else None
+        rows = ((range(len(r)), r) for r in (Aaug if perm is None else (Aaug[p] for p in perm)))
+        nCols = None
+    nRows, nnz = 0, 0
+    with open(path, "wb") as f:
+        f.write(bytes(HEADER_SIZE))
+        if sparse:
+            indptr = array('q', [0])
+            with tempfile.TemporaryFile() as values:  # data goes after all of indices, so it waits here
+                for cols, vals in rows:
+                    c = array('q', (c for c, v in zip(cols, vals) if v != 0))
+                    v = array('d', (v for v in vals if v != 0))
+                    c.tofile(f)
+                    v.tofile(values)
+                    nnz += len(v)
+                    indptr.append(nnz)
+                    nRows += 1
+                    if nCols is None:
+                        nCols = len(vals)
+                values.seek(0)
+                shutil.copyfileobj(values, f)
+            indptr.tofile(f)
+        else:
+            for cols, vals in rows:
+                if nCols is None:
+                    nCols = len(vals)
+                elif len(vals) != nCols:
+                    raise ValueError("All rows must have the same length.")
+                array('d', vals).tofile(f)
+                nRows += 1
+            nnz = nRows * (nCols or 0)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, CSR if sparse else DENSE, nRows, nCols or 0, nnz))
+    return MappedMatrix(path)
+
+def _split(M, r):
+    """
+    :return: (columns, values, diagonal, b) of row r of an augmented MappedMatrix, the columns and values without b
+    """
+    n = M.nRows
+    cols, vals = M.row(r)
+    if not M.sparse:
+        return cols, vals, vals[r], vals[n]
+    b = 0.0
+    if len(cols) > 0 and cols[-1] == n:
+        cols, vals, b = cols[:-1], vals[:-1], vals[-1]
+    k = bisect_left(cols, r)
+    d = vals[k] if k < len(cols) and cols[k] == r else 0.0
+    return cols, vals, d, b
+
+def residualNorm(M, x):
+    """
+    One streaming pass over the rows.
+    :param M: augmented MappedMatrix [A|b]
+    :param x: vector (simple list) of length n
+    :return: ||b - A x||_2
+    """
+    sumSq = 0.0
+    for r in range(M.nRows):
+        cols, vals, d, b = _split(M, r)
+        res = b - (sum(map(mul, vals, x)) if not M.sparse else sum(map(mul, vals, map(x.__getitem__, cols))))
+        sumSq += res * res
+    return sqrt(sumSq)
+
+def GaussSeidelSweep(M):
+    """
+    Prepares Gauss-Seidel (or SOR) sweeps on an augmented MappedMatrix [A|b], like sparseMatrix.GaussSeidelSweep
+    but without loading the matrix: every sweep streams the rows from the file in their stored order.
+    :param M: augmented MappedMatrix with n rows and n+1 columns
+    :return: function sweep(x, omega=1.0) that does one sweep on x (a simple list) in place and returns the tuple
+             (largest change in x, sum of the squared changes)
+    :raises ValueError: from the sweep, on a zero diagonal entry
+    """
+    n = M.nRows
+    if M.nCols != n + 1:
+        raise ValueError("Expected an augmented {}x{} matrix, got {}x{}.".format(n, n + 1, *M.shape))
+
+    def sweep(x, omega=1.0):
+        maxErr, sumSq = 0, 0.0
+        for r in range(n):
+            cols, vals, d, b = _split(M, r)
+            if d == 0:
+                raise ValueError("Zero on the diagonal in row {}, save the matrix with reorder=True.".format(r))
+            # A x over the whole row (diagonal included, dense rows stop at x's length before b), so the
+            # Gauss-Seidel step is the row's residual over its diagonal
+            s = sum(map(mul, vals, x)) if not M.sparse else sum(map(mul, vals, map(x.__getitem__, cols)))
+            dx = omega * (b - s) / d
+            x[r] += dx
+            maxErr = max(maxErr, abs(dx))
+            sumSq += dx * dx
+        return maxErr, sumSq
+    return sweep
+#endregion
@@ -9,10 +9,207 @@
 # region imports
 import copy as CP
 from copy import deepcopy as dc  # a quick way to access deepcopy through an alias
+from array import array
+from operator import mul, sub
+import arrayBackend as ab
+import profiling
+try:
+    import numpy as np  # optional, used as a fast path when the inputs are already numpy arrays
+except ImportError:
+    np = None
+# endregion
+
+# region Matrix type
+class Matrix:
+    """
+    A compact dense matrix: the entries are stored row-major in one array('d') (8 bytes per entry instead of a
+    pointer plus a boxed float for list-of-lists), with the shape kept alongside.  Rows are contiguous, and
+    M[i] returns a writable memoryview of row i without copying, so M[i][j] reads and writes like a list of lists
+    and most of the functions in this module accept a Matrix wherever they read a list-of-lists matrix.
+    """
+    __slots__ = ("nRows", "nCols", "data")
+
+    def __init__(self, nRows, nCols, data=None):
+        """
+        :param nRows: number of rows
+        :param nCols: number of columns
+        :param data: optional array('d') (or iterable of numbers) with nRows*nCols entries in row-major order;
+                     zeros if None
+        """
+        self.nRows = nRows
+        self.nCols = nCols
+        if data is None:
+            self.data = array('d', bytes(8 * nRows * nCols))
+        else:
+            self.data = data if isinstance(data, array) and data.typecode == 'd' else array('d', data)
+            if len(self.data) != nRows * nCols:
+                raise ValueError("{} entries do not fill a {}x{} matrix.".format(len(self.data), nRows, nCols))
+
+    @classmethod
+    def fromLists(cls, A):
+        """
+        Builds a Matrix from a list-of-lists matrix.  A simple list becomes a column vector, as in makeColumnVector.
+        :param A: the matrix
+        :return: a Matrix with a copy of the entries
+        """
+        if isinstance(A, Matrix):
+            return A.copy()
+        if len(A) > 0 and not hasattr(A[0], '__len__'):
+            return cls(len(A), 1, array('d', A))
+        nCols = len(A[0]) if len(A) > 0 else 0
+        data = array('d')
+        for row in A:
+            if len(row) != nCols:
+                raise ValueError("All rows must have the same length.")
+            data.extend(row)
+        return cls(len(A), nCols, data)
+
+    @classmethod
+    def identity(cls, n):
+        """
+        :param n: size
+        :return: the nxn identity Matrix
+        """
+        I = cls(n, n)
+        I.data[::n + 1] = array('d', [1.0]) * n
+        return I
+
+    def toLists(self):
+        """
+        :return: the entries as a new list-of-lists matrix
+        """
+        n = self.nCols
+        return [self.data[i * n:(i + 1) * n].tolist() for i in range(self.nRows)]
+
+    @property
+    def shape(self):
+        return (self.nRows, self.nCols)
+
+    def __len__(self):
+        return self.nRows
+
+    @staticmethod
+    def _index(i, size, what):
+        """
+        :return: index i (negative counts from the end) checked against size
+        :raises IndexError: if it is out of range
+        """
+        if i < 0:
+            i += size
+        if not 0 <= i < size:
+            raise IndexError("{} index out of range".format(what))
+        return i
+
+    def __getitem__(self, key):
+        """
+        M[i] is a writable memoryview of row i; M[i, j] is a single entry.
+        """
+        if isinstance(key, tuple):
+            i, j = key
+            return self.data[self._index(i, self.nRows, "row") * self.nCols + self._index(j, self.nCols, "column")]
+        key = self._index(key, self.nRows, "row")
+        return memoryview(self.data)[key * self.nCols:(key + 1) * self.nCols]
+
+    def __setitem__(self, key, value):
+        """
+        M[i, j] = v sets one entry; M[i] = row replaces row i.
+        :raises IndexError: if i or j is out of range
+        :raises ValueError: if the new row does not have nCols entries
+        """
+        if isinstance(key, tuple):
+            i, j = key
+            self.data[self._index(i, self.nRows, "row") * self.nCols + self._index(j, self.nCols, "column")] = value
+        else:
+            key = self._index(key, self.nRows, "row")
+            if len(value) != self.nCols:
+                raise ValueError("A row of this matrix has {} entries, got {}.".format(self.nCols, len(value)))
+            self.data[key * self.nCols:(key + 1) * self.nCols] = array('d', value)
+
+    def __iter__(self):
+        for i in range(self.nRows):
+            yield self[i]
+
+    def __eq__(self, other):
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        return self.shape == other.shape and self.data == other.data
+
+    def __repr__(self):
+        return "Matrix({})".format(self.toLists())
+
+    def row(self, i):
+        """
+        :param i: row index
+        :return: row i as a writable memoryview (no copy)
+        """
+        return self[i]
+
+    def col(self, j):
+        """
+        :param j: column index
+        :return: column j as a new array('d')
+        """
+        return self.data[j::self.nCols]
+
+    def copy(self):
+        return Matrix(self.nRows, self.nCols, array('d', self.data))
+
+    def transpose(self):
+        """
+        :return: the transpose as a new Matrix
+        """
+        T = Matrix(self.nCols, self.nRows)
+        for j in range(self.nCols):
+            T.data[j * self.nRows:(j + 1) * self.nRows] = self.data[j::self.nCols]
+        return T
+
+    def augment(self, B):
+        """
+        :param B: a Matrix (or list-of-lists) with the same number of rows
+        :return: a new Matrix [self|B]
+        """
+        B = B if isinstance(B, Matrix) else Matrix.fromLists(B)
+        if B.nRows != self.nRows:
+            raise ValueError("Cannot augment a {}x{} matrix with a {}x{} matrix.".format(*self.shape, *B.shape))
+        C = array('d')
+        for i in range(self.nRows):
+            C.extend(self.data[i * self.nCols:(i + 1) * self.nCols])
+            C.extend(B.data[i * B.nCols:(i + 1) * B.nCols])
+        return Matrix(self.nRows, self.nCols + B.nCols, C)
+
+    def __matmul__(self, B):
+        """
+        Matrix product.  Row i of the result is built as the sum of A[i][k]*(row k of B), so every inner loop walks
+        contiguous rows.
+        :param B: a Matrix (or list-of-lists)
+        :return: the product as a new Matrix
+        """
+        B = B if isinstance(B, Matrix) else Matrix.fromLists(B)
+        if self.nCols != B.nRows:
+            raise ValueError("Cannot multiply a {}x{} matrix by a {}x{} matrix.".format(*self.shape, *B.shape))
+        m, n, p = self.nRows, self.nCols, B.nCols
+        C = array('d')
+        for i in range(m):
+            Ci = [0.0] * p
+            for k in range(n):
+                a = self.data[i * n + k]
+                if a != 0.0:
+                    Bk = B.data[k * p:(k + 1) * p]
+                    Ci = [c + a * b for c, b in zip(Ci, Bk)]
+            C.extend(Ci)
+        return Matrix(m, p, C)
+
+    def asNumpy(self):
+        """
+        :return: a numpy array sharing memory with this Matrix (needs numpy)
+        """
+        return ab.np.frombuffer(self.data, dtype=float).reshape(self.nRows, self.nCols)
 # endregion
 
 # region functions
 def Transpose(A):
+    if isinstance(A, Matrix):
+        return A.transpose()
     if isinstance(A[0],list):  # handle as a matrix
         n = len(A)  # num rows
         m=len(A[0]) #num cols
@@ -33,6 +230,8 @@ def makeColumnVector(x):
     :param x: row or column vector
     :return: a column vector of form [[]]
     """
+    if isinstance(x, Matrix):  # a Matrix row or column vector keeps its flat storage, just reshaped
+        return Matrix(len(x.data), 1, array('d', x.data))
     if isinstance(x[0],list):  # has form [[]]
         if len(x[0])>1:  # implies we have a proper row vector
             return [[xx] for xx in x[0]]
@@ -108,12 +307,12 @@ def SwapRows(A, r1, r2):  #if I do this, it is known as a partial pivot
     :param r2: index of row 2
     :return: The A matrix after the row swap is done.
     '''
-    rmax=max(r1,r2) #the larger index
-    rmin=min(r1,r2) #the smaller index
-    RMax=A[rmax]  #temporarily store the row vector at rmax in a variable
-    RMin=A.pop(rmin) #pop function removes this row from the matrix and shifts all larger indices by -1
-    A.insert(rmin,RMax) #insert the row RMax at the location rmin.  All higher index rows increase index by +1
-    A[rmax]=RMin  #now, replace row rmax with RMin
+    if isinstance(A, Matrix):  # rows are views into one block, so the values have to be exchanged
+        R1 = array('d', A[r1])
+        A[r1] = A[r2]
+        A[r2] = R1
+        return A
+    A[r1], A[r2] = A[r2], A[r1]  #swap the row references, O(1) rather than the O(n) of pop and insert
     return A  #done
 
 def MultRow(R,s=1):
@@ -127,16 +326,17 @@ def MultRow(R,s=1):
         R[i] *= s  # short way to do R[i] = R[i]*s
     return R
 
-def AddRows(R1, R2, s=1.0):
+def AddRows(R1, R2, s=1.0, inplace=False):
     '''
     Adds a scalar multiple of row vector R2 to row vector R1.
     R2 and R1 must be the same length
     :param R1: a row vector
     :param R2: another row vector
     :param s: a scalar
+    :param inplace: if True, R1 itself is updated and returned instead of a new row
     :return: a new row vector (R1+s*R2)
     '''
-    RNew=CP.deepcopy(R1)
+    RNew=R1 if inplace else CP.deepcopy(R1)
     for i in range(len(R1)):
         RNew[i] += R2[i]*s
     return RNew
@@ -148,16 +348,30 @@ def AddRows(R1, R2, s=1.0):
 # endregion
 
 #the Echelon form of a matrix is when I produce an upper triangular matrix by Gaussian elimination
-def EchelonForm(A):
+def _eliminationFlops(A):
+    """
+    :param A: a mxn matrix
+    :return: the flops of Gaussian elimination on A, about 2*m*n*min(m,n)/3 (2n^3/3 for a square matrix)
+    """
+    m = len(A)
+    n = len(A[0]) if m > 0 else 0
+    return 2 * m * n * min(m, n) // 3
+
+@profiling.profiled(flops=lambda a, r, c: _eliminationFlops(a["A"]))
+def EchelonForm(A, backend=None, inplace=False):
     '''
     I'm expecting a Matrix of m rows by n columns.
     This function performs row operations (Gauss elimination) to produce echelon form matrix.
     :param Matrix: the matrix
+    :param backend: "python", "numpy" or None (see arrayBackend.resolveBackend)
+    :param inplace: if True, A itself is reduced (no copy is made) and returned
     :return: the echelon form of the matrix
     '''
+    if ab.resolveBackend(backend, A) == ab.NUMPY:
+        return _inplaceNumpy(_EchelonFormNumpy, A, inplace)
     m=len(A) #number of rows of A
     n=len(A[0])  #number of columns of A
-    Ech = CP.deepcopy(A) #make a deep copy of A so that I don't actually change A
+    Ech = A if inplace else CP.deepcopy(A) #make a deep copy of A so that I don't actually change A
 
     #order the rows by first non-zero in each column
     for i in range(m):  #iterate through all rows
@@ -172,19 +386,23 @@ def EchelonForm(A):
                 if p==i:  #found row p has a nonzero element in column i
                     Row=Ech[r]
                     s=-Ech[r][p]/Ech[i][i]
-                    Ech[r] = AddRows(Row,Ech[i],s)
+                    AddRows(Row,Ech[i],s,inplace=True)  # Ech is private (or the caller asked for inplace)
     return Ech
 
 #the reduced echelon form of a matrix is when the numbers along the diagonal are all 1's and rows above all other
 #numbers in the column are zero
-def ReducedEchelonForm(A):
+def ReducedEchelonForm(A, backend=None, inplace=False):
     """
     This functions first creates an echelon form matrix from A and then calculates a reduced echelon form of A
     by subsequent row operations.
     :param A: The matrix to work on
+    :param backend: "python", "numpy" or None (see arrayBackend.resolveBackend)
+    :param inplace: if True, A itself is reduced (no copy is made) and returned
     :return: The reduced echelon form of the matrix A
     """
-    REF=EchelonForm(A) #first reduce to echelon form
+    if ab.resolveBackend(backend, A) == ab.NUMPY:
+        return _inplaceNumpy(_ReducedEchelonFormNumpy, A, inplace)
+    REF=EchelonForm(A, inplace=inplace) #first reduce to echelon form
     for i in range(len(A)-1,-1,-1): #iterate from last row to row 0
         R=REF[i]
         j=FirstNonZero_Index(R) #find the first non-zero column in r
@@ -193,8 +411,71 @@ def ReducedEchelonForm(A):
         for ii in range(i-1,-1,-1): #remember, end index in range is non-inclusive
             RR=REF[ii]
             if(RR[j]!=0):
-                RR = AddRows(RR,R,-RR[j])
-                REF[ii]=RR
+                AddRows(RR,R,-RR[j],inplace=True)
+    return REF
+
+def _inplaceNumpy(kernel, A, inplace):
+    """
+    Runs one of the in-place numpy kernels on A.  With inplace=False it works on a copy; with inplace=True it
+    works on A itself if A is a float array, or writes the result back into the caller's rows if A is a list.
+    :param kernel: _EchelonFormNumpy or _ReducedEchelonFormNumpy
+    :param A: the matrix
+    :param inplace: whether A should be overwritten
+    :return: the reduced matrix, in the form the caller passed in
+    """
+    E = ab.asArray(A)
+    if not inplace:
+        return ab.restore(kernel(E.copy()), A)
+    if ab.isArray(A):
+        if E is not A:
+            raise ValueError("inplace=True needs a float64 array, not {}.".format(A.dtype))
+        return kernel(A)
+    kernel(E)
+    for r in range(len(A)):
+        A[r][:] = E[r].tolist()
+    return A
+
+def _FirstNonZeroNumpy(E):
+    """
+    FirstNonZero_Index for every row of the numpy array E at once.
+    :param E: 2-D numpy array
+    :return: array with the column index of the first non-zero in each row, or -1 for a row of zeros
+    """
+    nz = E != 0.0
+    return ab.np.where(nz.any(axis=1), nz.argmax(axis=1), -1)
+
+def _EchelonFormNumpy(Ech):
+    """
+    EchelonForm on a numpy array, done in place with whole-row (vectorized) operations.
+    The same rows are swapped and eliminated as in the list version.
+    :param Ech: 2-D float numpy array, overwritten with its echelon form
+    :return: Ech
+    """
+    m = Ech.shape[0]
+    for i in range(m):
+        first = _FirstNonZeroNumpy(Ech[i:])
+        hits = ab.np.flatnonzero(first == i)
+        if len(hits) > 0 and hits[0] != 0:  # move the first row with a non-zero in column i up to row i
+            r = i + hits[0]
+            Ech[[i, r]] = Ech[[r, i]]
+        if Ech[i, i] != 0.0:
+            below = i + 1 + ab.np.flatnonzero(_FirstNonZeroNumpy(Ech[i + 1:]) == i)
+            if len(below) > 0:
+                Ech[below] += ab.np.outer(-Ech[below, i] / Ech[i, i], Ech[i])
+    return Ech
+
+def _ReducedEchelonFormNumpy(REF):
+    """
+    ReducedEchelonForm on a numpy array, done in place with whole-row (vectorized) operations.
+    :param REF: 2-D float numpy array, overwritten with its reduced echelon form
+    :return: REF
+    """
+    _EchelonFormNumpy(REF)
+    for i in range(REF.shape[0] - 1, -1, -1):
+        j = _FirstNonZeroNumpy(REF[i:i + 1])[0]
+        REF[i] *= 1.0 / REF[i, j]
+        if i > 0:
+            REF[:i] -= ab.np.outer(REF[:i, j], REF[i])
     return REF
 
 #produce and identity matrix of the same size as A
@@ -217,6 +498,8 @@ def AugmentMatrix(A,B):
     :param B: another matrix
     :return:
     '''
+    if isinstance(A, Matrix):
+        return A.augment(B)
     C=CP.deepcopy(A)
     for r in range(len(C)):
         for c in range(len(B[r])):
@@ -224,92 +507,248 @@ def AugmentMatrix(A,B):
     return C
 
 #remove the jth column from matrix A
-def popColumn(A, j):
+def popColumn(A, j, inplace=False):
     '''
     I want to remove column j from matrix A.  I'm using slicing to cut out the column j
-    :param A: The matrix
+    :param A: The matrix (a Matrix gives the column back as a nx1 Matrix)
     :param j: Index of the column I want to remove
+    :param inplace: if True, the column is popped from the rows of A itself instead of a deep copy
     :return:  The column vector removed and the matrix with column j removed
     '''
+    if isinstance(A, Matrix):
+        return _editColumns(A, lambda row, r: row.pop(j), -1, inplace)
     numRows = len(A)
-    AA = dc(A)
+    AA = A if inplace else dc(A)
     c=[[0] for r in range(len(A))] # create a column vector of proper length initially filled with zeros
     for rowIndex in range(numRows):
         c[rowIndex][0]=AA[rowIndex].pop(j)
     return c, AA
 
-def insertColumn(A,b, i):
+def insertColumn(A,b, i, inplace=False):
     '''
     This should insert column vector b into matrix A at column index i.  All columns to the right of i should move right by 1
-    :param A: a matrix
+    :param A: a matrix (list-of-lists or Matrix)
     :param b: a column vector
     :param i: the index where to insert b
+    :param inplace: if True, b is inserted into the rows of A itself instead of a deep copy
     :return: the new matrix with b inserted
     '''
     bb = makeColumnVector(b)  # ensure b has the proper form [[]]
-    ANew = dc(A)
+    if isinstance(A, Matrix):
+        return _editColumns(A, lambda row, r: row.insert(i, bb[r][0]), 1, inplace)
+    ANew = A if inplace else dc(A)
     for r in range(len(ANew)):
-        newRow = dc(ANew[r])
-        newRow.insert(i,b[r][0])
-        ANew[r]=dc(newRow)
+        ANew[r].insert(i,bb[r][0])
     return ANew
 
-def replaceColumn(A,b,i):
+def replaceColumn(A,b,i,inplace=False):
     '''
     This replaces a column of A with column vector b at column index i
-    :param A: a matrix
+    :param A: a matrix (list-of-lists or Matrix)
     :param b: a column vector
     :param i: the column index of column to replace
+    :param inplace: if True, the entries of A itself are overwritten instead of a deep copy
     :return: a new matrix with the new column
     '''
-    ANew = dc(A)
-    ANew = popColumn(ANew,i)
-    ANew = insertColumn(ANew,b,i)
+    bb = makeColumnVector(b)  # ensure b has the proper form [[]]
+    ANew = A if inplace else (A.copy() if isinstance(A, Matrix) else dc(A))
+    for r in range(len(ANew)):
+        ANew[r][i] = bb[r][0]
     return ANew
 
-#uses the matrix A augmented with the identity matrix and Gaussian elimination
-def InvertMatrix(A):
+def _editColumns(A, edit, change, inplace):
+    """
+    popColumn and insertColumn for a Matrix, whose rows are fixed-length views into one array: each row is copied
+    out as a list, edited with the list method, and the rows are packed into new flat storage.
+    :param A: the Matrix
+    :param edit: function edit(row, r) changing the list row (row index r) and returning the popped value, if any
+    :param change: the change in the number of columns (-1 or 1)
+    :param inplace: if True, A takes the new storage, otherwise a new Matrix is made
+    :return: for a pop, the removed column (as a nx1 Matrix) and the matrix; for an insert, the matrix
+    """
+    n = A.nCols
+    data, removed = array('d'), array('d')
+    for r in range(A.nRows):
+        row = A.data[r * n:(r + 1) * n].tolist()
+        value = edit(row, r)
+        if change < 0:
+            removed.append(value)
+        data.extend(row)
+    if inplace:
+        A.data, A.nCols = data, n + change
+        ANew = A
+    else:
+        ANew = Matrix(A.nRows, n + change, data)
+    return (Matrix(A.nRows, 1, removed), ANew) if change < 0 else ANew
+
+#uses LU factorization (or the matrix A augmented with the identity matrix and Gaussian elimination)
+def InvertMatrix(A, backend=None, method="lu"):
     """
-    Finds the inverse of matrix A by forming the augment matrix AI and using Gauss elimination
-    to move the identity matrix to the left yielding IAinv, where Ainv is the inverse matrix
+    Finds the inverse of matrix A.
+    method="lu" (the default) factors A once with partial pivoting and solves A*X=I for all n columns of the
+    identity in one multi-right-hand-side solve.
+    method="gauss" forms the augment matrix AI and uses Gauss elimination to move the identity matrix to the left
+    yielding IAinv, where Ainv is the inverse matrix
+    If you only need A^-1*b, use LinearSolve instead; it is cheaper and more accurate than forming the inverse.
     :param A:  the matrix to invert
+    :param backend: "python", "numpy" or None (see arrayBackend.resolveBackend)
+    :param method: "lu" or "gauss"
     :return:  the inverted matrix
     """
+    if method == "lu":
+        from DoolittleMethod import LUFactorization  # imported here since DoolittleMethod imports this module
+        backend = ab.resolveBackend(backend, A)
+        n = len(A)
+        ID = ab.np.eye(n) if backend == ab.NUMPY else IDMatrix(A)
+        Ainv = LUFactorization(A, backend=backend, pivot=True).solve(ID)
+        if isinstance(A, Matrix):
+            return Matrix.fromLists(Ainv)
+        return ab.restore(Ainv, A) if ab.isArray(Ainv) else Ainv
+    if method != "gauss":
+        raise ValueError("Unknown method '{}', use 'lu' or 'gauss'.".format(method))
+    if ab.resolveBackend(backend, A) == ab.NUMPY:
+        AA = ab.asArray(A)
+        n = AA.shape[0]
+        IAinv = _ReducedEchelonFormNumpy(ab.np.hstack([AA, ab.np.eye(n)]))
+        return ab.restore(IAinv[:, n:].copy(), A)
     ID = IDMatrix(A)
     Ainv = AugmentMatrix(A, ID)
-    IAinv = ReducedEchelonForm(Ainv)
+    IAinv = ReducedEchelonForm(Ainv, inplace=True)  # Ainv is a private copy
     for j in range(len(ID[0])-1, -1, -1):
-        c, IAinv = popColumn(IAinv, j)
+        c, IAinv = popColumn(IAinv, j, inplace=True)
     return IAinv
 
+@profiling.profiled(flops=lambda a, r, c: len(a["T"]) ** 2 * (len(r[0]) if len(r) and hasattr(r[0], '__len__') else 1))
+def TriangularSolve(T, B, lower=False, unit=False, trans=False, backend=None):
+    """
+    Solves op(T)*X = B for a triangular T, where op(T) is T or, with trans=True, T^T (read straight from T, no
+    transpose is built).  This is the kernel behind BackSolve, the LU and the Cholesky substitutions.
+    T is only read a row at a time, as T[i][j] up to and including the diagonal for lower=True (from the diagonal on
+    otherwise), so the packed rows of hw3c.PackedCholesky can be passed in place of a full matrix.
+    All right-hand sides are handled in one sweep over the rows of T: with numpy each step updates a whole row of X,
+    in python each row of T is sliced once and serves every right-hand side, as one dot product per entry
+    (sum(map(mul, ...))), or for trans=True one update of the unknowns still to come per entry, so both only walk
+    along rows of T.  A forward sweep starts each right-hand side at its first non-zero (cheaper for the columns of
+    the identity, e.g. InvertMatrix).
+    :param T: a nxn triangular matrix (only the triangle named by lower is read)
+    :param B: one right-hand side (a simple list or 1-D array) or a matrix whose columns are right-hand sides
+    :param lower: T is lower triangular (otherwise upper triangular)
+    :param unit: T has 1's on the diagonal, which is not read (e.g., L of LU factorization)
+    :param trans: solve T^T*X = B
+    :param backend: "python", "numpy" or None (see arrayBackend.resolveBackend)
+    :return: X in the same form as B (a numpy array, a Matrix, or lists), whichever backend did the work
+    :raises ValueError: if a diagonal entry of T is 0 (T is singular)
+    """
+    n = len(T)
+    if len(B) != n:
+        raise ValueError("T is {0}x{0} but B has {1} rows.".format(n, len(B)))
+    if not unit:
+        for i in range(n):
+            if T[i][i] == 0:
+                raise ValueError("Matrix is singular (0 on the diagonal in row {}).".format(i))
+    forward = lower != trans  # op(T) is lower triangular, so x[0] is found first
+    order = range(n) if forward else range(n - 1, -1, -1)
+    if ab.resolveBackend(backend, T, B) == ab.NUMPY:
+        TT = ab.asArray(T) if isinstance(T, (list, tuple, Matrix)) else T  # arrays and packed rows as they are
+        X = ab.np.array(B, dtype=float)  # a copy, which is then overwritten with the solution
+        for i in order:
+            Ti = TT[i]
+            if trans:  # row i of T is column i of T^T
+                if not unit:
+                    X[i] /= Ti[i]
+                if forward:
+                    X[i + 1:] -= ab.np.multiply.outer(Ti[i + 1:], X[i])
+                else:
+                    X[:i] -= ab.np.multiply.outer(Ti[:i], X[i])
+            else:
+                lo, hi = (0, i) if forward else (i + 1, n)
+                X[i] -= Ti[lo:hi] @ X[lo:hi]
+                if not unit:
+                    X[i] /= Ti[i]
+        if isinstance(B, Matrix):
+            return Matrix.fromLists(X.tolist())
+        return X if ab.isArray(B) else X.tolist()
+
+    vector = n == 0 or not hasattr(B[0], '__len__')
+    X = [[float(v) for v in B]] if vector else [[float(v) for v in c] for c in zip(*B)]  # one list per column
+    if forward and not trans:  # x stays 0 above the first non-zero of b
+        first = [next((i for i in range(n) if x[i] != 0), n) for x in X]
+    for i in order:  # one sweep over the rows of T, each row serving every right-hand side
+        Ti = T[i]
+        d = Ti[i]
+        if trans:  # row i of T is column i of T^T: once x[i] is known, remove it from the equations still to solve
+            seg = Ti[i + 1:] if forward else Ti[:i]
+            for x in X:
+                xi = x[i] = x[i] if unit else x[i] / d
+                if xi != 0:
+                    if forward:
+                        x[i + 1:] = map(sub, x[i + 1:], map(xi.__mul__, seg))
+                    else:
+                        x[:i] = map(sub, x, map(xi.__mul__, seg))
+        elif forward:
+            seg = Ti[:i]
+            for x, f in zip(X, first):
+                if i >= f:
+                    s = x[i] - sum(map(mul, seg if f == 0 else Ti[f:i], x[f:i]))
+                    x[i] = s if unit else s / d
+        else:
+            seg = Ti[i + 1:]
+            for x in X:
+                s = x[i] - sum(map(mul, seg, x[i + 1:]))
+                x[i] = s if unit else s / d
+    X = X[0] if vector else [list(r) for r in zip(*X)]
+    if isinstance(B, Matrix):
+        return Matrix.fromLists(X)
+    return ab.asArray(X) if ab.isArray(B) else X
+
+def LinearSolve(A, b, backend=None):
+    """
+    Solves A*x=b without forming the inverse of A (LU factorization with partial pivoting and two triangular sweeps).
+    :param A: a nxn matrix
+    :param b: a right-hand side vector (simple list) or a matrix whose columns are right-hand sides
+    :param backend: "python", "numpy" or None (see arrayBackend.resolveBackend)
+    :return: x in the same form as b
+    """
+    from DoolittleMethod import LUFactorization  # imported here since DoolittleMethod imports this module
+    return LUFactorization(A, backend=backend, pivot=True).solve(b)
+
 #use this to multiply matrices of correct dimensions
+MULT_BLOCK = 64  # number of columns of B handled together by the pure-Python kernel
+
 def MatrixMultiply(A,B):
     '''
     For multiplication of matrices, I need mXn * nXp to give a mXp matrix.
     So, must first check number of cols of A equals number of rows of B.
     Then, do matrix multiplication.
+    If either matrix is a Matrix, Matrix.__matmul__ does the multiplication and a Matrix is returned.
+    If either matrix is a numpy array, numpy does the multiplication and a numpy array is returned.
+    Otherwise B is transposed once so each entry of C is a row of A times a row of B^T, and the columns of C
+    are done in blocks of MULT_BLOCK so the same rows of B^T are reused for every row of A while they are hot.
     :param A: A mxn matrix
     :param B: A nxp matrix
     :return: A matrix of shape mxp
     '''
+    if isinstance(A, Matrix) or isinstance(B, Matrix):
+        return (A if isinstance(A, Matrix) else Matrix.fromLists(A)) @ B
+    if np is not None and (isinstance(A, np.ndarray) or isinstance(B, np.ndarray)):
+        A = np.asarray(A, dtype=float)
+        B = np.asarray(B, dtype=float)
+        if A.shape[-1] != B.shape[0]:
+            raise ValueError("Cannot multiply a {} matrix by a {} matrix.".format(A.shape, B.shape))
+        return A @ B
     m=len(A)
     n=len(A[0])
     nn=len(B)
     p=len(B[0])
-    SizeOk = n == nn
-    if not SizeOk:
-        return A
-    C=[[0 for j in range(p)] for i in range(m)]
-    for i in range(p):
-        C[i] = [0]*p
-    #below is a shorter notation for building a list called a list comrehension
-    #C=[[0 for j in range(p)] for m in range(m)] #build an initial array full of zeros of size ARowsXBCols
-
-    for i in range(len(C)):  # i is my row counting variable in C
-        for j in range(len(C[i])):  # j is my column counting variable in C
-            for k in range(len(A[i])): #multiply row i from A with column j from B
-                C[i][j] +=A[i][k]*B[k][j]
-            C[i][j] = round(C[i][j], 3)
+    if n != nn:
+        raise ValueError("Cannot multiply a {}x{} matrix by a {}x{} matrix.".format(m, n, nn, p))
+    BT = [list(col) for col in zip(*B)]  # columns of B as rows
+    C=[[0.0]*p for i in range(m)]
+    for j0 in range(0, p, MULT_BLOCK):
+        block = BT[j0:j0 + MULT_BLOCK]
+        for i in range(m):  # i is my row counting variable in C
+            Ai = A[i]
+            C[i][j0:j0 + len(block)] = [sum(map(mul, Ai, Bj)) for Bj in block]
     return C
 
 def main():
@@ -343,7 +782,7 @@ def main():
 
     print("A^-1*A")
     for r in B:
-        print(r)
+        print([round(x, 3) for x in r])
 # endregion
 
 # this calls the main function if it is run as '__main__'
@@ -1,6 +1,19 @@
 #region imports
 import matrixOperations as mo  # this is the module from lecture 2 that has useful matrix manipulation functions
-from math import sqrt, pi, exp, cos
+import arrayBackend as ab
+import sparseMatrix as sm
+import mappedMatrix as mm
+import solverStats as ss
+import profiling
+from math import sqrt, pi, exp, cos, floor, ceil, isnan, nan
+from array import array
+import os
+import struct
+from time import perf_counter
+try:
+    import numpy as np  # optional, only used to vectorize the batch routines
+except ImportError:
+    np = None
 #endregion
 
 #region function definitions
@@ -15,7 +28,8 @@ Characteristics of the GNPDF (or GPDF) are:
     variable x lies between the limits.
 4.  68% of the area is between +/-1*StDev of the mean, 95.5% between +/-2*StDev of the mean.
 """
-def Probability(PDF, args, c, GT=True):
+@profiling.profiled()
+def Probability(PDF, args, c, GT=True, engine="simpson"):
     """
     This is the function to calculate the probability that x is >c or <c depending
     on the GT boolean.
@@ -24,17 +38,250 @@ def Probability(PDF, args, c, GT=True):
     Step 3:  package new tuple args1=(mu, stDev, lhl, rhl) to be passed to Simpson
     Step 4:  call Simpson with GNPDF and args1
     Step 5:  return probability
+    With engine="table" (GPDF only) the answer is looked up in the shared NormalCDFTable instead, which
+    skips Steps 2-4 unless z=(c-mu)/stDev falls outside of the table.
     :param PDF: the probability density function to be integrated
     :param args: a tuple with (mean, standard deviation)
     :param c: value for which we ask the probability question
     :param GT: boolean deciding if we want probability x>c (True) or x<c (False)
+    :param engine: "simpson" to integrate directly or "table" to interpolate in the standard normal table
     :return: probability value
     """
     mu, sig = args
+    if engine == "table":
+        if not _isGPDF(PDF):
+            raise ValueError("The table engine only applies to GPDF.")
+        p = getNormalTable().cdf((c - mu) / sig)
+        if p is not None:
+            return 1-p if GT is True else p
+    elif engine != "simpson":
+        raise ValueError("Unknown engine '{}'.".format(engine))
     lhl = mu -5*sig
     rhl = c
     p = Simpson(PDF, (mu, sig, lhl,rhl))
     return 1-p if GT is True else p
+
+BATCH_STEP = 0.02  # grid spacing for ProbabilityBatch in units of stDev
+BATCH_TOL = 1e-5  # ProbabilityBatch agrees with Probability (N=100) to within this for c >= mu-5*stDev
+BATCH_CLAMP = 40.0  # ProbabilityBatch takes P(x<c) as 0 or 1 beyond mu-/+BATCH_CLAMP*stDev
+
+def ProbabilityBatch(PDF, args, cs, GT=True):
+    """
+    Batch version of Probability.  Answers P(x>c) or P(x<c) for a whole array of c values in one pass.
+    Rather than integrating from mu-5*stDev to every c separately, the PDF is evaluated once on a shared grid
+    and integrated cumulatively with Simpson's rule.  Each c then only needs its cumulative value at the grid
+    node below it plus a single 3-point Simpson panel for the short piece between that node and c.
+    Step 1:  group the queries by (mu, stDev) so each group can share a grid
+    Step 2:  build the grid from mu-5*stDev to the largest c in the group (spacing BATCH_STEP*stDev)
+    Step 3:  evaluate the PDF on the grid and accumulate the Simpson panels
+    Step 4:  for each c, add the remainder panel and apply the GT flag
+    The grid is much finer than the N=100 used by Probability, so the results match the scalar ones to within
+    BATCH_TOL (the difference is dominated by the truncation error of the scalar call).
+    Values of c below mu-5*stDev fall back to Probability so the scalar semantics are kept exactly.  Beyond
+    BATCH_CLAMP standard deviations from mu, P(x<c) is 0 or 1 to double precision, so those c (infinities
+    included) are answered directly instead of stretching the grid; a NaN c gives NaN.
+    :param PDF: the probability density function to be integrated, called as PDF((x, mean, stDev))
+    :param args: a tuple with (mean, standard deviation); either may be a scalar or a sequence the same length as cs
+    :param cs: sequence (list or numpy array) of c values
+    :param GT: boolean deciding if we want probability x>c (True) or x<c (False)
+    :return: the probabilities, a numpy array if cs is a numpy array, otherwise a list
+    """
+    mu, sig = args
+    n = len(cs)
+    mus = list(mu) if hasattr(mu, '__len__') else [mu] * n
+    sigs = list(sig) if hasattr(sig, '__len__') else [sig] * n
+    if len(mus) != n or len(sigs) != n:
+        raise ValueError("mean and standard deviation arrays must be the same length as cs.")
+
+    # Step 1: group the query indices by (mu, sig)
+    groups = {}
+    for i in range(n):
+        groups.setdefault((float(mus[i]), float(sigs[i])), []).append(i)
+
+    p = [0.0] * n
+    for (m, s), idx in groups.items():
+        lhl = m - 5 * s
+        inside = []
+        for i in idx:
+            cc = float(cs[i])
+            if isnan(cc):
+                p[i] = nan
+            elif cc > m + BATCH_CLAMP * s:
+                p[i] = 1.0
+            elif cc < m - BATCH_CLAMP * s:
+                p[i] = 0.0
+            elif cc < lhl:  # outside of the grid, so use the scalar routine
+                p[i] = Probability(PDF, (m, s), cc, GT=False)
+            else:
+                inside.append(i)
+        if len(inside) == 0:
+            continue
+        # Step 2: shared grid with an even number of panels
+        h = BATCH_STEP * s
+        top = max(float(cs[i]) for i in inside)
+        N = 2 * max(1, int(ceil((top - lhl) / (2 * h))))
+        # Step 3: cumulative Simpson integral at the even grid nodes
+        c = [float(cs[i]) for i in inside]
+        if np is not None:
+            x = lhl + h * np.arange(N + 1)
+            f = _evalPDF(PDF, x, m, s)
+            F = np.concatenate(([0.0], np.cumsum(h / 3 * (f[0:-2:2] + 4 * f[1:-1:2] + f[2::2]))))
+            # Step 4: remainder panel from the node below c up to c
+            c = np.array(c)
+            k = np.minimum(np.floor((c - lhl) / (2 * h)).astype(int), N // 2)
+            x0 = lhl + 2 * h * k
+            d = c - x0
+            tail = d / 6 * (f[2 * k] + 4 * _evalPDF(PDF, x0 + d / 2, m, s) + _evalPDF(PDF, c, m, s))
+            pp = (F[k] + tail).tolist()
+        else:
+            x = [lhl + j * h for j in range(N + 1)]
+            f = [PDF((xx, m, s)) for xx in x]
+            F = [0.0]
+            for j in range(0, N, 2):
+                F.append(F[-1] + h / 3 * (f[j] + 4 * f[j + 1] + f[j + 2]))
+            pp = []
+            for cc in c:
+                k = min(int(floor((cc - lhl) / (2 * h))), N // 2)
+                x0 = lhl + 2 * h * k
+                d = cc - x0
+                pp.append(F[k] + d / 6 * (f[2 * k] + 4 * PDF((x0 + d / 2, m, s)) + PDF((cc, m, s))))
+        for i, pi_ in zip(inside, pp):
+            p[i] = pi_
+
+    p = [1 - pp if GT is True else pp for pp in p]
+    if np is not None and isinstance(cs, np.ndarray):
+        return np.array(p)
+    return p
+
+class NormalCDFTable:
+    """
+    A dense table of the standard normal CDF, Phi(z) = integral of GPDF((x,0,1)) from -5 to z, to match the
+    lower limit used by Probability.  Any normal query reduces to the table through z=(c-mu)/stDev.
+    The table is built once with Simpson/GPDF (one 2-panel Simpson step per table interval, accumulated) and
+    queried by cubic Hermite interpolation, using GPDF at the nodes as the exact slope.  The interpolation
+    error is at most h^4/384 times the largest third derivative of GPDF (about 1.38), which for the default
+    h=0.01 is below 4e-11 and is stored in errorBound.  cdf returns None outside of [-5, zmax] so the caller
+    can integrate directly instead.
+    """
+    __slots__ = ("h", "zmin", "zmax", "F", "f", "errorBound")
+    MAGIC = b"NCDF"
+
+    def __init__(self, h=0.01, zmax=8.0, F=None):
+        """
+        :param h: spacing of the table in z
+        :param zmax: upper end of the table (the lower end is always -5, the lower limit used by Probability)
+        :param F: precomputed CDF values (used by load); if None, the table is built now
+        """
+        self.h = h
+        self.zmin = -5.0
+        self.zmax = zmax
+        n = int(round((zmax - self.zmin) / h))
+        self.f = array('d', (GPDF((self.zmin + i * h, 0, 1)) for i in range(n + 1)))
+        if F is None:
+            F = array('d', [0.0])
+            for i in range(n):
+                z = self.zmin + i * h
+                F.append(F[-1] + Simpson(GPDF, (0, 1, z, z + h), N=2))
+        self.F = F
+        self.errorBound = h ** 4 / 384 * 1.38
+
+    def cdf(self, z):
+        """
+        Interpolates the table at z.
+        :param z: standardized value (c-mu)/stDev
+        :return: P(Z<z) integrated from -5, or None if z is outside of the table
+        """
+        if z < self.zmin or z > self.zmax:
+            return None
+        return HermiteLookup(self.F, self.f, self.h, (z - self.zmin) / self.h)
+
+    def save(self, path):
+        """
+        Writes the table to a binary file: the 4 byte tag NCDF, h and zmax as little-endian doubles,
+        then the CDF values.
+        :param path: file name
+        """
+        with open(path, "wb") as fh:
+            fh.write(self.MAGIC + struct.pack("<dd", self.h, self.zmax))
+            self.F.tofile(fh)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a table written by save.
+        :param path: file name
+        :return: the NormalCDFTable
+        """
+        with open(path, "rb") as fh:
+            if fh.read(4) != cls.MAGIC:
+                raise ValueError("{} is not a normal CDF table.".format(path))
+            h, zmax = struct.unpack("<dd", fh.read(16))
+            F = array('d')
+            F.frombytes(fh.read())
+        if len(F) != int(round((zmax + 5.0) / h)) + 1:
+            raise ValueError("{} is truncated.".format(path))
+        return cls(h, zmax, F)
+
+def HermiteLookup(F, f, h, t):
+    """
+    Cubic Hermite interpolation in a table of values F with slopes f on an even grid of spacing h.
+    Used by the CDF tables, where F is the CDF and f the PDF at the grid nodes.
+    :param F: table of function values
+    :param f: table of derivatives at the same nodes
+    :param h: grid spacing
+    :param t: position in units of h from the first node (0 <= t <= len(F)-1)
+    :return: the interpolated value
+    """
+    i = min(int(t), len(F) - 2)
+    t -= i
+    t2 = t * t
+    t3 = t2 * t
+    return ((2 * t3 - 3 * t2 + 1) * F[i] + (t3 - 2 * t2 + t) * h * f[i]
+            + (-2 * t3 + 3 * t2) * F[i + 1] + (t3 - t2) * h * f[i + 1])
+
+_normalTable = None
+
+def getNormalTable(path=None):
+    """
+    Returns the shared NormalCDFTable, building it on first use.  If path is given, the table is loaded
+    from that file when it exists and saved there after it is built otherwise.
+    The default path can also be set with the environment variable NORMAL_CDF_TABLE.
+    :param path: optional cache file
+    :return: the NormalCDFTable
+    """
+    global _normalTable
+    if _normalTable is None:
+        path = path or os.environ.get("NORMAL_CDF_TABLE")
+        if path and os.path.exists(path):
+            _normalTable = NormalCDFTable.load(path)
+        else:
+            _normalTable = NormalCDFTable()
+            if path:
+                _normalTable.save(path)
+    return _normalTable
+
+def _isGPDF(PDF):
+    """
+    :param PDF: a probability density function
+    :return: True if PDF is GPDF, also when only one of them is wrapped by profiling (the caller may hold the
+             function from before profiling was switched on, or after it was switched off)
+    """
+    return getattr(PDF, "__wrapped__", PDF) is getattr(GPDF, "__wrapped__", GPDF)
+
+def _evalPDF(PDF, x, mu, sig):
+    """
+    Evaluates PDF at every value in the numpy array x.  GPDF is evaluated in one vectorized expression,
+    any other PDF is called once per point.
+    :param PDF: the probability density function, called as PDF((x, mean, stDev))
+    :param x: numpy array of x values
+    :param mu: mean
+    :param sig: standard deviation
+    :return: numpy array of PDF values
+    """
+    if _isGPDF(PDF):
+        return (1 / (sig * sqrt(2 * pi))) * np.exp(-0.5 * ((x - mu) / sig) ** 2)
+    return np.array([PDF((xx, mu, sig)) for xx in x.tolist()])
+@profiling.profiled(flops=8, evals=1)
 def GPDF(args):
     """
     Here is where I will define the Gaussian probability density function.
@@ -53,7 +300,9 @@ def GPDF(args):
     fx = (1 / (sig * sqrt(2 * pi))) * exp(-0.5 * ((x - mu) / sig) ** 2)
     # step 3: return value
     return fx
-def Simpson(fn, args, N=100):
+@profiling.profiled(flops=lambda a, r, c: 0 if a["adaptive"] else 3 * (a["N"] + 1),
+                    evals=lambda a, r, c: 0 if a["adaptive"] else a["N"] + 1)
+def Simpson(fn, args, N=100, adaptive=False, atol=1e-10, rtol=1e-8):
     """
     This executes the Simpson 1/3 rule for numerical integration (see page 832, Table 19.4).
     As I recall:
@@ -63,9 +312,16 @@ def Simpson(fn, args, N=100):
     4. return the area beneath the function fx
     :param fx: some function of x to integrate
     :param args: a tuple containing (mean, stDev, lhl, rhl)
+    :param N: number of panels for the fixed rule (ignored if adaptive)
+    :param adaptive: if True, use AdaptiveSimpson with atol/rtol instead of N fixed panels
+    :param atol: absolute error tolerance for the adaptive rule
+    :param rtol: relative error tolerance for the adaptive rule
     :return: the area beneath the function between lhl and rhl
     """
-        if len(args) == 3:  # t-Distribution Case
+    if adaptive:
+        return AdaptiveSimpson(fn, args, atol=atol, rtol=rtol)[0]
+
+    if len(args) == 3:  # t-Distribution Case
         m, lower_limit, upper_limit = args
     elif len(args) == 4:  # Gaussian Case (Original)
         mu, sigma, lower_limit, upper_limit = args
@@ -92,6 +348,117 @@ def Simpson(fn, args, N=100):
 
     return (h / 3) * integral
 
+ADAPTIVE_PANELS = 16  # AdaptiveSimpson starts from at least this many panels
+
+@profiling.profiled(flops=lambda a, r, c: 4 * r[1], evals=lambda a, r, c: r[1])
+def AdaptiveSimpson(fn, args, atol=1e-10, rtol=1e-8, maxDepth=50, panels=None):
+    """
+    Adaptive Simpson 1/3 rule.  Each interval is compared against the sum of its two halves; if the
+    difference is too large, the halves are subdivided again.  This puts evaluations where the integrand
+    curves (e.g., near the peak of a narrow GPDF) and skips them where it is flat (e.g., the tails).
+    Step 1:  cut [lhl, rhl] into the starting panels and estimate each with a single Simpson panel
+    Step 2:  split an interval in half and estimate each half
+    Step 3:  accept if |left+right-whole| <= 15*eps (the Richardson error estimate), else push both halves
+             with eps/2 each
+    The target error is max(atol, rtol*|first estimate|), shared among the starting panels by width.  The
+    adaptive test only sees the points it samples, so a feature narrower than the starting panels can be missed
+    entirely.  For the Gaussian args the starting panels are therefore no wider than stDev (and there are at
+    least ADAPTIVE_PANELS of them); pass panels for an integrand with a different scale.
+    :param fn: some function of x to integrate, called with the same tuples as Simpson
+    :param args: a tuple containing (mean, stDev, lhl, rhl) or (df, lhl, rhl), same as Simpson
+    :param atol: absolute error tolerance
+    :param rtol: relative error tolerance
+    :param maxDepth: an interval is accepted regardless of its error once it has been halved this many times
+    :param panels: number of starting panels (None to choose from stDev as above)
+    :return: tuple with: (the area, number of function evaluations, estimated absolute error)
+    """
+    if len(args) == 3:  # t-Distribution Case
+        m, a, b = args
+        f = lambda x: fn((x, m))
+        scale = None
+    elif len(args) == 4:  # Gaussian Case (Original)
+        mu, sigma, a, b = args
+        f = lambda x: fn((x, mu, sigma))
+        scale = abs(sigma)
+    else:
+        raise ValueError("Invalid number of arguments passed to AdaptiveSimpson function.")
+    if panels is None:
+        panels = ADAPTIVE_PANELS
+        if scale:
+            panels = max(panels, int(ceil(abs(b - a) / scale)))
+    elif panels < 1:
+        raise ValueError("panels must be at least 1, got {}.".format(panels))
+
+    x = [a + (b - a) * i / panels for i in range(panels + 1)]
+    fx = [f(xx) for xx in x]
+    fm = [f((x[i] + x[i + 1]) / 2) for i in range(panels)]
+    nEval = 2 * panels + 1
+    wholes = [(x[i + 1] - x[i]) / 6 * (fx[i] + 4 * fm[i] + fx[i + 1]) for i in range(panels)]
+    eps = max(atol, rtol * abs(sum(wholes))) / panels
+    area = 0.0
+    errEst = 0.0
+    stack = [(x[i], x[i + 1], fx[i], fm[i], fx[i + 1], wholes[i], eps, 0) for i in range(panels - 1, -1, -1)]
+    while stack:
+        a, b, fa, fm, fb, whole, eps, depth = stack.pop()
+        mid = (a + b) / 2  # not m, which f reads as df in the t-Distribution case
+        flm, frm = f((a + mid) / 2), f((mid + b) / 2)
+        nEval += 2
+        left = (mid - a) / 6 * (fa + 4 * flm + fm)
+        right = (b - mid) / 6 * (fm + 4 * frm + fb)
+        delta = left + right - whole
+        if abs(delta) <= 15 * eps or depth >= maxDepth:
+            area += left + right + delta / 15  # Richardson extrapolation
+            errEst += abs(delta) / 15
+        else:
+            stack.append((mid, b, fm, frm, fb, right, eps / 2, depth + 1))
+            stack.append((a, mid, fa, flm, fm, left, eps / 2, depth + 1))
+    return (area, nEval, errEst)
+
+class CumulativeIntegral:
+    """
+    Running integral of fn from a fixed lower limit, built on Simpson.  It remembers the last upper limit and the
+    integral up to it, so asking for a new upper limit c only integrates the segment between the old and the new
+    limit (a negative segment if c moved left).  Root finding and monotone sweeps over c then cost O(step) per
+    query instead of O(whole range).  The panel width h is kept the same for every segment, so the accuracy
+    matches a single Simpson call with the same h; rounding and truncation errors of the segments add up, so
+    call reset() to start fresh after a very long walk.
+    """
+    __slots__ = ("fn", "params", "lower", "h", "x", "area", "nEval")
+
+    def __init__(self, fn, params, lower, h=0.05):
+        """
+        :param fn: some function of x to integrate, called with the same tuples as Simpson
+        :param params: the args for Simpson without the limits, i.e. (mean, stDev) or (df,)
+        :param lower: the fixed lower limit of integration
+        :param h: target panel width for each segment
+        """
+        self.fn = fn
+        self.params = tuple(params)
+        self.lower = lower
+        self.h = h
+        self.nEval = 0
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets the remembered segment so the next call starts from the lower limit.
+        """
+        self.x = self.lower
+        self.area = 0.0
+
+    def __call__(self, c):
+        """
+        :param c: upper limit of integration
+        :return: integral of fn from lower to c
+        """
+        if c != self.x:
+            N = max(2, int(ceil(abs(c - self.x) / self.h)))
+            N += N % 2
+            self.area += Simpson(self.fn, self.params + (self.x, c), N=N)
+            self.nEval += N + 1
+            self.x = c
+        return self.area
+
 #endregion
 
 #region other numerical methods
@@ -119,30 +486,148 @@ def Secant(fcn, x0, x1, maxiter=10, xtol=1e-5):
         x1=x_New
         iter+=1
     return (x1,iter)
-def GaussSeidel(Aaug, x, Niter = 15):
+def SafeNewton(fcn, dfcn, x0, lo, hi, maxiter=50, xtol=1e-10, ftol=1e-12, rising=None):
+    """
+    Newton's method safeguarded by a bracket.  The root must be bracketed by [lo, hi] (fcn changes sign).
+    Each iteration takes the Newton step x-fcn(x)/dfcn(x); if that step leaves the current bracket (or dfcn is
+    zero), it bisects instead.  The bracket is tightened after every evaluation, so the method cannot diverge,
+    and it converges quadratically once near the root.
+    :param fcn: the function for which we want to find the root
+    :param dfcn: the derivative of fcn
+    :param x0: initial guess, should lie within [lo, hi]
+    :param lo: left end of the bracket
+    :param hi: right end of the bracket
+    :param maxiter: exit if the number of iterations equals this number
+    :param xtol: exit if the |xnewest - xprevious| < xtol
+    :param ftol: exit if |fcn(x)| < ftol
+    :param rising: True if fcn increases through the root; if None, fcn(lo) is evaluated to find out
+    :return: tuple with: (the final estimate of the root, number of iterations, True if converged)
+    """
+    if rising is None:
+        rising = fcn(lo) < 0  # which side of the root gives negative values
+    x = min(max(x0, lo), hi)
+    a, b = lo, hi  # an xtol exit pinned against the original bracket means the root was not bracketed
+    for iter in range(1, maxiter + 1):
+        fx = fcn(x)
+        if abs(fx) < ftol:
+            return (x, iter, True)
+        if (fx < 0) == rising:
+            lo = x
+        else:
+            hi = x
+        d = dfcn(x)
+        xNew = x - fx / d if d != 0 else lo - 1
+        if not (lo < xNew < hi):
+            xNew = (lo + hi) / 2  # Newton left the bracket, so bisect
+        if abs(xNew - x) < xtol:
+            return (xNew, iter, a + xtol < xNew < b - xtol)
+        x = xNew
+    return (x, maxiter, False)
+GS_TOL = 1e-5  # largest change in x for GaussSeidel without epsilon to count as converged
+
+@profiling.profiled(flops=lambda a, r, c: 2 * sm.nnzOf(a["Aaug"]) * c.get("evals", 0))
+def GaussSeidel(Aaug, x, Niter = 15, backend=None, epsilon=None, stats=None, callback=None):
     """
     This should implement the Gauss-Seidel method (see page 860, Tabl 20.2) for solving a system of equations.
-    :param Aaug: The augmented matrix from Ax=b -> [A|b]
+    :param Aaug: The augmented matrix from Ax=b -> [A|b] (list-of-lists, numpy array, a sparseMatrix.CSRMatrix
+                 or a mappedMatrix.MappedMatrix, which is swept in its stored row order)
     :param x:  An initial guess for the x vector. if A is nxn, x is nx1
     :param Niter:  Number of iterations to run the GS method
+    :param backend: "python", "numpy" or None (see arrayBackend.resolveBackend)
+    :param epsilon: stop early once the largest change in x during a sweep is <= epsilon.  None runs all Niter
+                    iterations; stats then call the solve converged if the last sweep changed x by <= GS_TOL.
+    :param stats: a solverStats.IterationStats to record the sweeps, residuals and convergence status into
+    :param callback: function callback(stats) called after every sweep (records into stats, or a new IterationStats)
     :return: the solution vector x
     """
+    stats = ss.getStats(stats, callback)
+    if isinstance(Aaug, sm.CSRMatrix):  # sweeps only touch the stored non-zeros
+        if stats is None and not profiling.enabled:
+            return sm.GaussSeidelCSR(Aaug, x, Niter=Niter, epsilon=0 if epsilon is None else epsilon,
+                                     reorder=Aaug.makeDiagDomOrder())
+        csrSweep = sm.GaussSeidelSweep(Aaug, reorder=Aaug.makeDiagDomOrder())  # the order of the list path
+        _iterate(lambda: csrSweep(x)[0], Niter, epsilon, stats, lambda: sm.residualNorm(Aaug, x))
+        return x
+    if isinstance(Aaug, mm.MappedMatrix):  # rows stream from the file, only x is held in memory
+        xx = x.tolist() if ab.isArray(x) else x
+        mappedSweep = mm.GaussSeidelSweep(Aaug)
+        _iterate(lambda: mappedSweep(xx)[0], Niter, epsilon, stats, lambda: mm.residualNorm(Aaug, xx))
+        x[:] = xx
+        return x
+    if ab.resolveBackend(backend, Aaug, x) == ab.NUMPY:
+        AA = ab.asArray(mo.MakeDiagDom(Aaug.tolist() if ab.isArray(Aaug) else Aaug))
+        n = AA.shape[1] - 1
+        A, b = AA[:, :n], AA[:, n]
+        xx = ab.asVector(x).copy()
+
+        def sweep():
+            maxErr = 0
+            for i in range(AA.shape[0]):  # row i as one dot product with the most recent x
+                dx = (b[i] - A[i] @ xx) / A[i, i]
+                xx[i] += dx
+                maxErr = max(maxErr, abs(dx))
+            return maxErr
+
+        def residual():  # ||b - A x||
+            res = b - A @ xx
+            return sqrt(float(res @ res))
+        _iterate(sweep, Niter, epsilon, stats, residual)
+        x[:] = xx if ab.isArray(x) else xx.tolist()  # update x in place, as the list version does
+        return x
     # Step 1:  make the augmented matrix diagonal dominant
     # Step 2:  in a loop:
     # Step 2a:  solve first row for x[0] using old values for x[1], etc
     # Step 2b:  solve remaining rows for x[i] using new values above and old values below
-    # Step 3:  return x after Niter
+    # Step 3:  return x after Niter (or once the largest change in x is <= epsilon)
     Aaug = mo.MakeDiagDom(Aaug)
     n_Rows = len(Aaug)
     n_Cols = len(Aaug[0])-1
 
-    for j in range(Niter):
+    def sweep():
+        maxErr = 0
         for i in range(n_Rows):
+            xOld = x[i]
             rhs = Aaug[i][n_Cols]
             for k in range(n_Cols):
                 rhs -= Aaug[i][k] * x[k] if not k==i else 0
             x[i] = rhs / Aaug[i][i]  # we can run into a problem if the diagonal has a zero
+            maxErr = max(maxErr, abs(x[i] - xOld))
+        return maxErr
+
+    def residual():  # ||b - A x||
+        return sqrt(sum((Aaug[i][n_Cols] - sum(Aaug[i][k] * x[k] for k in range(n_Cols))) ** 2 for i in range(n_Rows)))
+    _iterate(sweep, Niter, epsilon, stats, residual)
     return x
+
+def _iterate(sweep, Niter, epsilon, stats, residual):
+    """
+    The iteration loop of GaussSeidel.
+    :param sweep: function doing one sweep on x in place and returning the largest change in x
+    :param Niter: number of iterations
+    :param epsilon: early exit tolerance on the largest change in x, or None
+    :param stats: IterationStats to record into, or None
+    :param residual: function returning ||b - A x|| for the current x (only called when stats want residuals)
+    :return: True if the last sweep changed x by <= epsilon (GS_TOL if epsilon is None)
+    """
+    if stats is not None:
+        stats.begin("numericalMethods.GaussSeidel", epsilon, Niter)
+    maxErr = None
+    j = -1
+    for j in range(Niter):
+        if stats is not None:
+            t0 = perf_counter()
+            maxErr = sweep()
+            stats.record(maxErr, perf_counter() - t0, residual() if stats.residuals else None)
+        else:
+            maxErr = sweep()
+        if epsilon is not None and maxErr <= epsilon:
+            break
+    converged = maxErr is not None and maxErr <= (GS_TOL if epsilon is None else epsilon)
+    if profiling.enabled:
+        profiling.note(evals=j + 1)  # sweeps
+    if stats is not None:
+        stats.finish(converged)
+    return converged
 #endregion
 
 def main():
@@ -160,6 +645,11 @@ def main():
     print("p={:0.5f}".format(p))  # Does this match the expected value?
     #endregion
 
+    #region testing AdaptiveSimpson
+    p, nEval, err = AdaptiveSimpson(GPDF, (0,1,-5,0))  # should return 0.5
+    print("p={:0.5f} with {} evaluations, error estimate {:0.1e}".format(p, nEval, err))
+    #endregion
+
     #region testing Probability
     p1 = Probability(GPDF, (0,1),0,True)
     print("p1={:0.5f}".format(p1))  # Does this match the expected value?
@@ -170,6 +660,16 @@ def main():
     print("p3={:0.5f}".format(p3))  # Does this match the expected value?
     p4 = 1-2*Probability(GPDF,(0,1),3)
     print("p4={:0.5f}".format(p4))  # Does this match the expected value?
+
+    #region testing the table engine
+    pt = Probability(GPDF, (0,1), 1, engine="table")
+    print("pt={:0.5f}".format(pt))  # should match (1-p2)/2
+    #endregion
+
+    #region testing ProbabilityBatch
+    pb = ProbabilityBatch(GPDF, (0,1), [0,1,2,3])
+    print("pb=", ["{:0.5f}".format(p) for p in pb])  # should match p1 and (1-p2)/2, (1-p3)/2, (1-p4)/2
+    #endregion
 #endregion
 
 #region function calls
@@ -0,0 +1,284 @@
+#region explanation
+# Opt-in profiling of the hot kernels (Simpson, GPDF, t_pdf, LUFactorization, EchelonForm, Gauss-Seidel, ...).
+# For every kernel it records, per thread:
+#   calls       number of calls
+#   wall, cpu   inclusive wall clock and thread CPU time in seconds
+#   evals       integrand evaluations (integrators) or sweeps (iterative solvers)
+#   flops       estimated floating point operations
+#   netBytes    net change in traced memory over the calls (bytes still held afterwards minus bytes freed; not the
+#               amount allocated, a kernel that allocates and frees a lot nets about 0), from tracemalloc
+#   peakBytes   the most traced memory any one call used above what was in use when it started, from tracemalloc
+# netBytes and peakBytes are only recorded with memory=True.  Measuring the peak resets tracemalloc's own peak, so
+# don't rely on tracemalloc.get_traced_memory()[1] inside a memory profile.
+# Turn it on for a block of code with
+#   with profiling.profile() as p:
+#       ...
+#   print(p.toJSON())
+# or for the whole program with the environment variable HW3_PROFILE: "1" prints a summary to stderr at exit,
+# anything else is taken as a file name for a JSON snapshot (see snapshot()).
+# A kernel is marked with the @profiled decorator.  While nothing is being profiled the decorator leaves the function
+# untouched, so there is no overhead at all; profile() swaps the wrappers into the package's modules (including names
+# brought in with "from module import f") and swaps the originals back when it ends.  References to a kernel stored
+# before profiling started (e.g., the integrand held by a CumulativeIntegral) keep calling the original.
+#endregion
+
+#region imports
+import atexit
+import json
+import os
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from inspect import signature
+from time import perf_counter, thread_time
+#endregion
+
+#region function definitions
+PROFILE_ENV = "HW3_PROFILE"
+
+enabled = False  # True while the wrappers are installed; kernels check it before calling note()
+_kernels = []  # (original, wrapper) of every @profiled function
+_installed = []  # (module, attribute, original) swapped by _install
+_users = 0  # number of open profile() blocks
+_lock = threading.RLock()
+_local = threading.local()  # .profile: the Profile of this thread, .frames: stack of note() counters
+_profiles = []  # every Profile made, for snapshot()
+_envValue = os.environ.get(PROFILE_ENV, "").strip()
+_envMode = _envValue not in ("", "0")
+_packageDir = os.path.dirname(os.path.abspath(__file__))
+
+class KernelStats:
+    """
+    The totals recorded for one kernel.
+    """
+    __slots__ = ("calls", "wall", "cpu", "evals", "flops", "netBytes", "peakBytes")
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.evals = 0
+        self.flops = 0
+        self.netBytes = 0
+        self.peakBytes = 0
+
+    def asDict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+class Profile:
+    """
+    What was recorded on one thread, kernel by kernel.
+    """
+    __slots__ = ("thread", "memory", "kernels")
+
+    def __init__(self, memory=False):
+        """
+        :param memory: record allocations with tracemalloc (slows the program down noticeably)
+        """
+        self.thread = threading.current_thread().name
+        self.memory = memory
+        self.kernels = {}
+        with _lock:
+            _profiles.append(self)
+
+    def kernel(self, name):
+        """
+        :return: the KernelStats of the named kernel, created on first use
+        """
+        stats = self.kernels.get(name)
+        if stats is None:
+            stats = self.kernels[name] = KernelStats()
+        return stats
+
+    def asDict(self):
+        """
+        :return: {kernel name: {calls, wall, cpu, evals, flops, netBytes, peakBytes}}
+        """
+        return {name: stats.asDict() for name, stats in sorted(self.kernels.items())}
+
+    def toJSON(self):
+        return json.dumps({"thread": self.thread, "kernels": self.asDict()})
+
+    def summary(self):
+        """
+        :return: the recorded totals as a text table, slowest kernel first
+        """
+        lines = ["{:34s} {:>9s} {:>10s} {:>10s} {:>10s} {:>12s} {:>12s} {:>12s}".format(
+            "kernel [" + self.thread + "]", "calls", "wall s", "cpu s", "evals", "flops", "net B", "peak B")]
+        for name, s in sorted(self.kernels.items(), key=lambda item: -item[1].wall):
+            lines.append("{:34s} {:9d} {:10.4f} {:10.4f} {:10d} {:12.4g} {:12d} {:12d}".format(
+                name, s.calls, s.wall, s.cpu, s.evals, float(s.flops), s.netBytes, s.peakBytes))
+        return "\n".join(lines)
+
+def profiled(flops=None, evals=None, name=None):
+    """
+    Marks a module level function as a kernel to profile.
+    :param flops: the flops of one call, either a number or a function flops(arguments, result, counts), where
+                  arguments maps parameter names to the values of the call (defaults filled in) and counts holds
+                  what the kernel reported with note() during the call
+    :param evals: the evaluations of one call (e.g., integrand evaluations), a number or a function like flops;
+                  if None, an "evals" count reported with note() is used
+    :param name: name to record under (module.function if None)
+    :return: the decorator
+    """
+    def decorate(fn):
+        kernelName = name if name is not None else "{}.{}".format(fn.__module__, fn.__name__)
+        sig = signature(fn) if callable(flops) or callable(evals) else None
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            prof = getattr(_local, "profile", None)
+            if prof is None:
+                if not _envMode:
+                    return fn(*args, **kwargs)
+                prof = _local.profile = Profile()
+            frames = _local.__dict__.setdefault("frames", [])
+            counts = {}
+            frames.append(counts)
+            memory = prof.memory and tracemalloc.is_tracing()
+            if memory:
+                # tracemalloc keeps a single peak, so hand the peak so far to the enclosing call and restart it;
+                # peaks[-1] is the running peak of the innermost call before any of its profiled callees
+                m0, peak = tracemalloc.get_traced_memory()
+                peaks = _local.__dict__.setdefault("peaks", [])
+                if peaks:
+                    peaks[-1] = max(peaks[-1], peak)
+                tracemalloc.reset_peak()
+                peaks.append(m0)
+            c0 = thread_time()
+            t0 = perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                wall = perf_counter() - t0
+                cpu = thread_time() - c0
+                frames.pop()
+                stats = prof.kernel(kernelName)
+                stats.calls += 1
+                stats.wall += wall
+                stats.cpu += cpu
+                if memory:
+                    m1, peak = tracemalloc.get_traced_memory()
+                    peak = max(peak, peaks.pop())
+                    if peaks:
+                        peaks[-1] = max(peaks[-1], peak)
+                    stats.netBytes += m1 - m0
+                    stats.peakBytes = max(stats.peakBytes, peak - m0)
+            if sig is not None:
+                bound = sig.bind(*args, **kwargs)
+                bound.apply_defaults()
+            if flops is not None:
+                stats.flops += flops(bound.arguments, result, counts) if callable(flops) else flops
+            if evals is None:
+                stats.evals += counts.get("evals", 0)
+            else:
+                stats.evals += evals(bound.arguments, result, counts) if callable(evals) else evals
+            return result
+
+        _kernels.append((fn, wrapper))
+        return wrapper if _envMode else fn
+    return decorate
+
+def note(**counts):
+    """
+    Adds counts (e.g., evals=sweeps) to the innermost profiled call running on this thread.  Only call it when
+    profiling.enabled is True.
+    """
+    frames = getattr(_local, "frames", None)
+    if frames:
+        frame = frames[-1]
+        for k, v in counts.items():
+            frame[k] = frame.get(k, 0) + v
+
+def _install():
+    """
+    Swaps the wrappers in for the original kernels in every module of this package.
+    """
+    global enabled
+    wrappers = {id(fn): (fn, wrapper) for fn, wrapper in _kernels}
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path is None or os.path.dirname(os.path.abspath(path)) != _packageDir:
+            continue
+        for attr, value in list(vars(module).items()):
+            pair = wrappers.get(id(value))
+            if pair is not None and pair[0] is value:
+                setattr(module, attr, pair[1])
+                _installed.append((module, attr, value))
+    enabled = True
+
+def _uninstall():
+    """
+    Puts the original kernels back.
+    """
+    global enabled
+    while _installed:
+        module, attr, fn = _installed.pop()
+        setattr(module, attr, fn)
+    enabled = False
+
+@contextmanager
+def profile(memory=False):
+    """
+    Profiles the kernels called on this thread inside the with block.
+    :param memory: also record allocations with tracemalloc
+    :return: context manager giving the Profile being recorded
+    """
+    global _users
+    prof = Profile(memory)
+    previous = getattr(_local, "profile", None)
+    _local.profile = prof
+    with _lock:
+        if _users == 0 and not _envMode:
+            _install()
+        _users += 1
+    startedTracing = memory and not tracemalloc.is_tracing()
+    if startedTracing:
+        tracemalloc.start()
+    try:
+        yield prof
+    finally:
+        if startedTracing:
+            tracemalloc.stop()
+        _local.profile = previous
+        with _lock:
+            _users -= 1
+            if _users == 0 and not _envMode:
+                _uninstall()
+
+def snapshot():
+    """
+    :return: {thread name: {kernel name: {calls, wall, cpu, evals, flops, netBytes, peakBytes}}} summed (peakBytes:
+             the largest) over every Profile recorded so far (per thread, so a thread's numbers are not mixed with
+             another's)
+    """
+    with _lock:
+        profiles = list(_profiles)
+    threads = {}
+    for prof in profiles:
+        kernels = threads.setdefault(prof.thread, {})
+        for name, stats in prof.kernels.items():
+            total = kernels.setdefault(name, KernelStats().asDict())
+            for k, v in stats.asDict().items():
+                total[k] = max(total[k], v) if k == "peakBytes" else total[k] + v
+    return threads
+
+def _report():
+    """
+    At exit in HW3_PROFILE mode: print the summary, or write the snapshot to the file named by HW3_PROFILE.
+    """
+    if _envValue.lower() in ("1", "true", "yes", "on"):
+        with _lock:
+            profiles = list(_profiles)
+        for prof in profiles:
+            print(prof.summary(), file=sys.stderr)
+    else:
+        with open(_envValue, "w") as f:
+            json.dump(snapshot(), f, indent=1)
+
+if _envMode:
+    enabled = True
+    atexit.register(_report)
+#endregion
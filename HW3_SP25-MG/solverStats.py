@@ -0,0 +1,119 @@
+#region explanation
+# Optional instrumentation for the iterative solvers (Gauss_Seidel.GaussSeidel and numericalMethods.GaussSeidel).
+# Pass an IterationStats as stats= (or a function as callback=) and the solver records, for every sweep:
+#   the largest change in x (the quantity the epsilon test looks at)
+#   the residual norm ||b - A x||_2 (skipped with IterationStats(residuals=False), it costs one extra product A x)
+#   the wall time of the sweep
+#   the relaxation factor used
+# plus whether the solve converged (largest change <= epsilon) or was cut off at Niter.
+# Without stats/callback the solvers skip all of this.
+#endregion
+
+#region imports
+import json
+#endregion
+
+#region function definitions
+class IterationStats:
+    """
+    The record of one iterative solve.  An IterationStats can be reused, each solve starts a fresh record.
+    """
+    __slots__ = ("solver", "epsilon", "Niter", "maxChange", "residual", "sweepTime", "omega", "converged",
+                 "residuals", "callback", "solveCallback")
+
+    def __init__(self, residuals=True, callback=None):
+        """
+        :param residuals: record ||b - A x|| after every sweep
+        :param callback: function callback(stats) called after every sweep, e.g. to log progress
+        """
+        self.residuals = residuals
+        self.callback = callback
+        self.solveCallback = None  # the callback= of the current solve only, see getStats
+        self.begin(None, None, 0)
+
+    def begin(self, solver, epsilon, Niter):
+        """
+        Called by the solver before its first sweep.
+        :param solver: name of the solver
+        :param epsilon: the convergence tolerance on the largest change in x (None if there is none)
+        :param Niter: the iteration budget
+        """
+        self.solver = solver
+        self.epsilon = epsilon
+        self.Niter = Niter
+        self.maxChange = []
+        self.residual = []
+        self.sweepTime = []
+        self.omega = []
+        self.converged = None
+
+    def record(self, maxChange, seconds, residual=None, omega=1.0):
+        """
+        Called by the solver after every sweep.
+        :param maxChange: largest change in x during the sweep
+        :param seconds: wall time of the sweep
+        :param residual: ||b - A x|| after the sweep (None if not computed)
+        :param omega: relaxation factor used for the sweep
+        """
+        self.maxChange.append(maxChange)
+        self.sweepTime.append(seconds)
+        self.residual.append(residual)
+        self.omega.append(omega)
+        if self.callback is not None:
+            self.callback(self)
+        if self.solveCallback is not None:
+            self.solveCallback(self)
+
+    def finish(self, converged):
+        """
+        Called by the solver when it stops.
+        :param converged: True if the epsilon test was met, False if the solve ran out of iterations
+        """
+        self.converged = converged
+        self.solveCallback = None
+
+    @property
+    def iterations(self):
+        return len(self.maxChange)
+
+    @property
+    def totalTime(self):
+        return sum(self.sweepTime)
+
+    @property
+    def finalResidual(self):
+        return self.residual[-1] if len(self.residual) > 0 else None
+
+    def asDict(self):
+        """
+        :return: the record as a dict of plain values (e.g., for json.dumps or a log line)
+        """
+        return {"solver": self.solver, "converged": self.converged, "iterations": self.iterations,
+                "Niter": self.Niter, "epsilon": self.epsilon, "totalTime": self.totalTime,
+                "finalResidual": self.finalResidual, "maxChange": list(self.maxChange),
+                "residual": list(self.residual), "sweepTime": list(self.sweepTime), "omega": list(self.omega)}
+
+    def toJSON(self):
+        return json.dumps(self.asDict())
+
+    def __repr__(self):
+        status = "converged" if self.converged else ("not converged" if self.converged is False else "running")
+        return "IterationStats({}: {} after {} of {} sweeps, max change {:.3g}, residual {})".format(
+            self.solver, status, self.iterations, self.Niter,
+            self.maxChange[-1] if self.iterations > 0 else float("nan"),
+            "n/a" if self.finalResidual is None else "{:.3g}".format(self.finalResidual))
+
+def getStats(stats, callback):
+    """
+    Sorts out the stats=/callback= arguments of a solver.  A callback given with the caller's stats is only
+    attached for this solve (as solveCallback, cleared again by finish), so stats.callback is left alone.
+    :param stats: an IterationStats or None
+    :param callback: a function callback(stats) or None
+    :return: the IterationStats to record into, or None when the solve is not instrumented.  A callback alone gets
+             an IterationStats without residuals, so it does not pay for the extra A x product every sweep
+    """
+    if stats is None:
+        return None if callback is None else IterationStats(residuals=False, callback=callback)
+    stats.solveCallback = callback
+    return stats
+#endregion
@@ -0,0 +1,299 @@
+#region explanation
+# Compressed sparse row (CSR) storage for matrices that are mostly zeros.
+# Row i of the matrix is stored as:
+#   indices[indptr[i]:indptr[i+1]]  the column index of each non-zero in the row (increasing)
+#   data[indptr[i]:indptr[i+1]]     the value of each non-zero
+# so a sweep over the matrix costs O(nnz) instead of O(n^2).
+# An augmented matrix [A|b] is stored the same way, with b as the last column.
+#endregion
+
+#region imports
+from array import array
+from math import sqrt
+from operator import mul
+#endregion
+
+#region function definitions
+class CSRMatrix:
+    """
+    A sparse matrix in compressed sparse row form.  Build one with fromDense/fromAugmented (from the usual
+    list-of-lists) or fromTriplets (from (row, col, value) entries).
+    """
+    __slots__ = ("nRows", "nCols", "indptr", "indices", "data")
+
+    def __init__(self, nRows, nCols, indptr, indices, data):
+        """
+        :param nRows: number of rows
+        :param nCols: number of columns
+        :param indptr: array of nRows+1 offsets into indices/data
+        :param indices: column index of each non-zero, increasing within a row
+        :param data: value of each non-zero
+        """
+        self.nRows = nRows
+        self.nCols = nCols
+        self.indptr = array('q', indptr)
+        self.indices = array('q', indices)
+        self.data = array('d', data)
+        if len(self.indptr) != nRows + 1 or len(self.indices) != len(self.data) or self.indptr[-1] != len(self.data):
+            raise ValueError("indptr, indices and data do not describe a {}x{} CSR matrix.".format(nRows, nCols))
+
+    @classmethod
+    def fromDense(cls, A):
+        """
+        :param A: a list-of-lists matrix
+        :return: the CSRMatrix holding the non-zeros of A
+        """
+        indptr, indices, data = [0], [], []
+        for row in A:
+            for c, v in enumerate(row):
+                if v != 0:
+                    indices.append(c)
+                    data.append(v)
+            indptr.append(len(data))
+        return cls(len(A), len(A[0]) if len(A) > 0 else 0, indptr, indices, data)
+
+    @classmethod
+    def fromAugmented(cls, Aaug):
+        """
+        Same as fromDense; named for the augmented matrices [A|b] taken by the Gauss-Seidel solvers.
+        :param Aaug: the augmented matrix as a list-of-lists
+        :return: the augmented CSRMatrix, with b as its last column
+        """
+        return cls.fromDense(Aaug)
+
+    @classmethod
+    def fromTriplets(cls, nRows, nCols, triplets):
+        """
+        Builds a CSRMatrix from (row, col, value) entries in any order.  Repeated (row, col) entries are added.
+        :param nRows: number of rows
+        :param nCols: number of columns
+        :param triplets: iterable of (row, col, value)
+        :return: the CSRMatrix
+        """
+        rows = [dict() for r in range(nRows)]
+        for r, c, v in triplets:
+            if not (0 <= r < nRows and 0 <= c < nCols):
+                raise IndexError("Entry ({}, {}) is outside of a {}x{} matrix.".format(r, c, nRows, nCols))
+            rows[r][c] = rows[r].get(c, 0.0) + v
+        indptr, indices, data = [0], [], []
+        for row in rows:
+            for c in sorted(row):
+                if row[c] != 0:
+                    indices.append(c)
+                    data.append(row[c])
+            indptr.append(len(data))
+        return cls(nRows, nCols, indptr, indices, data)
+
+    @property
+    def shape(self):
+        return (self.nRows, self.nCols)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def row(self, i):
+        """
+        :param i: row index
+        :return: tuple (column indices, values) of the non-zeros in row i
+        """
+        a, b = self.indptr[i], self.indptr[i + 1]
+        return (self.indices[a:b], self.data[a:b])
+
+    def get(self, i, j):
+        """
+        :return: the entry in row i, column j (0.0 if it is not stored)
+        """
+        cols, vals = self.row(i)
+        for c, v in zip(cols, vals):
+            if c == j:
+                return v
+            if c > j:
+                break
+        return 0.0
+
+    def toDense(self):
+        """
+        :return: the matrix as a list-of-lists
+        """
+        A = [[0.0] * self.nCols for r in range(self.nRows)]
+        for i in range(self.nRows):
+            for c, v in zip(*self.row(i)):
+                A[i][c] = v
+        return A
+
+    def matvec(self, x):
+        """
+        :param x: vector (simple list) of length nCols
+        :return: A*x as a simple list
+        """
+        return [sum(map(mul, self.data[self.indptr[i]:self.indptr[i + 1]],
+                        map(x.__getitem__, self.indices[self.indptr[i]:self.indptr[i + 1]])))
+                for i in range(self.nRows)]
+
+    def permuteRows(self, perm):
+        """
+        :param perm: row order, row i of the result is row perm[i] of this matrix
+        :return: a new CSRMatrix
+        """
+        indptr, indices, data = [0], array('q'), array('d')
+        for p in perm:
+            cols, vals = self.row(p)
+            indices.extend(cols)
+            data.extend(vals)
+            indptr.append(len(data))
+        return CSRMatrix(self.nRows, self.nCols, indptr, indices, data)
+
+    def augment(self, b):
+        """
+        :param b: vector (simple list) of length nRows
+        :return: the augmented CSRMatrix [A|b], with b as column nCols
+        """
+        indptr, indices, data = [0], array('q'), array('d')
+        for i in range(self.nRows):
+            cols, vals = self.row(i)
+            indices.extend(cols)
+            data.extend(vals)
+            if b[i] != 0:
+                indices.append(self.nCols)
+                data.append(b[i])
+            indptr.append(len(data))
+        return CSRMatrix(self.nRows, self.nCols + 1, indptr, indices, data)
+
+    def _absByColumn(self):
+        """
+        :return: list with, for every column, a dict {row: |value|} of its non-zeros
+        """
+        byCol = [{} for c in range(self.nCols)]
+        for r in range(self.nRows):
+            for c, v in zip(*self.row(r)):
+                byCol[c][r] = abs(v)
+        return byCol
+
+    def diagDominantOrder(self):
+        """
+        The row order produced by Gauss_Seidel.DiagDominant, computed from a column index of the non-zeros instead
+        of scanning every entry: for each column i in turn, the rows below position i are scanned in order and
+        every one whose |value| in column i beats the current diagonal is moved up to position i (the rows in
+        between shift down by one), after which its value is the one to beat.
+        :return: list perm such that permuteRows(perm) is the reordered matrix
+        """
+        byCol = self._absByColumn()
+        rowAt = list(range(self.nRows))  # rowAt[position] = original row
+        pos = list(range(self.nRows))  # pos[original row] = position
+        for i in range(min(self.nRows, self.nCols) - 1):
+            col = byCol[i]
+            c = col.get(rowAt[i], 0.0)
+            # a move only shifts the rows above the moved one, so the later candidates keep their positions
+            for k, r in sorted((pos[r], r) for r in col if pos[r] > i):
+                if col[r] > c:
+                    rowAt.insert(i, rowAt.pop(k))
+                    for q in range(i, k + 1):
+                        pos[rowAt[q]] = q
+                    c = col[r]
+        return rowAt
+
+    def makeDiagDomOrder(self):
+        """
+        The row order produced by matrixOperations.MakeDiagDom, computed from a column index of the non-zeros
+        in O(nnz) instead of scanning every entry: for each column i in turn, the row (among those not yet placed)
+        with the largest |value| in column i is swapped into position i if it beats the row already there.
+        :return: list perm such that permuteRows(perm) is the reordered matrix
+        """
+        byCol = self._absByColumn()
+        rowAt = list(range(self.nRows))  # rowAt[position] = original row
+        pos = list(range(self.nRows))  # pos[original row] = position
+        for i in range(min(self.nRows, self.nCols) - 1):
+            cur = rowAt[i]
+            best, bestPos = None, None
+            val = byCol[i]
+            initial = val.get(cur, 0.0)
+            for r, v in val.items():
+                if pos[r] > i and v > initial and (best is None or v > val[best] or
+                                                   (v == val[best] and pos[r] < bestPos)):
+                    best, bestPos = r, pos[r]
+            if best is not None:
+                rowAt[i], rowAt[bestPos] = best, cur
+                pos[best], pos[cur] = i, bestPos
+        return rowAt
+
+def nnzOf(A):
+    """
+    :param A: a CSRMatrix or mappedMatrix.MappedMatrix, or a dense matrix (list-of-lists, numpy array or
+              matrixOperations.Matrix)
+    :return: the number of stored entries (every entry for dense storage)
+    """
+    if isinstance(A, CSRMatrix) or hasattr(A, "nnz"):
+        return A.nnz
+    return len(A) * len(A[0]) if len(A) > 0 else 0
+
+def residualNorm(Aaug, x):
+    """
+    :param Aaug: augmented CSRMatrix [A|b]
+    :param x: vector (simple list) of length n
+    :return: ||b - A x||_2
+    """
+    return sqrt(sum(v * v for v in Aaug.matvec(list(x) + [-1.0])))  # [A|b] [x, -1] = A x - b
+
+def GaussSeidelSweep(Aaug, reorder=True):
+    """
+    Prepares Gauss-Seidel (or SOR) sweeps on an augmented CSRMatrix [A|b].  The rows are first put in the diagonal
+    dominant order of Gauss_Seidel.DiagDominant and split once into off-diagonal part, diagonal and b value, so
+    each sweep only visits the stored non-zeros and costs O(nnz).
+    :param Aaug: augmented CSRMatrix with n rows and n+1 columns
+    :param reorder: False keeps the rows in their given order (for a matrix that is already diagonally dominant);
+                    a list perm uses that order instead, e.g. makeDiagDomOrder() to match matrixOperations.MakeDiagDom
+    :return: function sweep(x, omega=1.0) that does one sweep on x in place and returns the tuple
+             (largest change in x, sum of the squared changes)
+    """
+    n = Aaug.nRows
+    if Aaug.nCols != n + 1:
+        raise ValueError("Expected an augmented {}x{} CSR matrix, got {}x{}.".format(n, n + 1, *Aaug.shape))
+    if reorder is True:
+        reorder = Aaug.diagDominantOrder()
+    AA = Aaug.permuteRows(reorder) if reorder is not False else Aaug
+    offCols, offVals, diag, b = [], [], [0.0] * n, [0.0] * n
+    for r in range(n):
+        cols, vals = [], []
+        for c, v in zip(*AA.row(r)):
+            if c == r:
+                diag[r] = v
+            elif c == n:
+                b[r] = v
+            else:
+                cols.append(c)
+                vals.append(v)
+        offCols.append(cols)
+        offVals.append(vals)
+
+    def sweep(x, omega=1.0):
+        maxErr, sumSq = 0, 0.0
+        for r in range(n):
+            xNew = (b[r] - sum(map(mul, offVals[r], map(x.__getitem__, offCols[r])))) / diag[r]
+            dx = xNew - x[r]
+            if omega != 1.0:  # over-relax: move omega times the Gauss-Seidel step
+                dx *= omega
+                xNew = x[r] + dx
+            maxErr = max(maxErr, abs(dx))
+            sumSq += dx * dx
+            x[r] = xNew
+        return maxErr, sumSq
+    return sweep
+
+def GaussSeidelCSR(Aaug, x, Niter=15, epsilon=1e-5, omega=1.0, reorder=True):
+    """
+    Gauss-Seidel iteration on an augmented CSRMatrix [A|b] (see GaussSeidelSweep).
+    :param Aaug: augmented CSRMatrix with n rows and n+1 columns
+    :param x: the initial guess vector (updated in place)
+    :param Niter: number of iterations
+    :param epsilon: stop early once the largest change in x during a sweep is <= epsilon (use 0 to run all Niter)
+    :param omega: relaxation factor, 1.0 is plain Gauss-Seidel and 1 < omega < 2 is successive over-relaxation
+    :param reorder: row order, see GaussSeidelSweep
+    :return: x solution vector
+    """
+    sweep = GaussSeidelSweep(Aaug, reorder=reorder)
+    for j in range(Niter):
+        if sweep(x, omega)[0] <= epsilon:
+            break
+    return x
+#endregion
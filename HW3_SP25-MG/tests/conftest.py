@@ -0,0 +1,18 @@
+# The modules of this package are flat files imported by name, so put the package directory on the path.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import arrayBackend as ab
+
+
+@pytest.fixture(autouse=True)
+def defaultBackend(monkeypatch):
+    """
+    Run every test on the default backend, whatever HW3_BACKEND is set to in the shell; tests that care pass
+    backend= themselves.
+    """
+    monkeypatch.delenv(ab.BACKEND_ENV, raising=False)
@@ -0,0 +1,42 @@
+import math
+
+import pytest
+
+import numericalMethods as nm
+
+
+@pytest.mark.parametrize("mu, sig", [(0.1234, 1e-3), (0.37, 1e-4), (-4.2, 2e-3)])
+def test_narrow_peak_is_found(mu, sig):
+    # the peak sits between the samples of a fixed 16-panel start; panels no wider than stDev cannot miss it
+    area, nEval, err = nm.AdaptiveSimpson(nm.GPDF, (mu, sig, -5, 5))
+    assert area == pytest.approx(1.0, abs=1e-8)
+    assert err < 1e-8
+
+
+def test_matches_fine_fixed_simpson():
+    for c in (-2.0, 0.0, 1.5, 4.0):
+        area, nEval, err = nm.AdaptiveSimpson(nm.GPDF, (0, 1, -5, c))
+        assert area == pytest.approx(nm.Simpson(nm.GPDF, (0, 1, -5, c), N=2000), abs=1e-9)
+
+
+def test_simpson_adaptive_flag():
+    assert nm.Simpson(nm.GPDF, (0, 1, -5, 0), adaptive=True) == pytest.approx(0.5 - 2.866515718791939e-07, abs=1e-8)
+
+
+def test_t_distribution_args():
+    # the (df, lhl, rhl) form; df must reach t_pdf unchanged at every level of the subdivision
+    from hw3b import t_pdf
+    area, nEval, err = nm.AdaptiveSimpson(t_pdf, (7, -1.5, 1.5))
+    assert area == pytest.approx(nm.Simpson(t_pdf, (7, -1.5, 1.5), N=2000), abs=1e-9)
+
+
+def test_explicit_panels():
+    area, nEval, err = nm.AdaptiveSimpson(lambda a: math.cos(a[0]), (None, 0, math.pi / 2), panels=1)
+    assert area == pytest.approx(1.0, abs=1e-9)
+    with pytest.raises(ValueError):
+        nm.AdaptiveSimpson(nm.GPDF, (0, 1, -5, 5), panels=0)
+
+
+def test_bad_args():
+    with pytest.raises(ValueError):
+        nm.AdaptiveSimpson(nm.GPDF, (0, 1))
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+import arrayBackend as ab
+import DoolittleMethod as dm
+import Gauss_Seidel as gs
+import matrixOperations as mo
+import numericalMethods as nm
+
+AUG = [[4.0, -1.0, 1.0, 7.0], [-1.0, 5.0, 2.0, 3.0], [2.0, 1.0, 6.0, 9.0]]
+A = [row[:3] for row in AUG]
+b = [row[3] for row in AUG]
+X = np.linalg.solve(A, b)
+
+
+def test_resolve_priority(monkeypatch):
+    monkeypatch.delenv(ab.BACKEND_ENV, raising=False)
+    assert ab.resolveBackend(None, A) == ab.PYTHON
+    assert ab.resolveBackend(None, A, np.array(b)) == ab.NUMPY
+    monkeypatch.setenv(ab.BACKEND_ENV, " NumPy ")
+    assert ab.resolveBackend(None, A) == ab.NUMPY
+    assert ab.resolveBackend(ab.PYTHON, np.array(A)) == ab.PYTHON  # the argument wins over everything
+    monkeypatch.setenv(ab.BACKEND_ENV, "")
+    assert ab.resolveBackend(None, A) == ab.PYTHON
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        ab.resolveBackend("fortran")
+
+
+def test_numpy_missing(monkeypatch):
+    monkeypatch.setattr(ab, "np", None)
+    with pytest.raises(ImportError):
+        ab.resolveBackend(ab.NUMPY)
+
+
+def is_lists(M):
+    return isinstance(M, list) and all(isinstance(r, (list, float, int)) for r in M)
+
+
+@pytest.mark.parametrize("backend", [ab.PYTHON, ab.NUMPY])
+def test_lu_factors_are_lists_for_list_input(backend):
+    LU = dm.LUFactorization(A, backend=backend)
+    assert is_lists(LU.L) and is_lists(LU.U)
+    assert np.allclose(np.array(LU.L) @ np.array(LU.U), np.array(A)[LU.perm])
+    x = LU.solve(b)
+    assert is_lists(x) and np.allclose(x, X)
+
+
+def test_lu_factors_stay_arrays_for_array_input():
+    LU = dm.LUFactorization(np.array(A))
+    assert isinstance(LU.L, np.ndarray) and isinstance(LU.U, np.ndarray)
+    assert isinstance(LU.solve(np.array(b)), np.ndarray)
+
+
+@pytest.mark.parametrize("backend", [ab.PYTHON, ab.NUMPY])
+def test_solvers_give_lists_back(backend):
+    x = dm.Doolittle(AUG, backend=backend)
+    assert is_lists(x) and np.allclose(x, X)
+    x = gs.GaussSeidel(AUG, [0.0, 0.0, 0.0], Niter=100, epsilon=1e-12, backend=backend)
+    assert is_lists(x) and np.allclose(x, X)
+    x = nm.GaussSeidel(AUG, [0.0, 0.0, 0.0], Niter=100, backend=backend)
+    assert is_lists(x) and np.allclose(x, X)
+
+
+@pytest.mark.parametrize("backend", [ab.PYTHON, ab.NUMPY])
+def test_echelon_forms_agree(backend):
+    E = mo.EchelonForm(AUG, backend=backend)
+    R = mo.ReducedEchelonForm(AUG, backend=backend)
+    assert is_lists(E) and is_lists(R)
+    assert np.allclose(np.array(R)[:, 3], X)
+    assert np.allclose(np.tril(np.array(E)[:, :3], -1), 0)
+
+
+def test_env_var_selects_numpy(monkeypatch):
+    monkeypatch.setenv(ab.BACKEND_ENV, ab.NUMPY)
+    x = dm.Doolittle(AUG)
+    assert is_lists(x) and np.allclose(x, X)
+    assert isinstance(dm.Doolittle(np.array(AUG)), np.ndarray)
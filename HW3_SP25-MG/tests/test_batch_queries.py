@@ -0,0 +1,95 @@
+import io
+import json
+
+import pytest
+
+import batchQueries as bq
+import numericalMethods as nm
+from hw3a import FindCForProbability
+from hw3b import t_cdf
+
+
+def answer(*records, **kwargs):
+    out = io.StringIO()
+    bq.run(io.StringIO("\n".join(json.dumps(r) if isinstance(r, dict) else r for r in records)), out, **kwargs)
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_matches_the_scalar_functions():
+    p, c, t = answer({"mode": "p", "c": 1.2, "mean": 1, "stDev": 2, "GT": True},
+                     {"mode": "c", "P": 0.95, "OneSided": False},
+                     {"mode": "t", "z": 1.5, "df": 7})
+    assert p["result"] == pytest.approx(nm.Probability(nm.GPDF, (1, 2), 1.2, GT=True), abs=nm.BATCH_TOL)
+    assert c["result"] == pytest.approx(FindCForProbability(0.95, 0, 1, False, False), abs=1e-6)
+    assert c["converged"] is True
+    assert t["result"] == pytest.approx(t_cdf(1.5, 7), abs=1e-6)
+
+
+def test_answers_keep_input_order_across_batches():
+    records = [{"mode": "p", "c": i / 10, "id": i} for i in range(25)]
+    answers = answer(*records, batchSize=4)
+    assert [a["id"] for a in answers] == list(range(25))
+    assert [a["line"] for a in answers] == list(range(1, 26))
+
+
+@pytest.mark.parametrize("record", [
+    {"mode": "p", "c": "NaN"},
+    {"mode": "p", "c": "-Infinity"},
+    {"mode": "p", "c": 1.0, "stDev": 0},
+    {"mode": "p", "c": 1.0, "mean": "inf"},
+    {"mode": "c", "P": 0},
+    {"mode": "c", "P": 1.5},
+    {"mode": "t", "z": 1.0, "df": -2},
+    {"mode": "t", "z": 1.0, "df": "inf"},
+    {"mode": "t", "z": "nan", "df": 7},
+    {"mode": "x"},
+    {"mode": "p"},
+])
+def test_bad_query_is_an_error_answer(record):
+    bad, good = answer(record, {"mode": "p", "c": 0.0})
+    assert bad["error"] and bad["result"] is None
+    assert good["error"] is None and good["result"] == pytest.approx(0.5, abs=nm.BATCH_TOL)
+
+
+def test_extreme_c_is_answered():
+    answers = answer({"mode": "p", "c": -1e300}, {"mode": "p", "c": 1e300}, {"mode": "p", "c": 1e300, "GT": True})
+    assert [a["result"] for a in answers] == [0.0, 1.0, 0.0]
+    assert all(a["error"] is None for a in answers)
+
+
+def test_failing_group_only_fails_itself(monkeypatch):
+    def fail(zs, df):
+        raise OverflowError("math range error")
+    monkeypatch.setattr(bq, "t_cdf_batch", fail)
+    t, p = answer({"mode": "t", "z": 1.0, "df": 7}, {"mode": "p", "c": 0.0})
+    assert "OverflowError" in t["error"] and t["result"] is None
+    assert p["error"] is None
+
+
+def test_invalid_json_line():
+    bad, good = answer("{not json", {"mode": "t", "z": 0.0, "df": 11})
+    assert "JSON" in bad["error"]
+    assert good["result"] == pytest.approx(0.5, abs=1e-6)
+
+
+def test_cli_csv_round_trip(tmp_path):
+    src = tmp_path / "q.csv"
+    src.write_text("mode,c,P,z,df,GT,id\np,1.0,,,,no,a\nc,,0.5,,,,b\nt,,,0,15,,c\np,NaN,,,,,d\n")
+    out = tmp_path / "a.csv"
+    assert bq.main([str(src), "--out", str(out)]) == 1  # the NaN query fails
+    lines = out.read_text().splitlines()
+    assert lines[0] == ",".join(bq.FIELDS)
+    assert [line.split(",")[1] for line in lines[1:]] == ["a", "b", "c", "d"]
+    assert bq.main([str(src), "--out", str(out), "--out-format", "jsonl", "--batch", "2"]) == 1
+
+
+def test_cli_exit_code_zero_when_all_answered(tmp_path, capsys):
+    src = tmp_path / "q.jsonl"
+    src.write_text('{"mode": "p", "c": 0}\n# comment\n\n{"mode": "t", "z": 0, "df": 7}\n')
+    assert bq.main([str(src)]) == 0
+    assert len(capsys.readouterr().out.splitlines()) == 2
+
+
+def test_bad_batch_size():
+    with pytest.raises(ValueError):
+        bq.run(io.StringIO(""), io.StringIO(), batchSize=0)
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+import hw3c
+from matrixOperations import Matrix
+
+
+def spd(n, seed=0):
+    rng = np.random.default_rng(seed)
+    M = rng.standard_normal((n, n))
+    return M @ M.T + n * np.eye(n)
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+@pytest.mark.parametrize("n, block", [(1, 128), (5, 2), (17, 4), (40, 128), (40, 7)])
+def test_packed_factor_matches_numpy(n, block, backend):
+    A = spd(n)
+    L = hw3c.packed_cholesky(A.tolist() if backend == "python" else A, block=block, backend=backend).toDense()
+    assert np.allclose(np.array(L), np.linalg.cholesky(A))
+
+
+def test_packed_storage_size():
+    P = hw3c.packed_cholesky(spd(6).tolist())
+    assert P.n == 6
+    assert len(P.data) == 21
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_solve_matches_numpy(backend):
+    A, b = spd(25, seed=3), np.arange(25.0)
+    x = hw3c.cholesky_solve(A.tolist() if backend == "python" else A, b.tolist(), backend=backend)
+    assert np.allclose(x, np.linalg.solve(A, b))
+
+
+def test_matrix_input_and_dense_factor():
+    A = spd(8, seed=1)
+    L = hw3c.cholesky_decomposition(Matrix.fromLists(A.tolist()), backend="python")
+    assert np.allclose(np.array(L), np.linalg.cholesky(A))
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_not_positive_definite(backend):
+    A = [[1.0, 2.0], [2.0, 1.0]]
+    with pytest.raises(ValueError):
+        hw3c.packed_cholesky(np.array(A) if backend == "numpy" else A, backend=backend)
+
+
+def test_bad_block():
+    with pytest.raises(ValueError):
+        hw3c.packed_cholesky([[1.0]], block=0)
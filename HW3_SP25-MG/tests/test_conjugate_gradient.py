@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+import hw3c
+import solverStats as ss
+from matrixOperations import Matrix
+from sparseMatrix import CSRMatrix
+
+
+def spd(n, seed=0):
+    rng = np.random.default_rng(seed)
+    M = rng.standard_normal((n, n))
+    return M @ M.T + n * np.eye(n)
+
+
+@pytest.mark.parametrize("preconditioner", ["jacobi", None])
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_converges(backend, preconditioner):
+    A, b = spd(12), np.arange(1.0, 13.0)
+    x = hw3c.conjugate_gradient(A.tolist(), b.tolist(), backend=backend, preconditioner=preconditioner)
+    assert isinstance(x, list)
+    assert np.allclose(x, np.linalg.solve(A, b), atol=1e-8)
+
+
+@pytest.mark.parametrize("make", [np.array, Matrix.fromLists, CSRMatrix.fromDense])
+def test_storage_formats(make):
+    A, b = spd(8, 1), np.ones(8)
+    x = hw3c.conjugate_gradient(make(A.tolist()), b.tolist())
+    assert np.allclose(x, np.linalg.solve(A, b), atol=1e-8)
+
+
+def test_operator_and_custom_preconditioner():
+    A, b = spd(10, 2), np.ones(10)
+    diag = A.diagonal().tolist()
+    x = hw3c.conjugate_gradient(lambda p: A @ np.asarray(p), b, diagonal=diag)
+    assert isinstance(x, np.ndarray) and np.allclose(x, np.linalg.solve(A, b), atol=1e-8)
+    x = hw3c.conjugate_gradient(A, b, preconditioner=lambda r: r / A.diagonal())
+    assert np.allclose(x, np.linalg.solve(A, b), atol=1e-8)
+    with pytest.raises(ValueError):
+        hw3c.conjugate_gradient(lambda p: A @ p, b)  # jacobi needs diagonal=
+    with pytest.raises(ValueError):
+        hw3c.conjugate_gradient(A, b, preconditioner="ilu")
+
+
+def test_warm_start_and_stats():
+    A, b = spd(10, 3), np.ones(10)
+    exact = np.linalg.solve(A, b)
+    stats = ss.IterationStats()
+    hw3c.conjugate_gradient(A, b, stats=stats)
+    assert stats.converged is True and stats.iterations <= 10
+    assert stats.finalResidual <= 1e-10 * np.linalg.norm(b)
+    warm = ss.IterationStats()
+    hw3c.conjugate_gradient(A, b, x0=exact + 1e-6, stats=warm)
+    assert warm.iterations < stats.iterations
+
+
+def test_callback_does_not_replace_the_stats_callback():
+    calls = []
+    own = lambda s: calls.append("own")
+    stats = ss.IterationStats(callback=own)
+    hw3c.conjugate_gradient([[4.0, 1.0], [1.0, 3.0]], [1.0, 2.0], stats=stats, callback=lambda s: calls.append("once"))
+    assert stats.callback is own
+    assert calls.count("own") == calls.count("once") == stats.iterations > 0
+
+
+def test_not_positive_definite():
+    with pytest.raises(ValueError):
+        hw3c.conjugate_gradient([[1.0, 2.0], [2.0, 1.0]], [1.0, 0.0])  # indefinite, p^T A p < 0
+    with pytest.raises(ValueError):
+        hw3c.conjugate_gradient([[-1.0, 0.0], [0.0, 1.0]], [1.0, 1.0])  # negative diagonal
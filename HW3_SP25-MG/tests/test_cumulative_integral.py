@@ -0,0 +1,40 @@
+import pytest
+
+import hw3b
+import numericalMethods as nm
+
+
+def test_walk_matches_direct_simpson():
+    cdf = nm.CumulativeIntegral(nm.GPDF, (0, 1), -5, h=0.01)
+    for c in (-1.0, 0.5, 0.2, 2.0, -3.0, 2.0):
+        assert cdf(c) == pytest.approx(nm.Simpson(nm.GPDF, (0, 1, -5, c), N=4000), abs=1e-9)
+
+
+def test_repeated_limit_costs_nothing():
+    cdf = nm.CumulativeIntegral(nm.GPDF, (1, 2), -9, h=0.05)
+    first = cdf(1.0)
+    evals = cdf.nEval
+    assert cdf(1.0) == first
+    assert cdf.nEval == evals
+
+
+def test_only_the_new_segment_is_integrated():
+    cdf = nm.CumulativeIntegral(nm.GPDF, (0, 1), -5, h=0.05)
+    cdf(0.0)
+    evals = cdf.nEval
+    cdf(0.1)
+    assert cdf.nEval - evals == 3  # one 2-panel Simpson step
+
+
+def test_reset_starts_from_the_lower_limit():
+    cdf = nm.CumulativeIntegral(nm.GPDF, (0, 1), -5, h=0.05)
+    walked = cdf(1.0)
+    cdf.reset()
+    assert cdf.x == -5 and cdf.area == 0.0
+    assert cdf(1.0) == pytest.approx(walked, abs=1e-12)
+
+
+def test_t_distribution_params():
+    cdf = nm.CumulativeIntegral(hw3b.t_pdf, (7,), 0, h=0.01)
+    for z in (0.5, 1.5, 1.0):
+        assert 0.5 + cdf(z) == pytest.approx(hw3b.t_cdf(z, 7), abs=1e-9)
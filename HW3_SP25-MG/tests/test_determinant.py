@@ -0,0 +1,48 @@
+import math
+
+import numpy as np
+import pytest
+
+import hw3c
+
+SPD = [[4.0, 2.0, 4.0, 0.0], [2.0, 2.0, 3.0, 2.0], [4.0, 3.0, 6.0, 3.0], [0.0, 2.0, 3.0, 9.0]]
+NEEDS_PIVOTING = [[0.0, 2.0, 1.0], [1.0, 1.0, 0.0], [3.0, 0.0, 1.0]]
+
+
+@pytest.mark.parametrize("A", [SPD, NEEDS_PIVOTING, [[2.0]], [[1.0, 2.0], [3.0, 4.0]]])
+def test_determinant_matches_numpy(A):
+    assert hw3c.determinant(A) == pytest.approx(np.linalg.det(A), rel=1e-12)
+
+
+def test_singular():
+    A = [[1.0, 2.0, 3.0], [2.0, 4.0, 6.0], [0.0, 1.0, 1.0]]
+    assert hw3c.determinant(A) == 0.0
+    assert hw3c.log_determinant(A) == (0, float("-inf"))
+
+
+@pytest.mark.parametrize("A", [SPD, NEEDS_PIVOTING, [[-3.0]]])
+def test_log_determinant_matches_numpy(A):
+    sign, logdet = hw3c.log_determinant(A)
+    ref_sign, ref_logdet = np.linalg.slogdet(A)
+    assert sign == ref_sign
+    assert logdet == pytest.approx(ref_logdet, rel=1e-12)
+
+
+def test_log_determinant_does_not_overflow():
+    n = 200
+    A = (1e3 * np.eye(n)).tolist()  # det = 1e600 overflows a float
+    sign, logdet = hw3c.log_determinant(A)
+    assert sign == 1
+    assert logdet == pytest.approx(n * math.log(1e3))
+
+
+def test_is_positive_definite():
+    assert hw3c.is_positive_definite(SPD)
+    assert not hw3c.is_positive_definite([[1.0, 2.0], [2.0, 1.0]])
+    assert not hw3c.is_positive_definite([[0.0, 0.0], [0.0, 1.0]])
+    assert not hw3c.is_positive_definite([[-1.0]])
+
+
+def test_is_symmetric():
+    assert hw3c.is_symmetric(SPD)
+    assert not hw3c.is_symmetric(NEEDS_PIVOTING)
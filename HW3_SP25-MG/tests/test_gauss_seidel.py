@@ -0,0 +1,46 @@
+import random
+
+import numpy as np
+import pytest
+
+import Gauss_Seidel as gs
+import numericalMethods as nm
+from matrixOperations import MakeDiagDom
+from sparseMatrix import CSRMatrix
+
+# the rows of this system need DiagDominant's pop/insert order to converge (MakeDiagDom's swaps diverge)
+REORDERED = [[-7, -3, 1, 4], [0, -3, -9, -9], [8, 1, 8, 5]]
+DOMINANT = [[4, 1, 0, 1, 6], [1, 5, 2, 0, 8], [0, 2, 6, 1, 9], [1, 0, 1, 3, 5]]
+
+
+def random_matrices(count, seed):
+    rng = random.Random(seed)
+    for t in range(count):
+        n = rng.randint(1, 7)
+        yield [[rng.choice([0, 0, 1, -1, 2, -3, rng.randint(-9, 9)]) for c in range(n + 1)] for r in range(n)]
+
+
+def test_csr_order_matches_diag_dominant():
+    for A in random_matrices(500, 1):
+        assert [A[p] for p in CSRMatrix.fromDense(A).diagDominantOrder()] == gs.DiagDominant(A)
+
+
+def test_csr_make_diag_dom_order():
+    for A in random_matrices(500, 2):
+        assert [A[p] for p in CSRMatrix.fromDense(A).makeDiagDomOrder()] == MakeDiagDom(A)
+
+
+def test_csr_solve_matches_list_solve():
+    x = gs.GaussSeidel(REORDERED, [0.0] * 3, Niter=60)
+    xs = gs.GaussSeidel(CSRMatrix.fromDense(REORDERED), [0.0] * 3, Niter=60)
+    A, b = np.array(REORDERED, float)[:, :3], np.array(REORDERED, float)[:, 3]
+    assert np.allclose(x, np.linalg.solve(A, b), atol=1e-4)
+    assert np.allclose(xs, x, atol=1e-10)
+
+
+def test_numerical_methods_csr_matches_its_list_path():
+    # numericalMethods.GaussSeidel reorders with MakeDiagDom, on every storage
+    for A in (DOMINANT, REORDERED):
+        x = nm.GaussSeidel(A, [0.0] * len(A), Niter=10)
+        xs = nm.GaussSeidel(CSRMatrix.fromDense(A), [0.0] * len(A), Niter=10)
+        assert np.allclose(xs, x, rtol=1e-12, equal_nan=True)
@@ -0,0 +1,70 @@
+import copy
+
+import numpy as np
+import pytest
+
+import matrixOperations as mo
+
+AUG = [[0.0, 2.0, 1.0, 5.0], [1.0, 1.0, 0.0, 3.0], [3.0, 0.0, 1.0, 4.0]]
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+@pytest.mark.parametrize("reduce", [mo.EchelonForm, mo.ReducedEchelonForm])
+def test_inplace_matches_copy_on_lists(reduce, backend):
+    A = copy.deepcopy(AUG)
+    expected = reduce(A, backend=backend)
+    assert A == AUG  # the default leaves A alone
+    rows = list(A)
+    result = reduce(A, backend=backend, inplace=True)
+    assert result is A
+    assert np.allclose(A, expected)
+    if backend == "numpy":  # the caller's row lists are kept and overwritten
+        assert all(r is s for r, s in zip(A, rows))
+
+
+@pytest.mark.parametrize("reduce", [mo.EchelonForm, mo.ReducedEchelonForm])
+def test_inplace_on_float_array(reduce):
+    A = np.array(AUG)
+    expected = reduce(A.copy())
+    assert reduce(A, inplace=True) is A
+    assert np.allclose(A, expected)
+
+
+def test_inplace_needs_float_array():
+    A = np.array(AUG, dtype=int)
+    with pytest.raises(ValueError):
+        mo.EchelonForm(A, inplace=True)
+
+
+def test_reduced_form_solves_the_system():
+    R = mo.ReducedEchelonForm(AUG)
+    A, b = np.array(AUG)[:, :3], np.array(AUG)[:, 3]
+    assert np.allclose(np.array(R)[:, 3], np.linalg.solve(A, b))
+
+
+def test_add_rows():
+    R1, R2 = [1.0, 2.0], [3.0, 4.0]
+    assert mo.AddRows(R1, R2, 2.0) == [7.0, 10.0]
+    assert R1 == [1.0, 2.0]
+    assert mo.AddRows(R1, R2, 2.0, inplace=True) is R1
+    assert R1 == [7.0, 10.0]
+
+
+def test_pop_column():
+    A = copy.deepcopy(AUG)
+    c, B = mo.popColumn(A, 3)
+    assert c == [[5.0], [3.0], [4.0]]
+    assert B == [r[:3] for r in AUG] and A == AUG
+    c, B = mo.popColumn(A, 0, inplace=True)
+    assert B is A and A == [r[1:] for r in AUG]
+
+
+def test_insert_and_replace_column():
+    A = [[1.0, 2.0], [3.0, 4.0]]
+    assert mo.insertColumn(A, [9.0, 8.0], 1) == [[1.0, 9.0, 2.0], [3.0, 8.0, 4.0]]
+    assert mo.replaceColumn(A, [[9.0], [8.0]], 0) == [[9.0, 2.0], [8.0, 4.0]]
+    assert A == [[1.0, 2.0], [3.0, 4.0]]
+    assert mo.insertColumn(A, [7.0, 6.0], 2, inplace=True) is A
+    assert A == [[1.0, 2.0, 7.0], [3.0, 4.0, 6.0]]
+    assert mo.replaceColumn(A, [0.0, 0.0], 2, inplace=True) is A
+    assert A == [[1.0, 2.0, 0.0], [3.0, 4.0, 0.0]]
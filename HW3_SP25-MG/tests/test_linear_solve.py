@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+import matrixOperations as mo
+
+A = [[0.0, 2.0, 1.0], [1.0, 1.0, 0.0], [3.0, 0.0, 1.0]]  # needs a row swap at the first step
+
+
+@pytest.mark.parametrize("method", ["lu", "gauss"])
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_invert_matrix(backend, method):
+    Ainv = mo.InvertMatrix(A, backend=backend, method=method)
+    assert isinstance(Ainv, list)
+    assert np.allclose(Ainv, np.linalg.inv(A))
+    assert A[0] == [0.0, 2.0, 1.0]  # A is not changed
+
+
+@pytest.mark.parametrize("method", ["lu", "gauss"])
+def test_invert_array(method):
+    Ainv = mo.InvertMatrix(np.array(A), method=method)
+    assert isinstance(Ainv, np.ndarray) and np.allclose(Ainv, np.linalg.inv(A))
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        mo.InvertMatrix(A, method="cramer")
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_linear_solve(backend):
+    b = [1.0, 2.0, 3.0]
+    x = mo.LinearSolve(A, b, backend=backend)
+    assert isinstance(x, list) and np.allclose(x, np.linalg.solve(A, b))
+    B = [[1.0, 0.0], [2.0, 1.0], [3.0, 0.0]]
+    X = mo.LinearSolve(A, B, backend=backend)
+    assert np.allclose(X, np.linalg.solve(A, B))
+
+
+def test_linear_solve_array():
+    x = mo.LinearSolve(np.array(A), np.array([1.0, 2.0, 3.0]))
+    assert isinstance(x, np.ndarray) and np.allclose(x, np.linalg.solve(A, [1, 2, 3]))
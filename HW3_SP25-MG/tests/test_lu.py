@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from DoolittleMethod import Doolittle, LUFactorization
+
+PIVOTED = [[3, 5, 2], [0, 8, 2], [6, 2, 8]]  # partial pivoting moves row 2 to the top
+
+
+def test_legacy_unpacking():
+    L, U = LUFactorization(PIVOTED)  # no pivoting by default, so L*U is A itself
+    assert np.allclose(np.array(L) @ np.array(U), PIVOTED)
+    assert all(L[i][i] == 1 for i in range(3))
+    assert isinstance(L, list) and isinstance(U, list)
+
+
+def test_unpacking_pivoted_factors_raises():
+    with pytest.raises(ValueError):
+        L, U = LUFactorization(PIVOTED, pivot=True)
+
+
+def test_pivoted_factors_with_perm():
+    LU = LUFactorization(PIVOTED, pivot=True)
+    A = np.array(PIVOTED, float)
+    assert LU.perm != [0, 1, 2]
+    assert np.allclose(np.array(LU.L) @ np.array(LU.U), A[LU.perm])
+
+
+@pytest.mark.parametrize("pivot", [False, True])
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_determinant(backend, pivot):
+    A = PIVOTED if backend == "python" else np.array(PIVOTED, float)
+    det = LUFactorization(A, backend=backend, pivot=pivot).determinant()
+    assert det == pytest.approx(np.linalg.det(np.array(PIVOTED, float)))
+
+
+@pytest.mark.parametrize("pivot", [False, True])
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_solve(backend, pivot):
+    A = PIVOTED if backend == "python" else np.array(PIVOTED, float)
+    x = LUFactorization(A, backend=backend, pivot=pivot).solve([1.0, 2.0, 3.0])
+    assert np.allclose(x, np.linalg.solve(np.array(PIVOTED, float), [1, 2, 3]))
+
+
+def test_solve_several_right_hand_sides():
+    A = np.array(PIVOTED, float)
+    B = [[1.0, 0.0], [2.0, 1.0], [3.0, -1.0]]  # each column is one right-hand side
+    expected = np.linalg.solve(A, B)
+    X = LUFactorization(PIVOTED, pivot=True).solve(B)
+    assert isinstance(X, list) and np.allclose(X, expected)
+    X = LUFactorization(A, pivot=True).solve(np.array(B))
+    assert X.shape == (3, 2) and np.allclose(X, expected)
+
+
+def test_zero_pivot_needs_pivoting():
+    A = [[0.0, 1.0], [1.0, 1.0]]
+    assert np.allclose(LUFactorization(A, pivot=True).solve([1.0, 2.0]), [1.0, 1.0])
+    with pytest.raises(ZeroDivisionError):
+        LUFactorization(A)
+
+
+def test_doolittle():
+    aug = [[3, 1, -1, 2], [1, 4, 1, 12], [2, 1, 2, 10]]
+    assert np.allclose(Doolittle(aug), [1.0, 2.0, 3.0])
+    assert np.allclose(Doolittle([[0, 1, 1], [1, 1, 2]]), [1.0, 1.0])  # needs a row swap
@@ -0,0 +1,75 @@
+import random
+
+import numpy as np
+import pytest
+
+import Gauss_Seidel as gs
+import mappedMatrix as mm
+import numericalMethods as nm
+from matrixOperations import Matrix
+from sparseMatrix import CSRMatrix
+
+# the rows of this system need DiagDominant's pop/insert order to converge (MakeDiagDom's swaps diverge)
+REORDERED = [[-7, -3, 1, 4], [0, -3, -9, -9], [8, 1, 8, 5]]
+DOMINANT = [[4, 1, 0, 1, 6], [1, 5, 2, 0, 8], [0, 2, 6, 1, 9], [1, 0, 1, 3, 5]]
+
+
+def random_matrices(count, seed):
+    rng = random.Random(seed)
+    for t in range(count):
+        n = rng.randint(1, 7)
+        yield [[rng.choice([0, 0, 1, -1, 2, -3, rng.randint(-9, 9)]) for c in range(n + 1)] for r in range(n)]
+
+
+def test_mapped_order_matches_diag_dominant():
+    for A in random_matrices(200, 3):
+        expected = gs.DiagDominant(A)
+        for B in (A, np.array(A, dtype=float), Matrix.fromLists(A)):
+            assert [A[p] for p in mm.diagDominantOrder(B)] == expected
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_mapped_solve_matches_list_solve(tmp_path, sparse):
+    x = gs.GaussSeidel(REORDERED, [0.0] * 3, Niter=60)
+    for source in (REORDERED, CSRMatrix.fromDense(REORDERED)):
+        with mm.save(str(tmp_path / "A.mm"), source, sparse=sparse, reorder=True) as M:
+            assert np.allclose(gs.GaussSeidel(M, [0.0] * 3, Niter=60), x, atol=1e-10)
+
+
+def test_mapped_stored_order(tmp_path):
+    A = np.array(DOMINANT, float)
+    with mm.save(str(tmp_path / "A.mm"), DOMINANT) as M:
+        x = nm.GaussSeidel(M, [0.0] * 4, Niter=100, epsilon=1e-12)
+        assert mm.residualNorm(M, x) < 1e-9
+    assert np.allclose(x, np.linalg.solve(A[:, :4], A[:, 4]))
+
+
+def test_zero_diagonal_in_stored_order(tmp_path):
+    with mm.save(str(tmp_path / "A.mm"), [[0, 1, 1], [1, 0, 1]], sparse=True) as M:
+        with pytest.raises(ValueError):
+            gs.GaussSeidel(M, [0.0, 0.0], Niter=2)
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_round_trip_from_a_row_generator(tmp_path, sparse):
+    path = str(tmp_path / "A.mm")
+    mm.save(path, (row for row in DOMINANT), sparse=sparse).close()
+    with mm.MappedMatrix(path) as M:
+        assert M.shape == (4, 5) and M.sparse == sparse
+        if sparse:
+            assert M.nnz == sum(v != 0 for row in DOMINANT for v in row)
+        for i, row in enumerate(DOMINANT):
+            cols, vals = M.row(i)
+            assert {c: v for c, v in zip(cols, vals) if v != 0} == {c: v for c, v in enumerate(row) if v != 0}
+            del cols, vals
+
+
+def test_bad_files(tmp_path):
+    path = tmp_path / "A.mm"
+    path.write_bytes(b"not a matrix")
+    with pytest.raises(ValueError):
+        mm.MappedMatrix(str(path))
+    mm.save(str(path), DOMINANT).close()
+    path.write_bytes(path.read_bytes()[:-8])
+    with pytest.raises(ValueError):
+        mm.MappedMatrix(str(path))
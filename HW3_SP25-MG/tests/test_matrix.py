@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+import matrixOperations as mo
+from matrixOperations import Matrix
+
+
+@pytest.fixture
+def M():
+    return Matrix.fromLists([[1, 2, 3], [4, 5, 6]])
+
+
+def test_negative_indices(M):
+    assert M[-1, -1] == 6.0
+    assert list(M[-2]) == [1.0, 2.0, 3.0]
+    M[-1, 0] = 9
+    M[-2] = [7, 8, 9]
+    assert M.toLists() == [[7.0, 8.0, 9.0], [9.0, 5.0, 6.0]]
+
+
+@pytest.mark.parametrize("key", [2, -3, (2, 0), (0, 3), (-3, 0), (0, -4)])
+def test_get_out_of_range(M, key):
+    with pytest.raises(IndexError):
+        M[key]
+
+
+@pytest.mark.parametrize("key", [2, -3, (2, 0), (0, 3), (1, -4)])
+def test_set_out_of_range(M, key):
+    with pytest.raises(IndexError):
+        M[key] = 1.0 if isinstance(key, tuple) else [1.0, 2.0, 3.0]
+    assert len(M.data) == 6
+
+
+@pytest.mark.parametrize("row", [[1.0, 2.0], [1.0, 2.0, 3.0, 4.0], []])
+def test_set_row_of_wrong_length(M, row):
+    with pytest.raises(ValueError):
+        M[0] = row
+    assert M.toLists() == [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+
+
+def test_row_views_write_through(M):
+    M[1][2] = 0.5
+    assert M[1, 2] == 0.5
+
+
+def test_pop_insert_replace_column(M):
+    c, B = mo.popColumn(M, 1)
+    assert isinstance(c, Matrix) and c.toLists() == [[2.0], [5.0]]
+    assert B.toLists() == [[1.0, 3.0], [4.0, 6.0]] and M.shape == (2, 3)
+    assert mo.insertColumn(M, [7, 8], 0).toLists() == [[7.0, 1.0, 2.0, 3.0], [8.0, 4.0, 5.0, 6.0]]
+    assert mo.replaceColumn(M, [[7], [8]], -1).toLists() == [[1.0, 2.0, 7.0], [4.0, 5.0, 8.0]]
+    assert M.toLists() == [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+    c, B = mo.popColumn(M, 0, inplace=True)
+    assert B is M and M.toLists() == [[2.0, 3.0], [5.0, 6.0]]
+    assert mo.insertColumn(M, Matrix.fromLists([9, 9]), 2, inplace=True) is M
+    assert M.toLists() == [[2.0, 3.0, 9.0], [5.0, 6.0, 9.0]]
+    with pytest.raises(IndexError):
+        mo.popColumn(M, 3)
+
+
+@pytest.mark.parametrize("method", ["lu", "gauss"])
+def test_invert_matrix(method):
+    A = Matrix.fromLists([[4.0, 7.0, 2.0], [3.0, 6.0, 1.0], [2.0, 5.0, 3.0]])
+    Ainv = mo.InvertMatrix(A, method=method)
+    assert isinstance(Ainv, Matrix)
+    assert np.allclose(Ainv.toLists(), np.linalg.inv(A.toLists()))
+    assert A.toLists() == [[4.0, 7.0, 2.0], [3.0, 6.0, 1.0], [2.0, 5.0, 3.0]]
+
+
+def test_matrix_multiply():
+    A = Matrix.fromLists([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+    C = mo.MatrixMultiply(A, [[1.0], [0.0], [2.0]])
+    assert isinstance(C, Matrix) and C.toLists() == [[7.0], [16.0]]
+    with pytest.raises(ValueError):
+        mo.MatrixMultiply(A, A)
+
+
+def test_lists_round_trip():
+    A = [[1.0, 2.0], [3.0, 4.0]]
+    M = Matrix.fromLists(A)
+    assert M.toLists() == A and M.shape == (2, 2)
+    assert Matrix.fromLists([1.0, 2.0]).shape == (2, 1)
+    assert Matrix.identity(3).toLists() == np.eye(3).tolist()
+    with pytest.raises(ValueError):
+        Matrix.fromLists([[1.0, 2.0], [3.0]])
+    with pytest.raises(ValueError):
+        Matrix(2, 2, [1.0, 2.0, 3.0])
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+import matrixOperations as mo
+from matrixOperations import MatrixMultiply
+
+
+def rand(m, n, seed):
+    return np.random.default_rng(seed).standard_normal((m, n))
+
+
+@pytest.mark.parametrize("m, n, p", [(1, 1, 1), (3, 5, 2), (7, 1, 4), (2, 3, mo.MULT_BLOCK + 5)])
+def test_lists_match_numpy(m, n, p):
+    A, B = rand(m, n, 1), rand(n, p, 2)
+    C = MatrixMultiply(A.tolist(), B.tolist())
+    assert isinstance(C, list) and len(C) == m and len(C[0]) == p
+    assert np.allclose(C, A @ B, rtol=1e-13, atol=1e-13)
+
+
+def test_no_rounding():
+    C = MatrixMultiply([[1.0 / 3.0]], [[1.0]])
+    assert C == [[1.0 / 3.0]]
+    assert MatrixMultiply([[1e-9, 0.0]], [[1.0], [0.0]]) == [[1e-9]]
+
+
+def test_numpy_in_numpy_out():
+    A, B = rand(3, 4, 3), rand(4, 2, 4)
+    C = MatrixMultiply(A, B.tolist())
+    assert isinstance(C, np.ndarray)
+    assert np.allclose(C, A @ B)
+
+
+@pytest.mark.parametrize("A, B", [
+    ([[1.0, 2.0]], [[1.0, 2.0]]),
+    (np.ones((2, 3)), np.ones((2, 3))),
+])
+def test_shape_mismatch(A, B):
+    with pytest.raises(ValueError):
+        MatrixMultiply(A, B)
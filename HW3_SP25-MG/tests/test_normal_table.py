@@ -0,0 +1,79 @@
+import pytest
+
+import numericalMethods as nm
+
+
+@pytest.fixture(scope="module")
+def table():
+    return nm.getNormalTable()
+
+
+def test_matches_fine_simpson(table):
+    for z in (-5.0, -4.99, -2.5, -0.3, 0.0, 0.004, 1.2345, 3.0, 7.999, 8.0):
+        assert table.cdf(z) == pytest.approx(nm.Simpson(nm.GPDF, (0, 1, -5, z), N=4000), abs=1e-10)
+
+
+def test_outside_returns_none(table):
+    assert table.cdf(-5.01) is None
+    assert table.cdf(8.01) is None
+
+
+def test_error_bound(table):
+    assert table.errorBound < 4e-11
+
+
+@pytest.mark.parametrize("mu, sig", [(0, 1), (3, 2), (-1, 0.25)])
+def test_table_engine_matches_simpson_engine(mu, sig):
+    for c in (mu - 4 * sig, mu - sig / 3, mu, mu + 2.5 * sig):
+        for GT in (True, False):
+            table = nm.Probability(nm.GPDF, (mu, sig), c, GT=GT, engine="table")
+            exact = nm.Simpson(nm.GPDF, (mu, sig, mu - 5 * sig, c), N=4000)
+            assert table == pytest.approx(1 - exact if GT else exact, abs=1e-10)
+            # the default engine with N=100 is within its own truncation error of both
+            assert nm.Probability(nm.GPDF, (mu, sig), c, GT=GT) == pytest.approx(table, abs=1e-6)
+
+
+def test_table_engine_falls_back_outside_the_table():
+    for c in (-7.0, 9.0):
+        assert nm.Probability(nm.GPDF, (0, 1), c, engine="table") == nm.Probability(nm.GPDF, (0, 1), c)
+
+
+def test_table_engine_errors():
+    with pytest.raises(ValueError):
+        nm.Probability(lambda args: 0.0, (0, 1), 0.0, engine="table")
+    with pytest.raises(ValueError):
+        nm.Probability(nm.GPDF, (0, 1), 0.0, engine="trapezoid")
+
+
+def test_save_load_round_trip(tmp_path):
+    small = nm.NormalCDFTable(h=0.05, zmax=3.0)
+    path = str(tmp_path / "ncdf.bin")
+    small.save(path)
+    loaded = nm.NormalCDFTable.load(path)
+    assert (loaded.h, loaded.zmax) == (small.h, small.zmax)
+    assert loaded.F == small.F
+    for z in (-4.9, 0.0, 1.23, 3.0):
+        assert loaded.cdf(z) == small.cdf(z)
+
+
+def test_load_rejects_bad_files(tmp_path):
+    bad = tmp_path / "bad.bin"
+    bad.write_bytes(b"NOPE" + bytes(16))
+    with pytest.raises(ValueError):
+        nm.NormalCDFTable.load(str(bad))
+    path = str(tmp_path / "short.bin")
+    nm.NormalCDFTable(h=0.05, zmax=3.0).save(path)
+    with open(path, "r+b") as f:
+        f.truncate(100)
+    with pytest.raises(ValueError):
+        nm.NormalCDFTable.load(path)
+
+
+def test_get_normal_table_cache_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.bin")
+    monkeypatch.setattr(nm, "_normalTable", None)
+    built = nm.getNormalTable(path)
+    monkeypatch.setattr(nm, "_normalTable", None)
+    loaded = nm.getNormalTable(path)
+    assert loaded is not built
+    assert loaded.F == built.F
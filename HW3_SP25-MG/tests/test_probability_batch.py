@@ -0,0 +1,58 @@
+import math
+
+import numpy as np
+import pytest
+
+import numericalMethods as nm
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(nm, "np", None)
+    return request.param
+
+
+def test_matches_scalar_probability(backend):
+    cs = [-6.0, -4.9, -1.0, 0.0, 0.3, 1.7, 3.0, 7.5]
+    for GT in (True, False):
+        batch = nm.ProbabilityBatch(nm.GPDF, (0.0, 1.0), cs, GT=GT)
+        scalar = [nm.Probability(nm.GPDF, (0.0, 1.0), c, GT=GT) for c in cs]
+        assert batch == pytest.approx(scalar, abs=nm.BATCH_TOL)
+
+
+def test_groups_by_mean_and_stdev(backend):
+    mus, sigs, cs = [0, 10, 0, -3], [1, 2, 1, 0.5], [0.5, 12.0, -0.5, -3.2]
+    batch = nm.ProbabilityBatch(nm.GPDF, (mus, sigs), cs, GT=False)
+    scalar = [nm.Probability(nm.GPDF, (m, s), c, GT=False) for m, s, c in zip(mus, sigs, cs)]
+    assert batch == pytest.approx(scalar, abs=nm.BATCH_TOL)
+
+
+def test_returns_numpy_for_numpy_input():
+    p = nm.ProbabilityBatch(nm.GPDF, (0, 1), np.array([0.0, 1.0]), GT=False)
+    assert isinstance(p, np.ndarray)
+    assert p[0] == pytest.approx(0.5, abs=nm.BATCH_TOL)
+
+
+def test_far_tails_are_clamped(backend):
+    cs = [1e300, math.inf, -1e300, -math.inf, 41.0, -41.0]
+    assert nm.ProbabilityBatch(nm.GPDF, (0, 1), cs, GT=False) == [1.0, 1.0, 0.0, 0.0, 1.0, 0.0]
+    assert nm.ProbabilityBatch(nm.GPDF, (0, 1), cs, GT=True) == [0.0, 0.0, 1.0, 1.0, 0.0, 1.0]
+
+
+def test_clamp_leaves_the_grid_small(backend):
+    # only the queries inside the clamp determine the grid, so a huge c next to a normal one is cheap
+    p = nm.ProbabilityBatch(nm.GPDF, (0, 1), [1.0, 1e12], GT=False)
+    assert p[0] == pytest.approx(nm.Probability(nm.GPDF, (0, 1), 1.0, GT=False), abs=nm.BATCH_TOL)
+    assert p[1] == 1.0
+
+
+def test_nan_gives_nan(backend):
+    p = nm.ProbabilityBatch(nm.GPDF, (0, 1), [math.nan, 0.0], GT=True)
+    assert math.isnan(p[0])
+    assert p[1] == pytest.approx(0.5, abs=nm.BATCH_TOL)
+
+
+def test_length_mismatch():
+    with pytest.raises(ValueError):
+        nm.ProbabilityBatch(nm.GPDF, ([0, 1], 1), [0.0, 1.0, 2.0])
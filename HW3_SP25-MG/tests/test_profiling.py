@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+import DoolittleMethod as dm
+import numericalMethods as nm
+import profiling
+
+
+def test_records_calls_and_evals():
+    with profiling.profile() as p:
+        nm.Probability(nm.GPDF, (0, 1), 1.0)
+    kernels = p.asDict()
+    assert kernels["numericalMethods.Probability"]["calls"] == 1
+    assert kernels["numericalMethods.Simpson"]["evals"] == 101
+    assert kernels["numericalMethods.GPDF"]["calls"] == 101
+    assert not profiling.enabled
+
+
+def test_gpdf_identity_survives_profiling():
+    gpdf = nm.GPDF  # taken before profiling wraps it
+    with profiling.profile():
+        assert nm.Probability(gpdf, (0, 1), 1.0, engine="table") == pytest.approx(0.158655, abs=1e-5)
+        wrapped = nm.GPDF
+        assert np.allclose(nm._evalPDF(gpdf, np.array([0.0, 1.0]), 0, 1), [0.398942, 0.241971], atol=1e-6)
+    assert nm.Probability(wrapped, (0, 1), 1.0, GT=False, engine="table") == pytest.approx(0.841345, abs=1e-5)
+    with pytest.raises(ValueError):
+        nm.Probability(lambda args: 0.0, (0, 1), 1.0, engine="table")
+
+
+def test_memory_fields():
+    n = 60
+    A = [[float(n if r == c else 1) for c in range(n)] for r in range(n)]
+    with profiling.profile(memory=True) as p:
+        dm.LUFactorization(A)
+    stats = p.kernels["DoolittleMethod.LUFactorization"]
+    assert stats.peakBytes >= stats.netBytes > 0  # the factors are still held when the call returns
+    assert "peak B" in p.summary()
+    assert set(p.asDict()["DoolittleMethod.LUFactorization"]) == {"calls", "wall", "cpu", "evals", "flops",
+                                                                  "netBytes", "peakBytes"}
+
+
+def test_nested_peak_includes_callees():
+    with profiling.profile(memory=True) as p:
+        nm.Probability(nm.GPDF, (0, 1), 1.0)
+    assert p.kernels["numericalMethods.Probability"].peakBytes >= p.kernels["numericalMethods.Simpson"].peakBytes
+
+
+def test_no_memory_by_default():
+    with profiling.profile() as p:
+        dm.LUFactorization([[4.0, 1.0], [1.0, 3.0]])
+    assert p.kernels["DoolittleMethod.LUFactorization"].netBytes == 0
+    assert p.kernels["DoolittleMethod.LUFactorization"].peakBytes == 0
@@ -0,0 +1,71 @@
+import math
+
+import pytest
+
+import hw3a
+import numericalMethods as nm
+
+
+def test_converges_on_bracketed_root():
+    root, iterations, converged = nm.SafeNewton(lambda x: x * x - 2, lambda x: 2 * x, 1.0, 0.0, 2.0)
+    assert converged
+    assert root == pytest.approx(math.sqrt(2), abs=1e-10)
+    assert iterations < 10
+
+
+def test_falling_function():
+    root, iterations, converged = nm.SafeNewton(lambda x: math.cos(x), lambda x: -math.sin(x), 1.0, 0.0, 3.0)
+    assert converged
+    assert root == pytest.approx(math.pi / 2, abs=1e-10)
+
+
+def test_zero_derivative_bisects():
+    # Newton from x0=0 would divide by zero; the safeguard bisects instead
+    root, iterations, converged = nm.SafeNewton(lambda x: x ** 3 - 1, lambda x: 3 * x * x, 0.0, -1.0, 2.0)
+    assert converged
+    assert root == pytest.approx(1.0, abs=1e-9)
+
+
+def test_steep_function_stays_in_bracket():
+    # plain Newton from x0=3 overshoots far outside of [-5, 5] on arctan
+    root, iterations, converged = nm.SafeNewton(math.atan, lambda x: 1 / (1 + x * x), 3.0, -5.0, 5.0)
+    assert converged
+    assert root == pytest.approx(0.0, abs=1e-9)
+
+
+def test_unbracketed_root_is_not_converged():
+    root, iterations, converged = nm.SafeNewton(lambda x: x - 10, lambda x: 1.0, 0.5, 0.0, 1.0)
+    assert not converged
+    assert 0.0 <= root <= 1.0
+
+
+def asked(q, OneSided, GT):
+    """
+    The probability a FindCForProbabilities query asks for, given q = P(x<c) (the inverse of hw3a.TargetCDF).
+    """
+    if OneSided:
+        return 1 - q if GT else q
+    return 2 * q - 1 if GT else 1 - 2 * q
+
+
+@pytest.mark.parametrize("engine", ["simpson", "table"])
+@pytest.mark.parametrize("OneSided, GT", [(True, False), (True, True), (False, False), (False, True)])
+def test_quantiles_invert_probability(OneSided, GT, engine):
+    mean, stDev = 2.0, 0.5
+    targets = [0.05, 0.3, 0.5, 0.9, 0.99]
+    results = hw3a.FindCForProbabilities(targets, mean, stDev, OneSided, GT, engine=engine)
+    for P, (c, iterations, converged) in zip(targets, results):
+        assert converged
+        assert iterations <= 10
+        q = nm.Probability(nm.GPDF, (mean, stDev), c, GT=False, engine="table")
+        assert asked(q, OneSided, GT) == pytest.approx(P, abs=1e-6)
+
+
+def test_unreachable_probability_is_not_converged():
+    (c0, i0, ok0), (c1, i1, ok1) = hw3a.FindCForProbabilities([0.0, 1.0], 0, 1, True, False)
+    assert not ok0 and not ok1
+    assert c0 == -5 and c1 == 8
+
+
+def test_single_target_wrapper():
+    assert hw3a.FindCForProbability(0.5, 3.0, 1.0, True, False) == pytest.approx(3.0, abs=1e-6)
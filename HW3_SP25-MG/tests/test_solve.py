@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+import hw3c
+from matrixOperations import Matrix
+from sparseMatrix import CSRMatrix
+
+
+def band(n, diag, offsets):
+    """
+    :return: n x n list-of-lists with diag on the diagonal and offsets[k] on every entry with j - i == k
+    """
+    return [[diag if i == j else offsets.get(j - i, 0.0) for j in range(n)] for i in range(n)]
+
+
+def check(A, b, name):
+    x, choice = hw3c.solve(A, b)
+    dense = A.toDense() if isinstance(A, CSRMatrix) else (A.toLists() if isinstance(A, Matrix) else A)
+    assert choice.name == name
+    assert np.allclose(np.asarray(x, float), np.linalg.solve(np.asarray(dense, float), b), atol=1e-8)
+    return x, choice
+
+
+def test_spd_uses_cholesky():
+    rng = np.random.default_rng(0)
+    M = rng.standard_normal((12, 12))
+    check((M @ M.T + 0.5 * np.eye(12)).tolist(), [1.0] * 12, "cholesky")
+
+
+def test_general_uses_lu():
+    rng = np.random.default_rng(1)
+    x, choice = check(rng.standard_normal((12, 12)).tolist(), [1.0] * 12, "lu")
+    assert isinstance(x, list) and choice.rejected == []
+
+
+@pytest.mark.parametrize("make", [list, np.array, Matrix.fromLists, CSRMatrix.fromDense])
+def test_banded(make):
+    A = band(40, 4.0, {-1: -1.0, 1: 2.0})
+    x, choice = check(make(A), [1.0] * 40, "banded")
+    assert isinstance(x, np.ndarray) == (make is np.array)
+
+
+def test_diagonally_dominant_sparse_uses_sor():
+    check(band(200, 10.0, {-1: -2.0, 1: -1.0, 100: -1.0}), [1.0] * 200, "sor")
+    check(np.array(band(200, 10.0, {-1: -1.0, 1: -1.0, 100: -1.0, -100: -1.0})), np.ones(200), "sor")
+
+
+def test_sparse_spd_uses_cg():
+    rng = np.random.default_rng(1)
+    B = np.where(rng.random((300, 300)) < 0.004, rng.standard_normal((300, 300)), 0.0)
+    check(CSRMatrix.fromDense((B.T @ B + np.eye(300)).tolist()), np.ones(300), "cg")
+
+
+def test_fallback_to_lu():
+    # symmetric with a positive diagonal, but indefinite: banded and Cholesky both fail on a negative pivot
+    x, choice = check(band(6, 1.0, {-1: 2.0, 1: 2.0}), [1.0] * 6, "lu")
+    assert [name for name, why in choice.rejected] == ["banded", "cholesky"]
+    assert "lu" in repr(choice) and "cholesky failed" in repr(choice)
+
+
+def test_singular_raises():
+    with pytest.raises(ValueError):
+        hw3c.solve([[1.0, 2.0], [2.0, 4.0]], [1.0, 1.0])
+
+
+def test_reuse_structure():
+    A = band(30, 4.0, {-1: -1.0, 1: -1.0})
+    s = hw3c.MatrixStructure(A)
+    for b in ([1.0] * 30, list(range(30))):
+        x, choice = hw3c.solve(A, b, structure=s)
+        assert np.allclose(x, np.linalg.solve(A, b))
+    with pytest.raises(ValueError):
+        hw3c.solve(A, [1.0] * 29, structure=s)
+
+
+@pytest.mark.parametrize("make", [list, np.array, CSRMatrix.fromDense])
+def test_matrix_structure(make):
+    A = band(5, 3.0, {-2: 1.0, 1: -1.0})
+    s = hw3c.MatrixStructure(make(A))
+    assert (s.n, s.nnz, s.lowerBandwidth, s.upperBandwidth) == (5, 12, 2, 1)
+    assert not s.symmetric and s.positiveDiagonal and s.diagonallyDominant
+    assert s.dominance == pytest.approx(2.0 / 3.0)
+    assert hw3c.MatrixStructure(make(band(4, 2.0, {-1: -1.0, 1: -1.0}))).maybeSPD
+    with pytest.raises(ValueError):
+        hw3c.MatrixStructure([[1.0, 2.0]])
+
+
+def test_rank_solvers():
+    names = lambda A: [c.name for c in hw3c.rank_solvers(hw3c.MatrixStructure(A))]
+    assert names([[1.0, 2.0], [3.0, 4.0]]) == ["lu"]  # nothing else applies to a general matrix
+    choices = hw3c.rank_solvers(hw3c.MatrixStructure(band(50, 4.0, {-1: -1.0, 1: -1.0})))
+    assert {c.name for c in choices} == {"lu", "cholesky", "banded", "sor", "cg"} and choices[-1].name == "lu"
+    assert [c.cost for c in choices] == sorted(c.cost for c in choices)
+
+
+def test_banded_solve():
+    A = band(8, 5.0, {-2: 1.0, -1: -1.0, 1: 2.0})
+    x = hw3c.banded_solve(A, [1.0] * 8)
+    assert np.allclose(x, np.linalg.solve(A, [1.0] * 8))
+    assert np.allclose(hw3c.banded_solve(A, [1.0] * 8, lower=2, upper=1), x)
+    with pytest.raises(ValueError):
+        hw3c.banded_solve([[0.0, 1.0], [1.0, 0.0]], [1.0, 1.0])
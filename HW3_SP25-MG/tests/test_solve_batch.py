@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+import hw3c
+
+
+def problems(count, seed=0, slowFirst=False, pulled=None):
+    rng = np.random.default_rng(seed)
+    for i in range(count):
+        n = 120 if slowFirst and i == 0 else 3
+        M = rng.standard_normal((n, n))
+        if pulled is not None:
+            pulled.append(i)
+        yield {"A": (M @ M.T + n * np.eye(n)).tolist(), "b": [1.0] * n}
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_results_in_input_order(workers):
+    results = list(hw3c.solve_batch(problems(40), workers=workers, chunksize=3))
+    assert [r.index for r in results] == list(range(40))
+    for r, p in zip(results, problems(40)):
+        assert r.ok
+        assert np.allclose(np.array(p["A"]) @ r.x, p["b"])
+
+
+def test_unordered_yields_everything():
+    results = list(hw3c.solve_batch(problems(25), workers=2, chunksize=4, ordered=False))
+    assert sorted(r.index for r in results) == list(range(25))
+
+
+def test_failed_problem_does_not_stop_the_batch():
+    batch = [([[1.0, 2.0], [2.0, 4.0]], [1.0, 1.0]), ([[2.0, 0.0], [0.0, 2.0]], [2.0, 4.0])]
+    first, second = hw3c.solve_batch(batch, workers=0)
+    assert not first.ok and first.error
+    assert second.ok and np.allclose(second.x, [1.0, 2.0])
+
+
+def test_ordered_mode_reads_lazily_behind_a_slow_chunk():
+    # chunks finished behind the slow first one count against the in-flight limit of 2 per worker,
+    # so no more than 2*workers chunks are read before the first result comes out
+    pulled = []
+    results = hw3c.solve_batch(problems(200, slowFirst=True, pulled=pulled), workers=2, chunksize=1)
+    assert next(results).index == 0
+    assert len(pulled) <= 4
+    results.close()
+
+
+def test_bad_chunksize():
+    with pytest.raises(ValueError):
+        next(hw3c.solve_batch([], chunksize=0))
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_unpicklable_chunk_does_not_stop_the_batch(ordered):
+    # a function cannot be sent to a worker process, so its whole chunk fails before solve() ever runs
+    batch = [([[2.0, 0.0], [0.0, 2.0]], [2.0, 4.0]), (lambda p: p, [1.0, 1.0]), ([[4.0]], [8.0])]
+    results = sorted(hw3c.solve_batch(batch, workers=2, chunksize=1, ordered=ordered), key=lambda r: r.index)
+    assert [r.index for r in results] == [0, 1, 2]
+    assert results[0].ok and np.allclose(results[0].x, [1.0, 2.0])
+    assert not results[1].ok and "pickle" in results[1].error.lower()
+    assert results[2].ok and np.allclose(results[2].x, [2.0])
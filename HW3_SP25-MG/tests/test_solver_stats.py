@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+import Gauss_Seidel as gs
+import numericalMethods as nm
+import solverStats as ss
+
+A = [[4.0, 1.0, 1.0], [1.0, 3.0, 2.0]]
+
+
+def solvers():
+    yield lambda **kw: gs.GaussSeidel(A, [0.0, 0.0], Niter=3, epsilon=0, **kw)
+    yield lambda **kw: nm.GaussSeidel(A, [0.0, 0.0], Niter=3, **kw)
+
+
+@pytest.mark.parametrize("solve", list(solvers()))
+def test_callback_does_not_replace_the_stats_callback(solve):
+    calls = []
+    own = lambda s: calls.append("own")
+    stats = ss.IterationStats(callback=own)
+    solve(stats=stats, callback=lambda s: calls.append("once"))
+    assert stats.callback is own
+    assert calls.count("own") == calls.count("once") == stats.iterations > 0
+    calls.clear()
+    solve(stats=stats)
+    assert set(calls) == {"own"}
+
+
+def test_callback_without_stats():
+    seen = []
+    gs.GaussSeidel(A, [0.0, 0.0], Niter=4, epsilon=0, callback=seen.append)
+    assert len(seen) == 4
+    assert seen[0].iterations == 4 and seen[0].converged is False
+    assert seen[0].residual == [None] * 4  # no residuals unless asked for with stats=
+
+
+def test_callback_cleared_after_a_failed_solve():
+    calls = []
+
+    def stop(stats):
+        calls.append(stats.iterations)
+        raise RuntimeError("stop")
+
+    stats = ss.IterationStats()
+    with pytest.raises(RuntimeError):
+        gs.GaussSeidel(A, [0.0, 0.0], Niter=5, epsilon=0, stats=stats, callback=stop)
+    gs.GaussSeidel(A, [0.0, 0.0], Niter=2, epsilon=0, stats=stats)
+    assert calls == [1]
+
+
+def test_get_stats():
+    assert ss.getStats(None, None) is None
+    stats = ss.IterationStats()
+    assert ss.getStats(stats, None) is stats
+
+
+@pytest.mark.parametrize("residuals", [True, False])
+def test_records_every_sweep(residuals):
+    stats = ss.IterationStats(residuals=residuals)
+    gs.GaussSeidel(A, [0.0, 0.0], Niter=50, epsilon=1e-8, stats=stats)
+    assert stats.converged is True and stats.solver == "Gauss_Seidel.GaussSeidel"
+    assert 1 < stats.iterations < 50 and stats.maxChange[-1] <= 1e-8
+    assert stats.omega == [1.0] * stats.iterations and stats.totalTime >= 0
+    if residuals:
+        assert stats.finalResidual < 1e-7 and stats.residual[0] > stats.residual[-1]
+    else:
+        assert stats.finalResidual is None
+    assert json.loads(stats.toJSON())["iterations"] == stats.iterations
+
+
+def test_numerical_methods_stats():
+    stats = ss.IterationStats()
+    nm.GaussSeidel(A, [0.0, 0.0], Niter=3, stats=stats)
+    assert stats.iterations == 3 and stats.converged is False
+    assert "not converged after 3 of 3 sweeps" in repr(stats)
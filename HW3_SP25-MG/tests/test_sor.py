@@ -0,0 +1,48 @@
+from math import cos, pi
+
+import numpy as np
+import pytest
+
+import Gauss_Seidel as gs
+from sparseMatrix import CSRMatrix
+
+N = 20
+POISSON = [[2.0 if i == j else (-1.0 if abs(i - j) == 1 else 0.0) for j in range(N)] + [1.0] for i in range(N)]
+RHO = cos(pi / (N + 1)) ** 2  # spectral radius of Gauss-Seidel for the 1-D Poisson matrix
+
+
+def exact():
+    A = np.array(POISSON)
+    return np.linalg.solve(A[:, :N], A[:, N])
+
+
+def error(omega, Niter=300, **kw):
+    x = gs.GaussSeidel(POISSON, [0.0] * N, Niter=Niter, epsilon=0, omega=omega, reorder=False, **kw)
+    return np.abs(np.array(x) - exact()).max()
+
+
+def test_optimal_omega():
+    assert gs.OptimalOmega(0.0) == 1.0
+    assert gs.OptimalOmega(0.75) == pytest.approx(4.0 / 3.0)
+    assert 1 < gs.OptimalOmega(RHO) < 2
+    for rho in (-0.1, 1.0, 1.5):
+        with pytest.raises(ValueError):
+            gs.OptimalOmega(rho)
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_sor_beats_gauss_seidel(backend):
+    assert error(1.0, backend=backend) > 1e-2  # plain Gauss-Seidel is still far off after 300 sweeps
+    assert error(gs.OptimalOmega(RHO), backend=backend) < 1e-10
+    assert error("auto", backend=backend) < 1e-10
+
+
+def test_auto_omega_on_csr():
+    x = gs.GaussSeidel(CSRMatrix.fromDense(POISSON), [0.0] * N, Niter=300, epsilon=0, omega="auto", reorder=False)
+    assert np.allclose(x, exact(), atol=1e-10)
+
+
+@pytest.mark.parametrize("omega", [0, 2, -1.0, 2.5])
+def test_omega_out_of_range(omega):
+    with pytest.raises(ValueError):
+        gs.GaussSeidel(POISSON, [0.0] * N, omega=omega)
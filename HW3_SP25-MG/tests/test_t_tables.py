@@ -0,0 +1,45 @@
+from math import gamma, pi, sqrt
+
+import pytest
+
+import hw3b
+import numericalMethods as nm
+
+
+@pytest.mark.parametrize("df", [1, 2, 7, 11, 15, 30])
+def test_t_norm_matches_gamma_formula(df):
+    assert hw3b.t_norm(df) == pytest.approx(gamma((df + 1) / 2) / (gamma(df / 2) * sqrt(df * pi)), rel=1e-12)
+
+
+def test_t_norm_large_df_does_not_overflow():
+    assert hw3b.t_norm(1000) == pytest.approx(1 / sqrt(2 * pi), rel=1e-3)
+
+
+@pytest.mark.parametrize("df", [7, 11, 15])
+def test_table_matches_simpson(df):
+    for z in (-9.5, -2.0, -0.25, 0.0, 0.5, 1.5, 4.0, 10.0):
+        exact = 0.5 + nm.Simpson(hw3b.t_pdf, (df, 0, z), N=4000)
+        assert hw3b.t_cdf(z, df, engine="table") == pytest.approx(exact, abs=1e-10)
+        assert hw3b.t_cdf(z, df) == pytest.approx(exact, abs=1e-9)
+
+
+def test_table_is_cached_per_df():
+    assert hw3b.getTTable(7) is hw3b.getTTable(7)
+    assert hw3b.getTTable(7) is not hw3b.getTTable(11)
+
+
+def test_beyond_the_table_integrates():
+    table = hw3b.getTTable(7)
+    assert table.cdf(table.zmax + 0.5) is None
+    assert hw3b.t_cdf(12.0, 7, engine="table") == hw3b.t_cdf(12.0, 7)
+
+
+def test_batch_matches_scalar():
+    zs = [-12.0, -1.0, 0.0, 0.7, 2.2, 12.0]
+    for df in (7, 15):
+        assert hw3b.t_cdf_batch(zs, df) == pytest.approx([hw3b.t_cdf(z, df) for z in zs], abs=1e-9)
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        hw3b.t_cdf(1.0, 7, engine="lookup")
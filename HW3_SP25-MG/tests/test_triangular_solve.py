@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+import DoolittleMethod as dm
+import hw3c
+from matrixOperations import Matrix, TriangularSolve
+
+
+def triangle(n, lower, seed=0):
+    rng = np.random.default_rng(seed)
+    T = rng.standard_normal((n, n)) + n * np.eye(n)
+    return np.tril(T) if lower else np.triu(T)
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+@pytest.mark.parametrize("lower", [True, False])
+@pytest.mark.parametrize("unit", [True, False])
+@pytest.mark.parametrize("trans", [True, False])
+def test_matches_numpy(lower, unit, trans, backend):
+    n = 9
+    T = triangle(n, lower)
+    ref = T.copy()
+    if unit:
+        np.fill_diagonal(ref, 1.0)
+    if trans:
+        ref = ref.T
+    b = np.linspace(-1, 1, n)
+    B = np.arange(n * 3, dtype=float).reshape(n, 3)
+    TT = T.tolist() if backend == "python" else T
+    x = TriangularSolve(TT, b.tolist() if backend == "python" else b, lower, unit, trans, backend)
+    assert np.allclose(x, np.linalg.solve(ref, b))
+    X = TriangularSolve(TT, B.tolist() if backend == "python" else B, lower, unit, trans, backend)
+    assert np.allclose(np.array(X), np.linalg.solve(ref, B))
+
+
+def test_leading_zeros_in_forward_sweep():
+    L = triangle(6, True, seed=2)
+    e = [0.0] * 6
+    e[4] = 1.0
+    assert np.allclose(TriangularSolve(L.tolist(), e, lower=True), np.linalg.solve(L, e))
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_matrix_in_matrix_out(backend):
+    U = triangle(5, False, seed=4)
+    B = Matrix.fromLists(np.eye(5).tolist())
+    X = TriangularSolve(Matrix.fromLists(U.tolist()), B, backend=backend)
+    assert isinstance(X, Matrix)
+    assert np.allclose(np.array(X.toLists()), np.linalg.inv(U))
+
+
+def test_output_follows_b():
+    L = triangle(4, True, seed=6)
+    b = [1.0, 2.0, 3.0, 4.0]
+    assert isinstance(TriangularSolve(L, b, lower=True), list)  # numpy does the work for an array T
+    assert isinstance(TriangularSolve(L.tolist(), np.array(b), lower=True, backend="python"), np.ndarray)
+    X = TriangularSolve(L, [[v, -v] for v in b], lower=True)
+    assert isinstance(X, list) and np.allclose(X, np.linalg.solve(L, [[v, -v] for v in b]))
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_packed_rows(backend):
+    rng = np.random.default_rng(7)
+    M = rng.standard_normal((7, 7))
+    A = M @ M.T + 7 * np.eye(7)
+    P = hw3c.packed_cholesky(A.tolist() if backend == "python" else A, backend=backend)
+    L = np.linalg.cholesky(A)
+    B = np.arange(21.0).reshape(7, 3)
+    assert np.allclose(P.forwardSolve(B.tolist()), np.linalg.solve(L, B))
+    assert np.allclose(P.backSolve(B[:, 0].tolist()), np.linalg.solve(L.T, B[:, 0]))
+    assert np.allclose(P.solve(B.tolist()), np.linalg.solve(A, B))
+
+
+def test_singular_and_shape_errors():
+    with pytest.raises(ValueError):
+        TriangularSolve([[1.0, 2.0], [0.0, 0.0]], [1.0, 1.0])
+    with pytest.raises(ValueError):
+        TriangularSolve([[1.0, 0.0], [0.0, 1.0]], [1.0, 1.0, 1.0])
+
+
+def test_back_solve_delegates():
+    U = triangle(4, False, seed=5)
+    b = [1.0, 2.0, 3.0, 4.0]
+    assert np.allclose(dm.BackSolve(U.tolist(), b), np.linalg.solve(U, b))
+    assert np.allclose(dm.BackSolve(U.T.tolist(), b, UT=False), np.linalg.solve(U.T, b))